@@ -9,6 +9,7 @@ import makeWASocket, {
   useMultiFileAuthState,
   fetchLatestBaileysVersion,
   makeCacheableSignalKeyStore,
+  downloadMediaMessage,
 } from '@whiskeysockets/baileys';
 
 import { Boom } from '@hapi/boom';
@@ -23,11 +24,18 @@ export interface InboundMessage {
   content: string;
   timestamp: number;
   isGroup: boolean;
+  audioMimetype?: string; // Set for voice notes; the audio follows in an onAudio event
+}
+
+export interface InboundAudio {
+  id: string; // Id of the message the audio belongs to
+  audio?: string; // Base64-encoded; missing if the download failed
 }
 
 export interface WhatsAppClientOptions {
   authDir: string;
   onMessage: (msg: InboundMessage) => void;
+  onAudio: (audio: InboundAudio) => void;
   onQR: (qr: string) => void;
   onStatus: (status: string) => void;
 }
@@ -119,6 +127,7 @@ export class WhatsAppClient {
         if (!content) continue;
 
         const isGroup = msg.key.remoteJid?.endsWith('@g.us') || false;
+        const audioMessage = msg.message?.audioMessage;
 
         this.options.onMessage({
           id: msg.key.id || '',
@@ -126,7 +135,13 @@ export class WhatsAppClient {
           content,
           timestamp: msg.messageTimestamp as number,
           isGroup,
+          ...(audioMessage && { audioMimetype: audioMessage.mimetype || '' }),
         });
+
+        // Forward first; the download must not hold up the rest of the batch
+        if (audioMessage) {
+          void this.downloadAudio(msg).then((audio) => this.options.onAudio({ id: msg.key.id || '', audio }));
+        }
       }
     });
   }
@@ -168,6 +183,16 @@ export class WhatsAppClient {
     return null;
   }
 
+  private async downloadAudio(msg: any): Promise<string | undefined> {
+    try {
+      const buffer = await downloadMediaMessage(msg, 'buffer', {});
+      return (buffer as Buffer).toString('base64');
+    } catch (err) {
+      console.error('Failed to download voice message:', (err as Error).message);
+      return undefined;
+    }
+  }
+
   async sendMessage(to: string, text: string): Promise<void> {
     if (!this.sock) {
       throw new Error('Not connected');
@@ -1,11 +1,10 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
 import platform
 from pathlib import Path
 from typing import Any
 
+from nanobot.agent.images import ImagePipeline
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
 
@@ -20,10 +19,11 @@ class ContextBuilder:
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, images: ImagePipeline | None = None):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self.images = images or ImagePipeline()
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -158,6 +158,15 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
 
         return messages
 
+    async def prepare_media(self, media: list[str] | None) -> list[str]:
+        """
+        Preprocess image attachments off the event loop before build_messages.
+        
+        Returns:
+            Content hashes of the images, in order.
+        """
+        return await self.images.prepare(media) if media else []
+    
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
@@ -165,12 +174,9 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         
         images = []
         for path in media:
-            p = Path(path)
-            mime, _ = mimetypes.guess_type(path)
-            if not p.is_file() or not mime or not mime.startswith("image/"):
-                continue
-            b64 = base64.b64encode(p.read_bytes()).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            # Already encoded by prepare_media unless the caller skipped it
+            if encoded := self.images.encode(path):
+                images.append({"type": "image_url", "image_url": {"url": encoded[1]}})
         
         if not images:
             return text
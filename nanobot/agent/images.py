@@ -0,0 +1,189 @@
+"""Image preprocessing for multimodal turns: downscale, recompress, strip EXIF, cache."""
+
+import asyncio
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+MAX_WORKERS = 2  # Image decoding/encoding threads (Pillow releases the GIL while it works)
+_MEMORY_ENTRIES = 32  # Encoded payloads kept in memory; the rest are read back from disk
+_DISK_ENTRIES = 500  # Encoded payloads kept on disk; least recently used are removed first
+_DIGEST_ENTRIES = 1024  # File -> content hash lookups kept in memory
+
+
+class ImagePipeline:
+    """
+    Turns image files into data URLs that are cheap to upload.
+
+    Images are downscaled so the longer side is at most max_edge pixels and
+    re-encoded (JPEG, or PNG when there is transparency). Re-encoding drops
+    EXIF metadata such as GPS location. The work runs in a thread pool, and
+    the payloads are cached in memory and on disk by a hash of the original
+    file, so an image is only processed once. Without Pillow installed, images
+    are sent as they are.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_edge: int = 1568,
+        quality: int = 85,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.cache_dir = cache_dir
+        self.max_edge = max_edge
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="nanobot-image")
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()  # (path, mtime, size) -> content hash
+        self._payloads: OrderedDict[str, str] = OrderedDict()  # content hash -> data URL
+        self._lock = threading.Lock()  # Workers share the in-memory caches
+        self._warned = False
+
+    async def prepare(self, paths: list[str]) -> list[str]:
+        """
+        Encode the images among paths in the worker pool.
+
+        Returns:
+            Content hashes of the images, in order; paths that are not images are skipped.
+        """
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self.encode, p) for p in paths)
+        )
+        return [r[0] for r in results if r]
+
+    def encode(self, path: str) -> tuple[str, str] | None:
+        """
+        Get the content hash and data URL of an image, encoding it if not cached.
+
+        Returns:
+            (hash, data URL), or None if path is not a readable image.
+        """
+        p = Path(path)
+        mime, _ = mimetypes.guess_type(path)
+        if not mime or not mime.startswith("image/"):
+            return None
+        try:
+            st = p.stat()
+            file_key = (str(p), st.st_mtime_ns, st.st_size)
+            with self._lock:
+                if digest := self._digests.get(file_key):
+                    self._digests.move_to_end(file_key)
+            if digest and (url := self.data_url(digest)):
+                return digest, url
+            raw = p.read_bytes()
+        except OSError:
+            return None
+
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            self._digests[file_key] = digest
+            self._digests.move_to_end(file_key)
+            while len(self._digests) > _DIGEST_ENTRIES:
+                self._digests.popitem(last=False)
+        if not (url := self.data_url(digest)):
+            out_mime, data = self._shrink(raw, mime)
+            url = f"data:{out_mime};base64,{base64.b64encode(data).decode()}"
+            logger.debug(f"Encoded {p.name}: {len(raw) // 1024} KB -> {len(data) // 1024} KB")
+            self._remember(digest, url)
+            self._store(digest, url)
+        return digest, url
+
+    def data_url(self, digest: str) -> str | None:
+        """Get a cached payload by content hash."""
+        with self._lock:
+            if url := self._payloads.get(digest):
+                self._payloads.move_to_end(digest)
+                return url
+        path = self._path(digest)
+        if not path:
+            return None
+        try:
+            url = path.read_text(encoding="utf-8")
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        self._remember(digest, url)
+        return url
+
+    def close(self) -> None:
+        """Stop the worker threads; encodings not yet started are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _shrink(self, raw: bytes, mime: str) -> tuple[str, bytes]:
+        """
+        Downscale and re-encode an image; returns (mime, bytes).
+
+        An image that needed no resizing and has no EXIF to strip is kept as
+        it is when re-encoding would not make it smaller.
+        """
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            if not self._warned:
+                logger.warning("Pillow is not installed; images are sent at full size (pip install Pillow)")
+                self._warned = True
+            return mime, raw
+
+        try:
+            with Image.open(io.BytesIO(raw)) as img:
+                if getattr(img, "is_animated", False):
+                    return mime, raw  # Re-encoding would keep only the first frame
+                has_exif = bool(img.getexif())
+                img = ImageOps.exif_transpose(img)  # Apply the EXIF rotation before EXIF is dropped
+                size = img.size
+                if self.max_edge:
+                    img.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+                out = io.BytesIO()
+                if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+                    img.save(out, "PNG", optimize=True)
+                    out_mime = "image/png"
+                else:
+                    img.convert("RGB").save(out, "JPEG", quality=self.quality, optimize=True)
+                    out_mime = "image/jpeg"
+                if img.size == size and not has_exif and out.tell() >= len(raw):
+                    return mime, raw
+                return out_mime, out.getvalue()
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.debug(f"Could not preprocess image, sending as is: {e}")
+            return mime, raw
+
+    def _remember(self, digest: str, url: str) -> None:
+        with self._lock:
+            self._payloads[digest] = url
+            self._payloads.move_to_end(digest)
+            while len(self._payloads) > _MEMORY_ENTRIES:
+                self._payloads.popitem(last=False)
+
+    def _path(self, digest: str) -> Path | None:
+        # Settings are part of the name so changing them does not serve old payloads
+        name = f"{digest[:32]}-{self.max_edge}-{self.quality}.txt"
+        return self.cache_dir / name if self.cache_dir else None
+
+    def _store(self, digest: str, url: str) -> None:
+        path = self._path(digest)
+        if not path:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(url, encoding="utf-8")
+            entries = sorted(os.scandir(path.parent), key=_mtime)
+            for entry in entries[:-_DISK_ENTRIES]:
+                Path(entry.path).unlink(missing_ok=True)  # Another worker may have removed it
+        except OSError as e:
+            logger.warning(f"Failed to cache encoded image: {e}")
+
+
+def _mtime(entry: os.DirEntry) -> float:
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0.0  # Removed since the scan; sorts first and is skipped by unlink
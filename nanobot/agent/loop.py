@@ -2,19 +2,28 @@
 
 import asyncio
 import json
+import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.cache import CachedProvider, make_response_cache
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.images import ImagePipeline
+from nanobot.agent.pruning import prune_tool_results
+from nanobot.agent.routing import ModelRouter, is_simple_turn
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.memo import TurnMemo
+from nanobot.agent.tools.results import ReadResultTool, ResultStore
+from nanobot.agent.tools.selection import TOOL_GROUPS, EnableToolsTool, ToolSelection, select_tools
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
-from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web import WebSearchTool, WebFetchTool, shutdown_extract_pool
+from nanobot.agent.tools.web_cache import make_fetch_cache, make_search_cache
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
@@ -22,6 +31,19 @@ from nanobot.agent.tools.claude_code import ClaudeCodeTool
 from nanobot.agent.subagent import SubagentManager
 from nanobot.bridge.claude_code import ClaudeCodeBridge
 from nanobot.session.manager import SessionManager
+from nanobot.usage.store import UsageStore
+from nanobot.utils.helpers import get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import (
+        ClaudeCodeConfig,
+        ExecToolConfig,
+        ModelRoutingConfig,
+        ResponseCacheConfig,
+        WebFetchConfig,
+        WebSearchConfig,
+    )
+    from nanobot.cron.service import CronService
 
 
 class AgentLoop:
@@ -45,34 +67,77 @@ class AgentLoop:
         max_iterations: int = 20,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_search_config: "WebSearchConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         claude_code_config: "ClaudeCodeConfig | None" = None,
+        spill_threshold: int = 8000,
+        spill_excerpt_chars: int = 1500,
+        prune_tokens: int = 60000,
+        dynamic_tools: bool = True,
+        model_routing: "ModelRoutingConfig | None" = None,
+        response_cache: "ResponseCacheConfig | None" = None,
+        track_usage: bool = True,
+        session_token_budget: int = 0,
+        image_max_edge: int = 1568,
+        image_quality: int = 85,
     ):
-        from nanobot.config.schema import ExecToolConfig, ClaudeCodeConfig
-        from nanobot.cron.service import CronService
+        from nanobot.config.schema import (
+            ClaudeCodeConfig,
+            ExecToolConfig,
+            WebFetchConfig,
+            WebSearchConfig,
+        )
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
         self.model = model or provider.get_default_model()
+        self.router = ModelRouter(self.model, model_routing)
         self.max_iterations = max_iterations
+        self.prune_tokens = prune_tokens
+        self.dynamic_tools = dynamic_tools
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_search_config = web_search_config or WebSearchConfig()
+        self.search_cache = make_search_cache(self.web_search_config)  # Shared with subagents
+        self.fetch_cache = make_fetch_cache(self.web_fetch_config)  # Shared so its size bound holds
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         self.claude_code_config = claude_code_config or ClaudeCodeConfig()
         
-        self.context = ContextBuilder(workspace)
+        self.result_store = ResultStore(spill_threshold, spill_excerpt_chars)
+        self.usage = UsageStore(get_data_path() / "usage") if track_usage else None
+        self.session_token_budget = session_token_budget
+        
+        # Identical requests from cached workloads (e.g. heartbeat, cron) skip the provider
+        cache = make_response_cache(response_cache) if response_cache else None
+        self.cached_provider = CachedProvider(provider, cache) if cache else None
+        self.cache_workloads = set(response_cache.workloads) if cache else set()
+        
+        self.context = ContextBuilder(workspace, ImagePipeline(
+            get_data_path() / "cache" / "images", max_edge=image_max_edge, quality=image_quality,
+        ))
         self.sessions = SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
-            provider=provider,
+            provider=self._provider_for("subagent"),
             workspace=workspace,
             bus=bus,
-            model=self.model,
+            model=self.router.model_for("subagent"),
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
+            web_fetch_config=self.web_fetch_config,
+            web_search_config=self.web_search_config,
+            search_cache=self.search_cache,
+            fetch_cache=self.fetch_cache,
             restrict_to_workspace=restrict_to_workspace,
+            spill_threshold=spill_threshold,
+            spill_excerpt_chars=spill_excerpt_chars,
+            prune_tokens=prune_tokens,
+            usage=self.usage,
+            session_token_budget=session_token_budget,
         )
         
         self._running = False
@@ -92,11 +157,34 @@ class AgentLoop:
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
             restrict_to_workspace=self.restrict_to_workspace,
+            max_output_bytes=self.exec_config.max_output_bytes,
+            cpu_limit=self.exec_config.cpu_limit,
+            memory_limit_mb=self.exec_config.memory_limit_mb,
+            persistent=self.exec_config.persistent_shell,
+            max_sessions=self.exec_config.max_shell_sessions,
+            session_idle_timeout=self.exec_config.shell_idle_timeout,
         ))
         
         # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool(
+            api_key=self.brave_api_key,
+            max_results=self.web_search_config.max_results,
+            cache=self.search_cache,
+        ))
+        self.tools.register(WebFetchTool(
+            max_chars=self.web_fetch_config.max_chars,
+            cache=self.fetch_cache,
+            extract_workers=self.web_fetch_config.extract_workers,
+            extract_timeout=self.web_fetch_config.extract_timeout,
+            max_concurrency=self.web_fetch_config.max_concurrency,
+        ))
+        
+        # Oversized results are spilled to the result store; read_result pages through them
+        self.tools.register(ReadResultTool(self.result_store))
+        
+        # Meta-tool for exposing more tool groups mid-turn
+        if self.dynamic_tools:
+            self.tools.register(EnableToolsTool())
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -156,14 +244,27 @@ class AgentLoop:
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool):
+            exec_tool.close()
+        self.result_store.close()
+        self.context.images.close()
+        shutdown_extract_pool()
         logger.info("Agent loop stopping")
     
-    async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        workload: str = "main",
+        session_key: str | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
+            workload: Kind of work, used to pick the model (main, heartbeat, cron).
+            session_key: Session to use instead of the message's channel:chat_id.
         
         Returns:
             The response message, or None if no response needed.
@@ -173,11 +274,15 @@ class AgentLoop:
         if msg.channel == "system":
             return await self._process_system_message(msg)
         
+        # Transcriptions started by the channel have been running while the message was queued
+        await msg.resolve_pending()
+        
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
         # Get or create session
-        session = self.sessions.get_or_create(msg.session_key)
+        session_key = session_key or msg.session_key
+        session = self.sessions.get_or_create(session_key)
         
         # Update tool contexts
         message_tool = self.tools.get("message")
@@ -192,11 +297,16 @@ class AgentLoop:
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(msg.channel, msg.chat_id)
 
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool):
+            exec_tool.set_context(msg.channel, msg.chat_id)
+
         claude_code_tool = self.tools.get("claude_code")
         if isinstance(claude_code_tool, ClaudeCodeTool):
             claude_code_tool.set_context(msg.channel, msg.chat_id)
 
         # Build initial messages (use get_history for LLM-formatted messages)
+        await self.context.prepare_media(msg.media)
         messages = self.context.build_messages(
             history=session.get_history(),
             current_message=msg.content,
@@ -207,49 +317,71 @@ class AgentLoop:
 
         # Agent loop
         iteration = 0
+        model = self.router.model_for(workload, simple=is_simple_turn(msg.content, msg.media))
+        provider = self._provider_for(workload)
+        if model != self.model:
+            logger.debug(f"Using {model} for this {workload} turn")
+        selection = self._select_tools(msg.content)
+        memo = TurnMemo()
+        spilled: list[str] = []  # Result handles to release when the turn ends
         final_content = None
         
-        while iteration < self.max_iterations:
-            iteration += 1
+        try:
+            while iteration < self.max_iterations:
+                iteration += 1
             
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
+                if await self._over_budget(session_key):
+                    final_content = (
+                        f"This conversation has used its daily budget of {self.session_token_budget} tokens. "
+                        "Please try again tomorrow."
+                    )
+                    break
             
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
+                self._prune(messages, memo)
+            
+                # Call LLM
+                response = await self._chat(
+                    provider, messages, selection.definitions(), model,
+                    session_key, workload, iteration,
                 )
-                
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+            
+                # Handle tool calls
+                if response.has_tool_calls:
+                    # Add assistant message with tool calls
+                    tool_call_dicts = [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json.dumps(tc.arguments)  # Must be JSON string
+                            }
+                        }
+                        for tc in response.tool_calls
+                    ]
+                    messages = self.context.add_assistant_message(
+                        messages, response.content, tool_call_dicts
                     )
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                break
-        
+                
+                    # Execute tools
+                    for tool_call in response.tool_calls:
+                        args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                        logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+                        result = await self.tools.execute(
+                            tool_call.name, tool_call.arguments, memo=memo, call_id=tool_call.id
+                        )
+                        result = self.result_store.spill(result, tool_call.name, spilled)
+                        selection.observe(tool_call.name, tool_call.arguments)
+                        messages = self.context.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                else:
+                    # No tool calls, we're done
+                    final_content = response.content
+                    break
+        finally:
+            self.result_store.release(spilled)
+
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
         
@@ -258,6 +390,7 @@ class AgentLoop:
         logger.info(f"Response to {msg.channel}:{msg.sender_id}: {preview}")
         
         # Save to session
+        # Images are stored by content hash; the encoded payloads stay in the image cache
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
         self.sessions.save(session)
@@ -268,6 +401,48 @@ class AgentLoop:
             content=final_content
         )
     
+    async def _chat(
+        self,
+        provider: LLMProvider,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        model: str,
+        session_key: str,
+        workload: str,
+        iteration: int,
+    ) -> LLMResponse:
+        """Call the LLM and record its token usage and latency."""
+        start = time.perf_counter()
+        response = await provider.chat(messages=messages, tools=tools, model=model)
+        if self.usage:
+            latency_ms = (time.perf_counter() - start) * 1000
+            await self.usage.record_async(session_key, workload, model, response.usage, latency_ms, iteration)
+        return response
+    
+    async def _over_budget(self, session_key: str) -> bool:
+        return bool(self.usage) and await self.usage.over_budget(session_key, self.session_token_budget)
+    
+    def _provider_for(self, workload: str) -> LLMProvider:
+        """The provider for a kind of work: cached if the response cache covers it."""
+        if self.cached_provider and workload in self.cache_workloads:
+            return self.cached_provider
+        return self.provider
+    
+    def _select_tools(self, content: str) -> ToolSelection:
+        """Choose the tools to expose for a user turn."""
+        if not self.dynamic_tools:
+            return ToolSelection(self.tools, set(TOOL_GROUPS))
+        skills = [s["name"] for s in self.context.skills.list_skills()]
+        selection = select_tools(self.tools, content, skills)
+        logger.debug(f"Tools for this turn: {', '.join(selection.tool_names)}")
+        return selection
+    
+    def _prune(self, messages: list[dict[str, Any]], memo: TurnMemo) -> None:
+        """Collapse older tool results once the prompt estimate exceeds prune_tokens."""
+        if pruned := prune_tool_results(messages, self.prune_tokens):
+            memo.forget(pruned)
+            logger.debug(f"Pruned {len(pruned)} earlier tool results to stay under {self.prune_tokens} tokens")
+    
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a system message (e.g., subagent announce).
@@ -304,6 +479,10 @@ class AgentLoop:
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(origin_channel, origin_chat_id)
 
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool):
+            exec_tool.set_context(origin_channel, origin_chat_id)
+
         claude_code_tool = self.tools.get("claude_code")
         if isinstance(claude_code_tool, ClaudeCodeTool):
             claude_code_tool.set_context(origin_channel, origin_chat_id)
@@ -318,44 +497,64 @@ class AgentLoop:
         
         # Agent loop (limited for announce handling)
         iteration = 0
+        model = self.router.model_for("announce")
+        provider = self._provider_for("announce")
+        selection = ToolSelection(self.tools, set(TOOL_GROUPS))  # Announces may need anything
+        memo = TurnMemo()
+        spilled: list[str] = []  # Result handles to release when the turn ends
         final_content = None
         
-        while iteration < self.max_iterations:
-            iteration += 1
+        try:
+            while iteration < self.max_iterations:
+                iteration += 1
             
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
+                if await self._over_budget(session_key):
+                    final_content = (
+                        f"A background task finished, but this conversation has used its daily budget of "
+                        f"{self.session_token_budget} tokens."
+                    )
+                    break
             
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
+                self._prune(messages, memo)
+            
+                response = await self._chat(
+                    provider, messages, selection.definitions(), model,
+                    session_key, "announce", iteration,
                 )
-                
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+            
+                if response.has_tool_calls:
+                    tool_call_dicts = [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json.dumps(tc.arguments)
+                            }
+                        }
+                        for tc in response.tool_calls
+                    ]
+                    messages = self.context.add_assistant_message(
+                        messages, response.content, tool_call_dicts
                     )
-            else:
-                final_content = response.content
-                break
-        
+                
+                    for tool_call in response.tool_calls:
+                        args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                        logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+                        result = await self.tools.execute(
+                            tool_call.name, tool_call.arguments, memo=memo, call_id=tool_call.id
+                        )
+                        result = self.result_store.spill(result, tool_call.name, spilled)
+                        selection.observe(tool_call.name, tool_call.arguments)
+                        messages = self.context.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                else:
+                    final_content = response.content
+                    break
+        finally:
+            self.result_store.release(spilled)
+
         if final_content is None:
             final_content = "Background task completed."
         
@@ -376,6 +575,7 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        workload: str = "main",
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
@@ -385,6 +585,7 @@ class AgentLoop:
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            workload: Kind of work, used to pick the model (main, heartbeat, cron).
         
         Returns:
             The agent's response.
@@ -396,5 +597,5 @@ class AgentLoop:
             content=content
         )
         
-        response = await self._process_message(msg)
+        response = await self._process_message(msg, workload, session_key)
         return response.content if response else ""
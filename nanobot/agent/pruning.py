@@ -0,0 +1,79 @@
+"""In-turn pruning of stale tool results from the message list."""
+
+import re
+from typing import Any
+
+CHARS_PER_TOKEN = 4  # Rough estimate; good enough to decide when to prune
+IMAGE_TOKENS = 1000  # Flat estimate per image part
+STUB_PREFIX = "[Pruned:"
+
+_HANDLE = re.compile(r"\bres_[0-9a-f]{8}\b")
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Estimate the prompt size of a message list in tokens."""
+    chars = 0
+    images = 0
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    chars += len(part.get("text", ""))
+                else:
+                    images += 1
+        for call in msg.get("tool_calls") or ():
+            chars += len(call["function"]["name"]) + len(call["function"]["arguments"])
+    return chars // CHARS_PER_TOKEN + images * IMAGE_TOKENS
+
+
+def _stub(name: str, content: str) -> str:
+    first_line = next((line.strip() for line in content.splitlines() if line.strip()), "")
+    if len(first_line) > 120:
+        first_line = first_line[:120] + "..."
+    stub = f"{STUB_PREFIX} {name} output ({len(content)} chars) from an earlier step was removed to save context."
+    if first_line:
+        stub += f" It began: {first_line}"
+    if m := _HANDLE.search(content):
+        stub += f" Full output: read_result(handle=\"{m[0]}\")."
+    else:
+        stub += " Call the tool again if you need it."
+    return stub + "]"
+
+
+def prune_tool_results(messages: list[dict[str, Any]], max_tokens: int) -> list[str]:
+    """
+    Collapse older tool results to stubs until the prompt fits max_tokens.
+
+    Tool results are pruned oldest first. Results answering the most recent
+    assistant message are never touched, since the model has not seen them
+    yet. Only the content of tool messages changes, so every tool call keeps
+    its matching result.
+
+    Returns:
+        The tool_call_ids whose results were pruned.
+    """
+    if max_tokens <= 0:
+        return []
+    total = estimate_tokens(messages)
+    if total <= max_tokens:
+        return []
+
+    last_assistant = max((i for i, m in enumerate(messages) if m.get("role") == "assistant"), default=-1)
+    pruned = []
+    for msg in messages[:last_assistant]:
+        if total <= max_tokens:
+            break
+        content = msg.get("content")
+        if msg.get("role") != "tool" or not isinstance(content, str) or content.startswith(STUB_PREFIX):
+            continue
+        stub = _stub(msg.get("name", "tool"), content)
+        if len(stub) >= len(content):
+            continue
+        total -= (len(content) - len(stub)) // CHARS_PER_TOKEN
+        msg["content"] = stub
+        pruned.append(msg.get("tool_call_id", ""))
+    return pruned
+
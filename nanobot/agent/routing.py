@@ -0,0 +1,49 @@
+"""Per-workload model routing."""
+
+from typing import TYPE_CHECKING
+
+from nanobot.agent.tools.selection import hinted_groups
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ModelRoutingConfig
+
+SIMPLE_MAX_CHARS = 280  # Longer user messages always go to the main model
+
+# Kinds of LLM work; each can be routed to its own model
+WORKLOADS = ("main", "subagent", "announce", "heartbeat", "cron")
+
+
+def is_simple_turn(content: str, media: list[str] | None = None) -> bool:
+    """
+    Cheap classifier for user turns a fast model can handle.
+
+    A turn is simple when the message is short, has no attachments or code,
+    and hints at no tool group beyond the file tools (see hinted_groups).
+    """
+    return (
+        len(content) <= SIMPLE_MAX_CHARS
+        and not media
+        and "```" not in content
+        and not hinted_groups(content)
+    )
+
+
+class ModelRouter:
+    """Picks the model for each kind of work, falling back to the default model."""
+
+    def __init__(self, default_model: str, config: "ModelRoutingConfig | None" = None):
+        from nanobot.config.schema import ModelRoutingConfig
+        self.default_model = default_model
+        self.config = config or ModelRoutingConfig()
+
+    def model_for(self, workload: str, simple: bool = False) -> str:
+        """
+        Get the model for a workload.
+
+        Args:
+            workload: One of WORKLOADS.
+            simple: The turn was classified simple (only used for "main").
+        """
+        if workload == "main" and simple and self.config.fast:
+            return self.config.fast
+        return getattr(self.config, workload, "") or self.default_model
@@ -2,19 +2,28 @@
 
 import asyncio
 import json
+import time
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.agent.pruning import prune_tool_results
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.memo import TurnMemo
+from nanobot.agent.tools.results import ReadResultTool, ResultStore
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import FetchCache, SearchCache
+from nanobot.usage.store import UsageStore
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
 
 
 class SubagentManager:
@@ -34,16 +43,34 @@ class SubagentManager:
         model: str | None = None,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_search_config: "WebSearchConfig | None" = None,
+        search_cache: SearchCache | None = None,
+        fetch_cache: FetchCache | None = None,
         restrict_to_workspace: bool = False,
+        spill_threshold: int = 8000,
+        spill_excerpt_chars: int = 1500,
+        prune_tokens: int = 60000,
+        usage: UsageStore | None = None,
+        session_token_budget: int = 0,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
         self.model = model or provider.get_default_model()
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_search_config = web_search_config or WebSearchConfig()
+        self.search_cache = search_cache
+        self.fetch_cache = fetch_cache
         self.restrict_to_workspace = restrict_to_workspace
+        self.spill_threshold = spill_threshold
+        self.spill_excerpt_chars = spill_excerpt_chars
+        self.prune_tokens = prune_tokens
+        self.usage = usage
+        self.session_token_budget = session_token_budget  # Subagent calls count against the origin session
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -94,6 +121,7 @@ class SubagentManager:
     ) -> None:
         """Execute the subagent task and announce the result."""
         logger.info(f"Subagent [{task_id}] starting task: {label}")
+        results = ResultStore(self.spill_threshold, self.spill_excerpt_chars)
         
         try:
             # Build subagent tools (no message tool, no spawn tool)
@@ -106,9 +134,23 @@ class SubagentManager:
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
+                max_output_bytes=self.exec_config.max_output_bytes,
+                cpu_limit=self.exec_config.cpu_limit,
+                memory_limit_mb=self.exec_config.memory_limit_mb,
+            ))
+            tools.register(WebSearchTool(
+                api_key=self.brave_api_key,
+                max_results=self.web_search_config.max_results,
+                cache=self.search_cache,
+            ))
+            tools.register(WebFetchTool(
+                max_chars=self.web_fetch_config.max_chars,
+                cache=self.fetch_cache,
+                extract_workers=self.web_fetch_config.extract_workers,
+                extract_timeout=self.web_fetch_config.extract_timeout,
+                max_concurrency=self.web_fetch_config.max_concurrency,
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools.register(ReadResultTool(results))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -121,15 +163,30 @@ class SubagentManager:
             max_iterations = 15
             iteration = 0
             final_result: str | None = None
+            memo = TurnMemo()
             
+            session_key = f"{origin['channel']}:{origin['chat_id']}"
             while iteration < max_iterations:
                 iteration += 1
                 
+                if self.usage and await self.usage.over_budget(session_key, self.session_token_budget):
+                    final_result = "Stopped: the conversation has used its daily token budget."
+                    break
+                
+                if pruned := prune_tool_results(messages, self.prune_tokens):
+                    memo.forget(pruned)
+                
+                start = time.perf_counter()
                 response = await self.provider.chat(
                     messages=messages,
                     tools=tools.get_definitions(),
                     model=self.model,
                 )
+                if self.usage:
+                    await self.usage.record_async(
+                        session_key, "subagent", self.model,
+                        response.usage, (time.perf_counter() - start) * 1000, iteration,
+                    )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
@@ -154,7 +211,10 @@ class SubagentManager:
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                        result = await tools.execute(
+                            tool_call.name, tool_call.arguments, memo=memo, call_id=tool_call.id
+                        )
+                        result = results.spill(result, tool_call.name, [])
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
@@ -175,6 +235,8 @@ class SubagentManager:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
             await self._announce_result(task_id, label, task, error_msg, origin, "error")
+        finally:
+            results.close()
     
     async def _announce_result(
         self,
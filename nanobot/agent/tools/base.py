@@ -21,6 +21,10 @@ class Tool(ABC):
         "object": dict,
     }
     
+    # Repeating a call with identical params returns the same result until a
+    # write touches its path, so results may be reused within a turn (see TurnMemo)
+    idempotent: bool = False
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -1,7 +1,12 @@
 """File system tools: read, write, edit."""
 
+import fnmatch
+import itertools
+import os
+import re
+import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from nanobot.agent.tools.base import Tool
 
@@ -17,6 +22,8 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
+    idempotent = True
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
@@ -101,7 +108,7 @@ class WriteFileTool(Tool):
 
 
 class EditFileTool(Tool):
-    """Tool to edit a file by replacing text."""
+    """Tool to edit a file by replacing text or applying a unified diff."""
     
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
@@ -112,7 +119,11 @@ class EditFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+        return (
+            "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file. "
+            "To change several places at once, pass 'edits' (list of {old_text, new_text}) instead; "
+            "all edits are applied atomically in one write. Alternatively pass 'patch' with a unified diff."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -130,40 +141,185 @@ class EditFileTool(Tool):
                 "new_text": {
                     "type": "string",
                     "description": "The text to replace with"
+                },
+                "edits": {
+                    "type": "array",
+                    "description": "Multiple replacements applied in order; each old_text must be unique",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_text": {"type": "string"},
+                            "new_text": {"type": "string"}
+                        },
+                        "required": ["old_text", "new_text"]
+                    }
+                },
+                "patch": {
+                    "type": "string",
+                    "description": "Unified diff to apply (hunks are matched fuzzily around their line numbers)"
                 }
             },
-            "required": ["path", "old_text", "new_text"]
+            "required": ["path"]
         }
     
-    async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        old_text: str | None = None,
+        new_text: str | None = None,
+        edits: list[dict[str, str]] | None = None,
+        patch: str | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             
-            content = file_path.read_text(encoding="utf-8")
+            modes = sum(x is not None for x in (old_text, edits, patch))
+            if modes != 1:
+                return "Error: Provide exactly one of old_text/new_text, edits, or patch"
             
-            if old_text not in content:
-                return f"Error: old_text not found in file. Make sure it matches exactly."
+            content = file_path.read_text(encoding="utf-8")
             
-            # Count occurrences
-            count = content.count(old_text)
-            if count > 1:
-                return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
+            if patch is not None:
+                new_content = _apply_unified_diff(content, patch)
+            elif edits is not None:
+                if not edits:
+                    return "Error: edits must not be empty"
+                new_content = content
+                for i, edit in enumerate(edits):
+                    new_content = _replace_unique(
+                        new_content, edit["old_text"], edit["new_text"], f"edits[{i}].old_text"
+                    )
+            else:
+                if new_text is None:
+                    return "Error: new_text is required with old_text"
+                if old_text not in content:
+                    return f"Error: old_text not found in file. Make sure it matches exactly."
+                
+                # Count occurrences
+                count = content.count(old_text)
+                if count > 1:
+                    return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
+                
+                new_content = content.replace(old_text, new_text, 1)
             
-            new_content = content.replace(old_text, new_text, 1)
-            file_path.write_text(new_content, encoding="utf-8")
+            _atomic_write(file_path, new_content)
             
+            if edits is not None:
+                return f"Successfully edited {path} ({len(edits)} edits applied)"
             return f"Successfully edited {path}"
         except PermissionError as e:
             return f"Error: {e}"
+        except ValueError as e:
+            return f"Error: {e}. No changes were written."
         except Exception as e:
             return f"Error editing file: {str(e)}"
 
 
+def _atomic_write(path: Path, content: str) -> None:
+    """Write content to a temp file in the same directory, then rename it over path."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _replace_unique(content: str, old_text: str, new_text: str, label: str) -> str:
+    """Replace a single occurrence of old_text, raising ValueError unless it is unique."""
+    count = content.count(old_text) if old_text else 0
+    if count == 0:
+        raise ValueError(f"{label} not found in file")
+    if count > 1:
+        raise ValueError(f"{label} appears {count} times, provide more context to make it unique")
+    return content.replace(old_text, new_text, 1)
+
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+
+
+def _parse_hunks(patch: str) -> list[tuple[int, list[tuple[str, str]]]]:
+    """Parse a unified diff into (old_start, [(op, line), ...]) hunks."""
+    hunks: list[tuple[int, list[tuple[str, str]]]] = []
+    lines = patch.splitlines()
+    for i, line in enumerate(lines):
+        if m := _HUNK_HEADER.match(line):
+            hunks.append((int(m[1]), []))
+            continue
+        # File headers ("--- a/x" followed by "+++ b/x") and anything before the first hunk
+        if not hunks or line.startswith("+++ ") or (
+            line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ ")
+        ):
+            continue
+        if line == "":
+            hunks[-1][1].append((" ", ""))
+        elif line[0] in " -+":
+            hunks[-1][1].append((line[0], line[1:]))
+        elif line[0] != "\\":  # "\ No newline at end of file"
+            raise ValueError(f"malformed patch line: {line[:80]!r}")
+    if not hunks:
+        raise ValueError("patch contains no hunks")
+    return hunks
+
+
+def _find_hunk(lines: list[str], old: list[str], start: int, hint: int) -> int:
+    """Locate old within lines[start:], nearest to hint; try exact, then whitespace-insensitive."""
+    n = len(old)
+    for norm in (lambda s: s, str.rstrip, str.strip):
+        target = [norm(s) for s in old]
+        normed = [norm(s) for s in lines]
+        matches = [i for i in range(start, len(lines) - n + 1) if normed[i:i + n] == target]
+        if matches:
+            return min(matches, key=lambda i: abs(i - hint))
+    return -1
+
+
+def _apply_unified_diff(content: str, patch: str) -> str:
+    """Apply a unified diff to content, tolerating shifted line numbers and whitespace drift."""
+    lines = content.split("\n")
+    offset = 0
+    start = 0
+    for n, (old_start, ops) in enumerate(_parse_hunks(patch), 1):
+        old = [text for op, text in ops if op != "+"]
+        hint = max(old_start - 1 + offset, start)
+        if old:
+            pos = _find_hunk(lines, old, start, hint)
+            if pos < 0:
+                raise ValueError(f"hunk {n} (at line {old_start}) does not match the file")
+        else:
+            # "@@ -N,0" inserts after old line N
+            pos = min(max(old_start + offset, start), len(lines))
+        # Context lines keep the file's own text, so fuzzy matches don't rewrite whitespace
+        matched = iter(lines[pos:pos + len(old)])
+        new = []
+        for op, text in ops:
+            if op == "+":
+                new.append(text)
+            elif op == " ":
+                new.append(next(matched))
+            else:
+                next(matched)
+        lines[pos:pos + len(old)] = new
+        offset += len(new) - len(old)
+        start = pos + len(new)
+    return "\n".join(lines)
+
+
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
+    idempotent = True
+    IGNORE_FILES = (".gitignore", ".ignore")
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
@@ -173,7 +329,11 @@ class ListDirTool(Tool):
     
     @property
     def description(self) -> str:
-        return "List the contents of a directory."
+        return (
+            "List the contents of a directory as a tree with file sizes. "
+            "Use depth to recurse, pattern (glob) to find matching files, and cursor to page through long listings. "
+            "Entries excluded by .gitignore are skipped."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -183,12 +343,41 @@ class ListDirTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The directory path to list"
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "How many levels to descend (default 1)",
+                    "minimum": 1,
+                    "maximum": 10
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": "Only list files matching this glob (e.g. '*.py'), shown as relative paths"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum entries to return (default 200)",
+                    "minimum": 1,
+                    "maximum": 1000
+                },
+                "cursor": {
+                    "type": "integer",
+                    "description": "Number of entries to skip, as returned by a previous truncated listing",
+                    "minimum": 0
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        depth: int = 1,
+        pattern: str | None = None,
+        limit: int = 200,
+        cursor: int = 0,
+        **kwargs: Any,
+    ) -> str:
         try:
             dir_path = _resolve_path(path, self._allowed_dir)
             if not dir_path.exists():
@@ -196,16 +385,108 @@ class ListDirTool(Tool):
             if not dir_path.is_dir():
                 return f"Error: Not a directory: {path}"
             
-            items = []
-            for item in sorted(dir_path.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
-                items.append(f"{prefix}{item.name}")
+            entries = self._walk(str(dir_path), "", 1, depth, [], pattern)
+            items = list(itertools.islice(entries, cursor, cursor + limit + 1))
+            has_more = len(items) > limit
+            items = items[:limit]
             
             if not items:
+                if cursor:
+                    return f"No more entries in {path}"
+                if pattern:
+                    return f"No files matching '{pattern}' in {path}"
                 return f"Directory {path} is empty"
             
+            if has_more:
+                items.append(f"... more entries not shown; call again with cursor={cursor + limit}")
             return "\n".join(items)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {str(e)}"
+    
+    def _walk(
+        self,
+        root: str,
+        rel: str,
+        level: int,
+        depth: int,
+        rules: list[tuple[str, tuple[str, bool, bool, bool]]],
+        pattern: str | None,
+    ) -> Iterator[str]:
+        """Yield formatted entries depth-first, using DirEntry's cached type info."""
+        dir_path = os.path.join(root, rel) if rel else root
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        rules = rules + [(rel, rule) for rule in self._read_ignore_rules(dir_path)]
+        indent = "  " * (level - 1)
+        
+        for entry in entries:
+            if entry.name == ".git":
+                continue
+            is_dir = entry.is_dir()
+            entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+            if _is_ignored(entry_rel, entry.name, is_dir, rules):
+                continue
+            
+            if pattern is None:
+                if is_dir:
+                    yield f"{indent}📁 {entry.name}/"
+                else:
+                    yield f"{indent}📄 {entry.name} ({_format_size(entry)})"
+            elif not is_dir and fnmatch.fnmatch(entry_rel if "/" in pattern else entry.name, pattern):
+                yield f"📄 {entry_rel} ({_format_size(entry)})"
+            
+            if is_dir and level < depth and not entry.is_symlink():
+                yield from self._walk(root, entry_rel, level + 1, depth, rules, pattern)
+    
+    def _read_ignore_rules(self, dir_path: str) -> list[tuple[str, bool, bool, bool]]:
+        """Parse ignore files in dir_path into (pattern, negated, dir_only, anchored) rules."""
+        rules = []
+        for filename in self.IGNORE_FILES:
+            try:
+                with open(os.path.join(dir_path, filename), encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                negated = line.startswith("!")
+                line = line[1:] if negated else line
+                dir_only = line.endswith("/")
+                line = line.rstrip("/")
+                anchored = "/" in line
+                rules.append((line.lstrip("/"), negated, dir_only, anchored))
+        return rules
+
+
+def _is_ignored(
+    rel: str, name: str, is_dir: bool, rules: list[tuple[str, tuple[str, bool, bool, bool]]]
+) -> bool:
+    """Apply gitignore-style rules; the last matching rule wins."""
+    ignored = False
+    for base, (pattern, negated, dir_only, anchored) in rules:
+        if dir_only and not is_dir:
+            continue
+        target = (rel[len(base) + 1:] if base else rel) if anchored else name
+        if fnmatch.fnmatch(target, pattern):
+            ignored = not negated
+    return ignored
+
+
+def _format_size(entry: os.DirEntry) -> str:
+    """Human-readable size from a DirEntry's cached stat."""
+    try:
+        size = float(entry.stat().st_size)
+    except OSError:
+        return "?"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{int(size)} B" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
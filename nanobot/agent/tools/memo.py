@@ -0,0 +1,75 @@
+"""Within-turn memoization of idempotent tool results."""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+
+
+@dataclass
+class _Entry:
+    call_id: str
+    path: Path | None
+
+
+def _resolve(path: Any) -> Path | None:
+    if not isinstance(path, str) or not path:
+        return None
+    try:
+        return Path(path).expanduser().resolve()
+    except (OSError, RuntimeError):
+        return None
+
+
+class TurnMemo:
+    """
+    Remembers idempotent tool calls made during one agent turn.
+
+    A repeated call (same tool, same params) is answered with a short pointer
+    to the earlier tool result instead of running again and duplicating its
+    content in the conversation. A call to a non-idempotent tool with a "path"
+    param forgets results for that path and for listings of its parent
+    directories; any other non-idempotent call (e.g. exec) forgets everything.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, _Entry] = {}
+
+    @staticmethod
+    def _key(name: str, params: dict[str, Any]) -> str:
+        return f"{name}:{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+    def lookup(self, name: str, params: dict[str, Any]) -> str | None:
+        """Return a pointer to an earlier identical call, or None if it must run."""
+        if entry := self._entries.get(self._key(name, params)):
+            return (
+                f"[Unchanged since tool call {entry.call_id} earlier in this turn; "
+                f"see that result instead of calling {name} again.]"
+            )
+        return None
+
+    def record(self, tool: Tool | None, call_id: str, name: str, params: dict[str, Any], result: str) -> None:
+        """Update the memo after a call has run."""
+        if tool is None:
+            return
+        if not tool.idempotent:
+            self._invalidate(_resolve(params.get("path")))
+        elif not result.startswith(("Error", '{"error"')):  # Failures are worth retrying
+            self._entries[self._key(name, params)] = _Entry(call_id, _resolve(params.get("path")))
+
+    def forget(self, call_ids: list[str]) -> None:
+        """Drop entries whose original result is no longer in the conversation (e.g. pruned)."""
+        gone = set(call_ids)
+        self._entries = {k: e for k, e in self._entries.items() if e.call_id not in gone}
+
+    def _invalidate(self, path: Path | None) -> None:
+        if path is None:
+            self._entries.clear()
+            return
+        # A write changes the file itself and the listings of every directory above it
+        self._entries = {
+            k: e for k, e in self._entries.items()
+            if e.path is None or not (e.path == path or e.path in path.parents)
+        }
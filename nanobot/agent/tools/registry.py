@@ -3,6 +3,7 @@
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.memo import TurnMemo
 
 
 class ToolRegistry:
@@ -31,24 +32,40 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools
     
-    def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+    def get_definitions(self, names: list[str] | None = None) -> list[dict[str, Any]]:
+        """Get tool definitions in OpenAI format, for all tools or only the given names."""
+        if names is None:
+            return [tool.to_schema() for tool in self._tools.values()]
+        return [self._tools[n].to_schema() for n in names if n in self._tools]
     
-    async def execute(self, name: str, params: dict[str, Any]) -> str:
+    async def execute(
+        self,
+        name: str,
+        params: dict[str, Any],
+        memo: TurnMemo | None = None,
+        call_id: str = "",
+    ) -> str:
         """
         Execute a tool by name with given parameters.
         
         Args:
             name: Tool name.
             params: Tool parameters.
+            memo: Per-turn memo; a repeated idempotent call returns a pointer
+                to the earlier result instead of running again.
+            call_id: ID of this tool call, referenced by later repeats.
         
         Returns:
             Tool execution result as string.
-        
-        Raises:
-            KeyError: If tool not found.
         """
+        if memo and (pointer := memo.lookup(name, params)):
+            return pointer
+        result = await self._execute(name, params)
+        if memo:
+            memo.record(self._tools.get(name), call_id, name, params, result)
+        return result
+    
+    async def _execute(self, name: str, params: dict[str, Any]) -> str:
         tool = self._tools.get(name)
         if not tool:
             return f"Error: Tool '{name}' not found"
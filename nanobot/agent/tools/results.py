@@ -0,0 +1,112 @@
+"""Spill store for oversized tool results and the read_result tool that pages through it."""
+
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+
+
+class ResultStore:
+    """
+    Keeps large tool results on disk instead of in the conversation.
+
+    spill() replaces a result longer than the threshold with its first
+    excerpt_chars characters plus a handle; read_result pages through the rest.
+    Handles belong to the turn that created them and are released when it ends.
+    """
+
+    def __init__(self, threshold: int = 8000, excerpt_chars: int = 1500):
+        self.threshold = threshold
+        self.excerpt_chars = min(excerpt_chars, threshold)
+        self._dir: Path | None = None
+        self._results: dict[str, Path] = {}
+
+    def spill(self, result: str, tool_name: str, owned: list[str]) -> str:
+        """
+        Store result if it is too large and return what goes into the conversation.
+
+        Args:
+            result: Full tool output.
+            tool_name: Tool that produced it; read_result pages are never re-spilled.
+            owned: The current turn's handle list; the new handle is appended.
+        """
+        if self.threshold <= 0 or len(result) <= self.threshold or tool_name == ReadResultTool.name:
+            return result
+        try:
+            if self._dir is None:
+                self._dir = Path(tempfile.mkdtemp(prefix="nanobot-results-"))
+            handle = f"res_{uuid.uuid4().hex[:8]}"
+            path = self._dir / f"{handle}.txt"
+            path.write_text(result, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not spill {tool_name} result, keeping it inline: {e}")
+            return result
+
+        self._results[handle] = path
+        owned.append(handle)
+        shown = self.excerpt_chars
+        return (
+            f"{result[:shown]}\n\n"
+            f"[Output truncated: showing {shown} of {len(result)} characters. The full result is stored as "
+            f"{handle}; call read_result(handle=\"{handle}\", offset={shown}) to read more.]"
+        )
+
+    def read(self, handle: str, offset: int = 0, limit: int | None = None) -> str:
+        path = self._results.get(handle)
+        if path is None:
+            return f"Error: Unknown or expired result handle: {handle}"
+        text = path.read_text(encoding="utf-8")
+        limit = min(limit or self.threshold, self.threshold)
+        if offset >= len(text):
+            return f"Error: offset {offset} is past the end of {handle} ({len(text)} characters)"
+        end = min(offset + limit, len(text))
+        footer = f"next offset={end}" if end < len(text) else "end of result"
+        return f"{text[offset:end]}\n\n[{handle}: characters {offset}-{end} of {len(text)}; {footer}]"
+
+    def release(self, handles: list[str]) -> None:
+        """Delete the results a finished turn stored."""
+        for handle in handles:
+            if path := self._results.pop(handle, None):
+                path.unlink(missing_ok=True)
+        handles.clear()
+
+    def close(self) -> None:
+        """Delete everything, including results of turns that never finished."""
+        self._results.clear()
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+class ReadResultTool(Tool):
+    """Tool to page through tool results that were too large to include in full."""
+
+    name = "read_result"
+    description = (
+        "Read more of a tool result that was truncated into a handle (res_...). "
+        "Use offset to continue where the excerpt or previous page ended."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "handle": {"type": "string", "description": "Result handle, e.g. res_1a2b3c4d"},
+            "offset": {"type": "integer", "minimum": 0, "description": "Character offset to start from"},
+            "limit": {"type": "integer", "minimum": 100, "description": "Characters to return"},
+        },
+        "required": ["handle"],
+    }
+    idempotent = True
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+
+    async def execute(self, handle: str, offset: int = 0, limit: int | None = None, **kwargs: Any) -> str:
+        try:
+            return self.store.read(handle, offset, limit)
+        except OSError as e:
+            return f"Error reading {handle}: {e}"
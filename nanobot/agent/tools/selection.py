@@ -0,0 +1,112 @@
+"""Per-turn tool subset selection and the enable_tools meta-tool."""
+
+import re
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+# Tools are exposed to the model in groups; unknown (custom) tools are always exposed
+TOOL_GROUPS: dict[str, list[str]] = {
+    "files": ["read_file", "write_file", "edit_file", "list_dir", "read_result"],
+    "shell": ["exec"],
+    "web": ["web_search", "web_fetch"],
+    "messaging": ["message"],
+    "background": ["spawn", "cron"],
+    "claude_code": ["claude_code"],
+}
+CORE_GROUPS = ("files",)
+
+# Message patterns that switch a group on for the turn
+_GROUP_HINTS: dict[str, re.Pattern[str]] = {
+    "shell": re.compile(
+        r"\b(run|execute|command|terminal|shell|install|pip|npm|git|script|compile|build|tests?|"
+        r"process|bash|python|curl|disk|cpu)\b", re.I),
+    "web": re.compile(
+        r"https?://|www\.|\b(search|google|look ?up|browse|website|web|news|latest|online|url|link|"
+        r"article|docs|documentation|price|weather)\b", re.I),
+    "messaging": re.compile(r"\b(send|notify|forward|message)\b", re.I),
+    "background": re.compile(
+        r"\b(remind|reminder|schedule|every|daily|weekly|hourly|later|tomorrow|cron|background|"
+        r"spawn|subagent|in parallel)\b", re.I),
+    "claude_code": re.compile(
+        r"\b(code|coding|implement|refactor|bug|feature|repo|repository|pull request|claude)\b", re.I),
+}
+
+
+class ToolSelection:
+    """The tools exposed to the model during one turn; grows as groups are enabled."""
+
+    def __init__(self, registry: ToolRegistry, groups: set[str]):
+        self.registry = registry
+        self.groups = set(groups)
+        self._extra: set[str] = set()  # Tools called directly without their group being enabled
+
+    @property
+    def tool_names(self) -> list[str]:
+        grouped = {name for names in TOOL_GROUPS.values() for name in names}
+        active = {name for group in self.groups for name in TOOL_GROUPS.get(group, [])} | self._extra
+        names = [n for n in self.registry.tool_names if n in active or n not in grouped]
+        if self.inactive_groups():
+            return names
+        return [n for n in names if n != EnableToolsTool.name]
+
+    def inactive_groups(self) -> list[str]:
+        """Groups that have at least one registered tool and are not yet exposed."""
+        return [
+            group for group, names in TOOL_GROUPS.items()
+            if group not in self.groups and any(self.registry.has(n) for n in names)
+        ]
+
+    def definitions(self) -> list[dict[str, Any]]:
+        return self.registry.get_definitions(self.tool_names)
+
+    def observe(self, name: str, params: dict[str, Any]) -> None:
+        """Expand the selection after a tool call: enable_tools adds groups, other calls add themselves."""
+        if name == EnableToolsTool.name:
+            self.groups.update(g for g in params.get("groups", []) if g in TOOL_GROUPS)
+        else:
+            self._extra.add(name)
+
+
+def hinted_groups(message: str, skill_names: list[str] | None = None) -> set[str]:
+    """Non-core tool groups the message hints at."""
+    groups = {group for group, hint in _GROUP_HINTS.items() if hint.search(message)}
+    # Skills drive CLI tools through exec
+    if skill_names and re.search(r"\b(" + "|".join(map(re.escape, skill_names)) + r")\b", message, re.I):
+        groups.add("shell")
+    return groups
+
+
+def select_tools(registry: ToolRegistry, message: str, skill_names: list[str] | None = None) -> ToolSelection:
+    """Pick the core groups plus any group the message hints at."""
+    return ToolSelection(registry, set(CORE_GROUPS) | hinted_groups(message, skill_names))
+
+
+class EnableToolsTool(Tool):
+    """Meta-tool that exposes more tool groups for the rest of the turn."""
+
+    name = "enable_tools"
+    description = (
+        "Make more tools available. Groups: "
+        + "; ".join(f"{group} ({', '.join(names)})" for group, names in TOOL_GROUPS.items())
+        + ". Enabled tools can be called from the next step on."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "groups": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(TOOL_GROUPS)},
+                "description": "Tool groups to enable",
+            },
+        },
+        "required": ["groups"],
+    }
+    idempotent = True  # Touches no files, so it must not invalidate the turn memo
+
+    async def execute(self, groups: list[str], **kwargs: Any) -> str:
+        unknown = [g for g in groups if g not in TOOL_GROUPS]
+        if unknown:
+            return f"Error: Unknown tool groups: {', '.join(unknown)}. Available: {', '.join(TOOL_GROUPS)}"
+        return "Enabled: " + "; ".join(f"{g} ({', '.join(TOOL_GROUPS[g])})" for g in groups)
@@ -3,8 +3,13 @@
 import asyncio
 import os
 import re
+import shlex
+import shutil
+import signal
+import time
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from nanobot.agent.tools.base import Tool
 
@@ -19,6 +24,12 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        max_output_bytes: int = 10000,
+        cpu_limit: int = 0,
+        memory_limit_mb: int = 0,
+        persistent: bool = False,
+        max_sessions: int = 4,
+        session_idle_timeout: int = 900,
     ):
         self.timeout = timeout
         self.working_dir = working_dir
@@ -34,6 +45,18 @@ class ExecTool(Tool):
         ]
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_output_bytes = max_output_bytes
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+        self._session_key = "cli:direct"
+        self._sessions = (
+            ShellSessionPool(max_sessions, session_idle_timeout, self._make_preexec())
+            if persistent and shutil.which("bash") else None
+        )
+    
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Set the chat whose persistent shell subsequent commands run in."""
+        self._session_key = f"{channel}:{chat_id}"
     
     @property
     def name(self) -> str:
@@ -41,6 +64,12 @@ class ExecTool(Tool):
     
     @property
     def description(self) -> str:
+        if self._sessions is not None:
+            return (
+                "Execute a shell command and return its output. Use with caution. "
+                "Commands run in a persistent shell for this chat: the working directory, "
+                "environment variables and activated virtualenvs carry over between calls."
+            )
         return "Execute a shell command and return its output. Use with caution."
     
     @property
@@ -55,59 +84,138 @@ class ExecTool(Tool):
                 "working_dir": {
                     "type": "string",
                     "description": "Optional working directory for the command"
+                },
+                "reset": {
+                    "type": "boolean",
+                    "description": "Restart the persistent shell before running the command"
                 }
             },
             "required": ["command"]
         }
     
-    async def execute(self, command: str, working_dir: str | None = None, **kwargs: Any) -> str:
+    async def execute(
+        self, command: str, working_dir: str | None = None, reset: bool = False, **kwargs: Any
+    ) -> str:
         cwd = working_dir or self.working_dir or os.getcwd()
         guard_error = self._guard_command(command, cwd)
         if guard_error:
             return guard_error
         
+        if self._sessions is not None:
+            return await self._execute_persistent(command, working_dir, reset)
+        
         try:
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                # Own process group, so a timeout can kill the whole tree
+                start_new_session=os.name != "nt",
+                preexec_fn=self._make_preexec(),
             )
             
+            stdout = _OutputBuffer(self.max_output_bytes)
+            stderr = _OutputBuffer(self.max_output_bytes)
+            readers = [
+                asyncio.create_task(_pump(process.stdout, stdout)),
+                asyncio.create_task(_pump(process.stderr, stderr)),
+            ]
+            
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                await asyncio.wait_for(
+                    asyncio.gather(process.wait(), *readers),
                     timeout=self.timeout
                 )
             except asyncio.TimeoutError:
-                process.kill()
-                return f"Error: Command timed out after {self.timeout} seconds"
-            
-            output_parts = []
-            
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
-            
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
+                _kill_tree(process)
+                for task in readers:
+                    task.cancel()
+                partial = stdout.text()
+                message = f"Error: Command timed out after {self.timeout} seconds"
+                return f"{message}\n{partial}" if partial.strip() else message
             
-            if process.returncode != 0:
-                output_parts.append(f"\nExit code: {process.returncode}")
-            
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
+            return self._format_output(stdout, stderr, process.returncode)
             
         except Exception as e:
             return f"Error executing command: {str(e)}"
 
+    async def _execute_persistent(self, command: str, working_dir: str | None, reset: bool) -> str:
+        """Run a command in this chat's long-lived shell."""
+        assert self._sessions is not None
+        key = self._session_key
+        if reset:
+            self._sessions.discard(key)
+        
+        home = self.working_dir or os.getcwd()
+        try:
+            session = await self._sessions.acquire(key, home)
+        except Exception as e:
+            return f"Error: {e}"
+        
+        async with session.lock:
+            target = working_dir
+            if not target and self.restrict_to_workspace and not _is_within(session.cwd, home):
+                target = home  # Don't let an earlier cd leave the workspace
+            # The guard ran against the configured directory; check again where the command will run
+            guard_error = self._guard_command(command, target or session.cwd)
+            if guard_error:
+                return guard_error
+            if target:
+                command = f"cd {shlex.quote(target)} && {{\n{command}\n}}"
+            
+            stdout = _OutputBuffer(self.max_output_bytes)
+            stderr = _OutputBuffer(self.max_output_bytes)
+            try:
+                returncode = await session.run(command, stdout, stderr, self.timeout)
+            except asyncio.TimeoutError:
+                self._sessions.discard(key)
+                partial = stdout.text()
+                message = f"Error: Command timed out after {self.timeout} seconds (shell session was reset)"
+                return f"{message}\n{partial}" if partial.strip() else message
+            except (EOFError, ConnectionError):
+                self._sessions.discard(key)
+                output = self._format_output(stdout, stderr, 0)
+                return f"{output}\n\nShell exited; a new session will be started on the next command."
+        
+        return self._format_output(stdout, stderr, returncode)
+
+    def close(self) -> None:
+        """Kill all persistent shells."""
+        if self._sessions is not None:
+            self._sessions.close_all()
+
+    @staticmethod
+    def _format_output(stdout: "_OutputBuffer", stderr: "_OutputBuffer", returncode: int | None) -> str:
+        output_parts = []
+        
+        if stdout.total:
+            output_parts.append(stdout.text())
+        
+        if stderr.total:
+            stderr_text = stderr.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
+        
+        if returncode != 0:
+            output_parts.append(f"\nExit code: {returncode}")
+        
+        return "\n".join(output_parts) if output_parts else "(no output)"
+
+    def _make_preexec(self) -> Callable[[], None] | None:
+        """Build a child-side hook applying the configured CPU and memory rlimits."""
+        if os.name == "nt" or not (self.cpu_limit or self.memory_limit_mb):
+            return None
+        import resource
+        cpu, mem = self.cpu_limit, self.memory_limit_mb * 1024 * 1024
+
+        def set_limits() -> None:
+            if cpu:
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+            if mem:
+                resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+        return set_limits
+
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
@@ -139,3 +247,211 @@ class ExecTool(Tool):
                     return "Error: Command blocked by safety guard (path outside working dir)"
 
         return None
+
+
+class _OutputBuffer:
+    """Keeps the first and last bytes of a stream within a fixed budget."""
+
+    def __init__(self, limit: int):
+        self.head_limit = limit // 2
+        self.tail_limit = limit - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.tail_limit:
+                del self.tail[:len(self.tail) - self.tail_limit]
+
+    def text(self) -> str:
+        dropped = self.total - len(self.head) - len(self.tail)
+        if not dropped:
+            return (self.head + self.tail).decode("utf-8", errors="replace")
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        return f"{head}\n... (truncated, {dropped} bytes omitted) ...\n{tail}"
+
+
+async def _pump(stream: asyncio.StreamReader | None, buffer: _OutputBuffer) -> None:
+    """Drain a subprocess pipe into a bounded buffer."""
+    if stream is None:
+        return
+    while chunk := await stream.read(65536):
+        buffer.feed(chunk)
+
+
+class ShellSession:
+    """A long-lived bash process; each command's end is framed by a sentinel line."""
+
+    def __init__(self, cwd: str, preexec_fn: Callable[[], None] | None = None):
+        self.cwd = cwd
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self._preexec_fn = preexec_fn
+        self._marker = f"__NANOBOT_{uuid.uuid4().hex}__"
+        self._process: asyncio.subprocess.Process | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            "bash", "--noprofile", "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            start_new_session=True,
+            preexec_fn=self._preexec_fn,
+        )
+
+    async def run(
+        self, command: str, stdout: _OutputBuffer, stderr: _OutputBuffer, timeout: float
+    ) -> int:
+        """Run command in the shell, streaming output into the buffers; return its exit code."""
+        process = self._process
+        assert process and process.stdin and process.stdout and process.stderr
+        marker = self._marker
+        # The command travels as a quoted heredoc and runs via eval, so unbalanced
+        # quotes can't swallow the framing lines and stdin reads can't consume them.
+        script = (
+            f"IFS= read -r -d '' __nb_cmd <<'{marker}'\n{command}\n{marker}\n"
+            f'eval "$__nb_cmd" < /dev/null\n'
+            f"printf '\\n{marker} %s %s\\n' \"$?\" \"$PWD\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        self.last_used = time.monotonic()
+        process.stdin.write(script.encode())
+        await process.stdin.drain()
+        
+        tag = f"\n{marker}".encode()
+        status, _ = await asyncio.wait_for(
+            asyncio.gather(_read_until(process.stdout, tag, stdout), _read_until(process.stderr, tag, stderr)),
+            timeout=timeout,
+        )
+        self.last_used = time.monotonic()
+        code, _, cwd = status.decode("utf-8", errors="replace").strip().partition(" ")
+        self.cwd = cwd or self.cwd
+        return int(code) if code.lstrip("-").isdigit() else -1
+
+    def kill(self) -> None:
+        if self.alive:
+            _kill_tree(self._process)
+
+
+class ShellSessionPool:
+    """Persistent shells keyed by chat, capped in number and reaped when idle."""
+
+    def __init__(
+        self,
+        max_sessions: int = 4,
+        idle_timeout: int = 900,
+        preexec_fn: Callable[[], None] | None = None,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._preexec_fn = preexec_fn
+        self._sessions: dict[str, ShellSession] = {}
+        self._starting: dict[str, asyncio.Task[ShellSession]] = {}  # Shells being started, by key
+        self._reaper: asyncio.Task[None] | None = None
+
+    async def acquire(self, key: str, cwd: str) -> ShellSession:
+        """Return the live shell for key, starting one (and evicting an idle one) if needed."""
+        self._reap_idle()
+        session = self._sessions.get(key)
+        if session and session.alive:
+            return session
+        if task := self._starting.get(key):
+            return await asyncio.shield(task)  # Concurrent calls share one shell
+        self.discard(key)
+        
+        if len(self._sessions) + len(self._starting) >= self.max_sessions:
+            idle = [(s.last_used, k) for k, s in self._sessions.items() if not s.lock.locked()]
+            if not idle:
+                raise RuntimeError(f"Too many active shell sessions (max {self.max_sessions})")
+            self.discard(min(idle)[1])
+        
+        task = asyncio.create_task(self._start(key, cwd))
+        self._starting[key] = task
+        task.add_done_callback(lambda _: self._starting.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _start(self, key: str, cwd: str) -> ShellSession:
+        session = ShellSession(cwd, self._preexec_fn)
+        await session.start()
+        self._sessions[key] = session
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+        return session
+
+    def discard(self, key: str) -> None:
+        session = self._sessions.pop(key, None)
+        if session:
+            session.kill()
+
+    def close_all(self) -> None:
+        for task in list(self._starting.values()):
+            task.cancel()
+        for key in list(self._sessions):
+            self.discard(key)
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+
+    def _reap_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, session in list(self._sessions.items()):
+            if not session.alive or (session.last_used < cutoff and not session.lock.locked()):
+                self.discard(key)
+
+    async def _reap_loop(self) -> None:
+        while self._sessions:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            self._reap_idle()
+
+
+def _kill_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill a process and every process in its group."""
+    try:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _is_within(path: str, root: str) -> bool:
+    p, r = Path(path).resolve(), Path(root).resolve()
+    return p == r or r in p.parents
+
+
+async def _read_until(stream: asyncio.StreamReader, tag: bytes, buffer: _OutputBuffer) -> bytes:
+    """Drain stream into buffer up to tag; return the rest of the tag's line."""
+    keep = len(tag) - 1
+    pending = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            buffer.feed(pending)
+            raise EOFError("shell exited")
+        pending += chunk
+        idx = pending.find(tag)
+        if idx >= 0:
+            buffer.feed(pending[:idx])
+            rest = pending[idx + len(tag):]
+            while b"\n" not in rest and (more := await stream.read(65536)):
+                rest += more
+            return rest.split(b"\n", 1)[0]
+        # Hold back only a suffix that could be the start of a tag split across reads
+        hold = next((n for n in range(min(keep, len(pending)), 0, -1) if tag.startswith(pending[-n:])), 0)
+        buffer.feed(pending[:len(pending) - hold])
+        pending = pending[len(pending) - hold:]
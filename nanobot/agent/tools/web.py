@@ -1,33 +1,149 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
+import codecs
 import json
+import multiprocessing
 import os
 import re
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
+from loguru import logger
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.web_cache import CachedPage, FetchCache, SearchCache, cache_policy
+from nanobot.utils.html_extract import extract_html, fallback_extract
+from nanobot.utils.http import get_client
+from nanobot.utils.http import get_config as http_config
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
+BYTES_PER_CHAR = 20  # Download budget per requested output char (HTML markup is mostly stripped)
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024  # Hard ceiling on bytes read from any response
+_TEXT_TYPES = ("text/", "json", "xml", "javascript", "x-www-form-urlencoded")
+MAX_BATCH_URLS = 10  # Upper bound on urls in one web_fetch call
+INLINE_EXTRACT_CHARS = 20000  # Smaller pages are extracted in-process; IPC would cost more than parsing
 
+_extract_pool: ProcessPoolExecutor | None = None
+_extract_pool_workers = 0
+_extract_pool_generation = 0  # Bumped for every new pool, so concurrent failures reset it only once
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
 
+def _get_extract_pool(workers: int) -> tuple[ProcessPoolExecutor, int]:
+    """Shared worker pool for HTML extraction, sized for the largest caller; returns (pool, generation)."""
+    global _extract_pool, _extract_pool_workers, _extract_pool_generation
+    if _extract_pool is not None and workers > _extract_pool_workers:
+        _extract_pool.shutdown(wait=False)  # In-flight extractions finish on the old pool
+        _extract_pool = None
+    if _extract_pool is None:
+        # spawn: forking a process that runs an event loop and helper threads is unsafe
+        _extract_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _extract_pool_workers = workers
+        _extract_pool_generation += 1
+    return _extract_pool, _extract_pool_generation
 
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+def _reset_extract_pool(generation: int | None = None) -> None:
+    """Drop a broken pool so the next caller gets a fresh one; a stale generation is ignored."""
+    global _extract_pool
+    if _extract_pool is not None and generation in (None, _extract_pool_generation):
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+        _extract_pool = None
+
+
+def shutdown_extract_pool() -> None:
+    """Stop the HTML extraction workers (called when the agent or gateway stops)."""
+    _reset_extract_pool()
+
+
+def _extract_with_deadline(body: str, extract_mode: str, timeout: float) -> str:
+    """Run extract_html in a pool worker, aborting after timeout so a stuck page can't hold the worker."""
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        return extract_html(body, extract_mode)
+
+    def expire(signum: int, frame: Any) -> None:
+        raise TimeoutError(f"extraction took longer than {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_html(body, extract_mode)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _share_budget(lengths: list[int], total: int) -> list[int]:
+    """Split a character budget fairly: short texts keep their length, the rest share what is left."""
+    budgets = [0] * len(lengths)
+    remaining = total
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    for i, idx in enumerate(order):
+        budgets[idx] = min(lengths[idx], remaining // (len(order) - i))
+        remaining -= budgets[idx]
+    return budgets
+
+
+def _clip(result: dict[str, Any], max_chars: int) -> dict[str, Any]:
+    """Truncate an extracted fetch result to max_chars in place."""
+    if "error" in result or result.get("extractor") == "binary":
+        return result
+    if len(result["text"]) > max_chars:
+        result.update(truncated=True, length=max_chars, text=result["text"][:max_chars])
+    return result
+
+
+def _is_binary(content_type: str) -> bool:
+    """True for content types that extraction can't turn into text."""
+    ctype = content_type.split(";")[0].strip().lower()
+    return bool(ctype) and not any(t in ctype for t in _TEXT_TYPES)
+
+
+def _detect_charset(content_type: str, head: bytes) -> str:
+    """Charset from the Content-Type header, else an HTML meta tag, else UTF-8."""
+    m = re.search(r'charset=["\']?([\w.:-]+)', content_type, re.I)
+    if not m:
+        m = re.search(rb'<meta[^>]+charset=["\']?([\w.:-]+)', head[:4096], re.I)
+    if m:
+        name = m[1].decode("ascii", "ignore") if isinstance(m[1], bytes) else m[1]
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+async def _read_text(response: httpx.Response, max_bytes: int) -> tuple[str, bool]:
+    """
+    Stream and incrementally decode a response body, stopping at max_bytes.
+    
+    Returns:
+        (text, complete). Raises ValueError if the body turns out to be binary.
+    """
+    ctype = response.headers.get("content-type", "")
+    decoder = None
+    parts: list[str] = []
+    received = 0
+    async for chunk in response.aiter_bytes():
+        if decoder is None:
+            if not ctype and b"\x00" in chunk[:1024]:
+                raise ValueError("binary")
+            decoder = codecs.getincrementaldecoder(_detect_charset(ctype, chunk))(errors="replace")
+        if received + len(chunk) > max_bytes:
+            parts.append(decoder.decode(chunk[:max_bytes - received], final=True))
+            return "".join(parts), False
+        received += len(chunk)
+        parts.append(decoder.decode(chunk))
+    if decoder:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), True
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -47,6 +163,7 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
+    idempotent = True
     description = "Search the web. Returns titles, URLs, and snippets."
     parameters = {
         "type": "object",
@@ -57,9 +174,10 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(self, api_key: str | None = None, max_results: int = 5, cache: SearchCache | None = None):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self.cache = cache
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -67,16 +185,10 @@ class WebSearchTool(Tool):
         
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
-            
-            results = r.json().get("web", {}).get("results", [])
+            if self.cache:
+                results = await self.cache.get_or_fetch(query, n, lambda: self._search(query, n))
+            else:
+                results = await self._search(query, n)
             if not results:
                 return f"No results for: {query}"
             
@@ -88,76 +200,240 @@ class WebSearchTool(Tool):
             return "\n".join(lines)
         except Exception as e:
             return f"Error: {e}"
+    
+    async def _search(self, query: str, count: int) -> list[dict[str, Any]]:
+        r = await get_client("search").get(
+            "https://api.search.brave.com/res/v1/web/search",
+            params={"q": query, "count": count},
+            headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+            timeout=10.0
+        )
+        r.raise_for_status()
+        # Keep only what the output uses, so cached entries stay small
+        return [
+            {"title": item.get("title", ""), "url": item.get("url", ""), "description": item.get("description", "")}
+            for item in r.json().get("web", {}).get("results", [])
+        ]
 
 
 class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
-    description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    idempotent = True
+    description = (
+        "Fetch URL and extract readable content (HTML → markdown/text). "
+        "Pass urls to fetch several pages concurrently in one call; maxChars is then shared across them."
+    )
     parameters = {
         "type": "object",
         "properties": {
             "url": {"type": "string", "description": "URL to fetch"},
+            "urls": {
+                "type": "array",
+                "items": {"type": "string"},
+                "maxItems": MAX_BATCH_URLS,
+                "description": f"Several URLs to fetch at once (max {MAX_BATCH_URLS}); use instead of url"
+            },
             "extractMode": {"type": "string", "enum": ["markdown", "text"], "default": "markdown"},
             "maxChars": {"type": "integer", "minimum": 100}
-        },
-        "required": ["url"]
+        }
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        cache: FetchCache | None = None,
+        extract_workers: int = 2,
+        extract_timeout: float = 10.0,
+        max_concurrency: int = 4,
+    ):
         self.max_chars = max_chars
+        self.cache = cache
+        self.extract_workers = extract_workers
+        self.extract_timeout = extract_timeout
+        self.max_concurrency = max_concurrency
     
-    async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
+    async def execute(
+        self,
+        url: str | None = None,
+        urls: list[str] | None = None,
+        extractMode: str = "markdown",
+        maxChars: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         max_chars = maxChars or self.max_chars
-
+        if urls:
+            return await self._fetch_batch(urls, extractMode, max_chars)
+        if not url:
+            return json.dumps({"error": "Either url or urls is required"})
+        
+        result = await self._fetch(self._client(), url, extractMode, max_chars)
+        return json.dumps(_clip(result, max_chars))
+    
+    async def _fetch_batch(self, urls: list[str], extract_mode: str, max_chars: int) -> str:
+        """Fetch several URLs concurrently over the pooled client, sharing max_chars between them."""
+        urls = list(dict.fromkeys(urls))  # Drop duplicates, keep order
+        if len(urls) > MAX_BATCH_URLS:
+            return json.dumps({"error": f"At most {MAX_BATCH_URLS} urls per call, got {len(urls)}"})
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def fetch_one(client: httpx.AsyncClient, url: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self._fetch(client, url, extract_mode, max_chars)
+        
+        client = self._client()
+        results = await asyncio.gather(*(fetch_one(client, u) for u in urls))
+        
+        budgets = _share_budget([len(r.get("text", "")) for r in results], max_chars)
+        for result, budget in zip(results, budgets):
+            _clip(result, budget)
+        failed = sum(1 for r in results if "error" in r)
+        return json.dumps({"fetched": len(results) - failed, "failed": failed, "results": results})
+    
+    def _client(self) -> httpx.AsyncClient:
+        # max_concurrency also caps connections; http.maxConnections applies to the other pools
+        config = http_config()
+        return get_client(
+            "web",
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=min(self.max_concurrency, config.max_keepalive_connections),
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+    
+    async def _fetch(
+        self, client: httpx.AsyncClient, url: str, extract_mode: str, max_chars: int
+    ) -> dict[str, Any]:
+        """Fetch and extract one URL; the returned text is not yet clipped to max_chars."""
         # Validate URL before fetching
         is_valid, error_msg = _validate_url(url)
         if not is_valid:
-            return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
+            return {"error": f"URL validation failed: {error_msg}", "url": url}
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
+            max_bytes = min(max_chars * BYTES_PER_CHAR, MAX_DOWNLOAD_BYTES)
+            page, cached, cacheable = await self._get_page(client, url, max_bytes)
             
-            ctype = r.headers.get("content-type", "")
+            if _is_binary(page.content_type):
+                return {"url": url, "finalUrl": page.url, "status": page.status, "extractor": "binary",
+                        "contentType": page.content_type, "contentLength": page.content_length,
+                        "text": "Binary content was not downloaded."}
             
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
+            if extracted := page.extracted.get(extract_mode):
+                text, extractor = extracted["text"], extracted["extractor"]
             else:
-                text, extractor = r.text, "raw"
+                text, extractor = await self._extract(page, extract_mode)
+                # Fallback output stands in for a timed-out or failed extraction; retry it next time
+                if extractor != "fallback":
+                    page.extracted[extract_mode] = {"text": text, "extractor": extractor}
+                    if cacheable and self.cache:
+                        await self.cache.put(page, url)
             
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
-            
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            return {"url": url, "finalUrl": page.url, "status": page.status, "extractor": extractor,
+                    "cached": cached, "truncated": page.partial, "length": len(text), "text": text}
         except Exception as e:
-            return json.dumps({"error": str(e), "url": url})
+            return {"error": str(e), "url": url}
+    
+    async def _get_page(
+        self, client: httpx.AsyncClient, url: str, max_bytes: int
+    ) -> tuple[CachedPage, bool, bool]:
+        """
+        Fetch a page, serving it from the cache when fresh or revalidated.
+        
+        The body is streamed: headers are checked first, binary bodies are
+        never read, and text bodies stop at max_bytes.
+        
+        Returns:
+            (page, served_from_cache, cacheable)
+        """
+        cached = await self.cache.get(url) if self.cache else None
+        if cached and cached.is_fresh:
+            return cached, True, True
+        
+        headers = {"User-Agent": USER_AGENT, **(cached.validators if cached else {})}
+        async with client.stream("GET", url, headers=headers) as r:
+            if r.status_code == 304 and cached and self.cache:
+                cached.refresh(r.headers)
+                await self.cache.put(cached, url)
+                return cached, True, True
+            r.raise_for_status()
+            
+            ctype = r.headers.get("content-type", "")
+            length = r.headers.get("content-length")
+            page = CachedPage(
+                url=str(r.url),
+                status=r.status_code,
+                content_type=ctype,
+                body="",
+                etag=r.headers.get("etag"),
+                last_modified=r.headers.get("last-modified"),
+                content_length=int(length) if length and length.isdigit() else None,
+            )
+            if _is_binary(ctype):
+                return page, False, False
+            try:
+                page.body, complete = await _read_text(r, max_bytes)
+            except ValueError:
+                page.content_type = "application/octet-stream"
+                return page, False, False
+            page.partial = not complete
+        
+        storable, page.expires_at = cache_policy(r.headers)
+        # Partial bodies are never cached; without freshness or validators an entry could never be reused
+        cacheable = storable and complete and (page.is_fresh or bool(page.validators))
+        if cacheable and self.cache:
+            await self.cache.put(page, url)
+        return page, False, cacheable
+    
+    async def _extract(self, page: CachedPage, extract_mode: str) -> tuple[str, str]:
+        """Turn a fetched body into text; returns (text, extractor)."""
+        ctype = page.content_type
+        
+        # JSON
+        if "application/json" in ctype and not page.partial:
+            try:
+                return json.dumps(json.loads(page.body), indent=2), "json"
+            except ValueError:
+                pass
+        # HTML
+        if "text/html" in ctype or page.body[:256].lower().startswith(("<!doctype", "<html")):
+            return await self._extract_html(page.body, extract_mode)
+        return page.body, "raw"
     
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+    async def _extract_html(self, body: str, extract_mode: str) -> tuple[str, str]:
+        """Run readability in the worker pool, falling back to tag stripping on timeout or failure."""
+        if self.extract_workers <= 0 or len(body) < INLINE_EXTRACT_CHARS:
+            try:
+                return extract_html(body, extract_mode), "readability"
+            except Exception as e:
+                logger.warning(f"HTML extraction failed, using fallback: {e}")
+                return fallback_extract(body), "fallback"
+        
+        for retry in (True, False):
+            pool, generation = _get_extract_pool(self.extract_workers)
+            try:
+                text = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        pool, _extract_with_deadline, body, extract_mode, self.extract_timeout,
+                    ),
+                    timeout=self.extract_timeout,
+                )
+                return text, "readability"
+            except asyncio.TimeoutError:
+                # The worker stops itself at the same deadline, so the pool stays usable
+                logger.warning(f"HTML extraction timed out after {self.extract_timeout}s, using fallback")
+            except BrokenProcessPool as e:
+                # A worker died; the first caller to notice replaces the pool and everyone retries once
+                _reset_extract_pool(generation)
+                if retry:
+                    continue
+                logger.warning(f"HTML extraction failed, using fallback: {e}")
+            except Exception as e:
+                logger.warning(f"HTML extraction failed, using fallback: {e}")
+            break
+        return fallback_extract(body), "fallback"
@@ -0,0 +1,297 @@
+"""Caches for the web tools: on-disk pages for web_fetch, TTL results for web_search."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping
+
+from loguru import logger
+
+from nanobot.utils.helpers import get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import WebFetchConfig, WebSearchConfig
+
+
+@dataclass
+class CachedPage:
+    """A fetched page plus everything needed to revalidate and reuse it."""
+    url: str  # Final URL after redirects
+    status: int
+    content_type: str
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+    expires_at: float = 0.0  # Unix time until which the page is fresh without revalidation
+    content_length: int | None = None  # From the Content-Length header, if sent
+    partial: bool = False  # Body was cut off at the download cap
+    extracted: dict[str, dict[str, Any]] = field(default_factory=dict)  # extractMode -> {text, extractor}
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def refresh(self, headers: Mapping[str, str]) -> None:
+        """Apply headers from a 304 Not Modified response."""
+        self.etag = headers.get("etag") or self.etag
+        self.last_modified = headers.get("last-modified") or self.last_modified
+        self.expires_at = cache_policy(headers)[1]
+
+
+def cache_policy(headers: Mapping[str, str]) -> tuple[bool, float]:
+    """
+    Derive caching rules from response headers.
+
+    Returns:
+        (storable, expires_at). A page with expires_at in the past is stored
+        but revalidated with its ETag/Last-Modified before reuse.
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return False, 0.0
+    if "no-cache" in cache_control:
+        return True, 0.0
+
+    if m := re.search(r"(?:^|[,\s])max-age=(\d+)", cache_control):
+        return True, time.time() + int(m[1])
+    if expires := headers.get("expires"):
+        try:
+            return True, parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return True, 0.0
+    return True, 0.0
+
+
+class FetchCache:
+    """
+    Size-bounded page cache keyed by final URL.
+
+    Each page is one JSON file; file mtime doubles as the LRU clock. Requested
+    URLs that redirected are stored as small alias files pointing at the final URL.
+    Disk I/O runs in worker threads to keep the event loop free.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 100 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._size: int | None = None  # Lazily computed on first write
+        self._lock = threading.Lock()  # Writers share _size
+
+    async def get(self, url: str) -> CachedPage | None:
+        """Look up a page by requested or final URL."""
+        return await asyncio.to_thread(self._get, url)
+
+    async def put(self, page: CachedPage, request_url: str | None = None) -> None:
+        """Store a page, aliasing request_url to it if it redirected."""
+        await asyncio.to_thread(self._put, page, request_url)
+
+    def _get(self, url: str) -> CachedPage | None:
+        data = self._load(url)
+        if data and "alias" in data:
+            data = self._load(data["alias"])
+        if not data:
+            return None
+        try:
+            return CachedPage(**data)
+        except TypeError:
+            return None
+
+    def _put(self, page: CachedPage, request_url: str | None) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._write(page.url, asdict(page))
+                if request_url and request_url != page.url:
+                    self._write(request_url, {"alias": page.url})
+                if self._size is not None and self._size > self.max_bytes:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to write web cache entry for {page.url}: {e}")
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.json"
+
+    def _load(self, url: str) -> dict[str, Any] | None:
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # Mark as recently used
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url: str, data: dict[str, Any]) -> None:
+        path = self._path(url)
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        if self._size is None:
+            self._size = sum(self._entries_by_age()[1])
+        try:
+            self._size -= path.stat().st_size
+        except OSError:
+            pass
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+        self._size += len(payload)
+
+    def _entries_by_age(self) -> tuple[list[Path], list[int]]:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # Replaced while scanning
+                entries.append((st.st_mtime, entry.path, st.st_size))
+        entries.sort()
+        return [Path(p) for _, p, _ in entries], [size for _, _, size in entries]
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under 90% of the size cap."""
+        paths, sizes = self._entries_by_age()
+        total = sum(sizes)
+        target = self.max_bytes * 0.9
+        for path, size in zip(paths, sizes):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+
+def make_fetch_cache(config: "WebFetchConfig") -> FetchCache | None:
+    """Build the shared on-disk fetch cache from config, or None if disabled."""
+    if not config.cache_enabled:
+        return None
+    return FetchCache(get_data_path() / "cache" / "web", max_bytes=config.cache_max_mb * 1024 * 1024)
+
+
+class SearchCache:
+    """
+    TTL cache for web_search results keyed by normalized query and count.
+    
+    Lookups go to an in-memory LRU first, then to an optional on-disk tier
+    that survives restarts. Concurrent misses for the same key share a single
+    upstream request.
+    """
+    
+    def __init__(self, ttl: float = 600.0, max_entries: int = 256, cache_dir: Path | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Lookups that waited on an identical in-flight request
+        self._memory: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[list[dict[str, Any]]]] = {}
+    
+    @staticmethod
+    def key(query: str, count: int) -> str:
+        return f"{count}:{' '.join(query.lower().split())}"
+    
+    @property
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+    
+    async def get_or_fetch(
+        self,
+        query: str,
+        count: int,
+        fetch: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """Return cached results for the query, calling fetch at most once per key on a miss."""
+        key = self.key(query, count)
+        if (results := self._lookup(key)) is not None:
+            self.hits += 1
+            logger.debug(f"Web search cache hit for {key!r} ({self.stats})")
+            return results
+        if task := self._inflight.get(key):
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # Its own task, so waiters don't fail if the first caller is cancelled
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+        results = await fetch()
+        self._store(key, results)
+        return results
+    
+    def _lookup(self, key: str) -> list[dict[str, Any]] | None:
+        now = time.time()
+        if entry := self._memory.get(key):
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                return entry[1]
+            del self._memory[key]
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("expires_at", 0) <= now:
+            path.unlink(missing_ok=True)
+            return None
+        self._remember(key, data["expires_at"], data["results"])
+        return data["results"]
+    
+    def _store(self, key: str, results: list[dict[str, Any]]) -> None:
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, results)
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"expires_at": expires_at, "key": key, "results": results}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write web search cache entry: {e}")
+    
+    def _remember(self, key: str, expires_at: float, results: list[dict[str, Any]]) -> None:
+        self._memory[key] = (expires_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+
+def make_search_cache(config: "WebSearchConfig") -> SearchCache | None:
+    """Build a search cache from config, or None if disabled."""
+    if config.cache_ttl <= 0:
+        return None
+    cache_dir = get_data_path() / "cache" / "search" if config.cache_on_disk else None
+    return SearchCache(ttl=config.cache_ttl, cache_dir=cache_dir)
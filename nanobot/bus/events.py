@@ -1,5 +1,6 @@
 """Event types for the message bus."""
 
+import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -16,11 +17,22 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    # Placeholder in content -> task producing its replacement ("" keeps the placeholder),
+    # e.g. a voice note still being transcribed
+    pending: dict[str, asyncio.Task[str]] = field(default_factory=dict)
     
     @property
     def session_key(self) -> str:
         """Unique key for session identification."""
         return f"{self.channel}:{self.chat_id}"
+    
+    async def resolve_pending(self) -> None:
+        """Wait for pending parts of the content, all at once, and substitute them in."""
+        texts = await asyncio.gather(*self.pending.values())
+        for placeholder, text in zip(self.pending, texts):
+            if text:
+                self.content = self.content.replace(placeholder, text, 1)
+        self.pending = {}
 
 
 @dataclass
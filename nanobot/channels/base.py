@@ -1,13 +1,17 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 
+if TYPE_CHECKING:
+    from nanobot.providers.transcription import TranscriptionService
+
 
 class BaseChannel(ABC):
     """
@@ -18,6 +22,7 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+    transcription: "TranscriptionService | None" = None  # Set by channels that receive voice notes
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -83,13 +88,36 @@ class BaseChannel(ABC):
                     return True
         return False
     
+    @property
+    def can_transcribe(self) -> bool:
+        """Whether voice notes received on this channel can be transcribed."""
+        return bool(self.transcription and self.transcription.enabled)
+    
+    def _transcribe(self, audio: bytes | Awaitable[bytes], filename: str) -> asyncio.Task[str]:
+        """
+        Start transcribing a voice note in the background.
+        
+        Pass the returned task to _handle_message under the placeholder it
+        should replace; it resolves to "[transcription: ...]", or "" on failure.
+        Check can_transcribe first.
+        """
+        async def transcript() -> str:
+            text = await self.transcription.submit(audio, filename)
+            if not text:
+                return ""
+            logger.info(f"Transcribed {filename}: {text[:50]}...")
+            return f"[transcription: {text}]"
+        
+        return asyncio.create_task(transcript())
+    
     async def _handle_message(
         self,
         sender_id: str,
         chat_id: str,
         content: str,
         media: list[str] | None = None,
-        metadata: dict[str, Any] | None = None
+        metadata: dict[str, Any] | None = None,
+        pending: dict[str, asyncio.Task[str]] | None = None,
     ) -> None:
         """
         Handle an incoming message from the chat platform.
@@ -102,12 +130,17 @@ class BaseChannel(ABC):
             content: Message text content.
             media: Optional list of media URLs.
             metadata: Optional channel-specific metadata.
+            pending: Placeholders in content that are still being filled in
+                (see InboundMessage.pending). The message is published
+                without waiting for them.
         """
         if not self.is_allowed(sender_id):
             logger.warning(
                 f"Access denied for sender {sender_id} on channel {self.name}. "
                 f"Add them to allowFrom list in config to grant access."
             )
+            for task in (pending or {}).values():
+                task.cancel()
             return
         
         msg = InboundMessage(
@@ -115,8 +148,9 @@ class BaseChannel(ABC):
             sender_id=str(sender_id),
             chat_id=str(chat_id),
             content=content,
-            media=media or [],
-            metadata=metadata or {}
+            media=media if media is not None else [],  # By reference: channels may add files until pending parts resolve
+            metadata=metadata or {},
+            pending=pending or {},
         )
         
         await self.bus.publish_inbound(msg)
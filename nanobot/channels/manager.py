@@ -9,6 +9,8 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
+from nanobot.providers.transcription import GroqTranscriptionProvider, TranscriptionService
+from nanobot.utils.helpers import get_data_path
 
 
 class ChannelManager:
@@ -32,6 +34,12 @@ class ChannelManager:
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
         
+        # One transcription service for every channel that receives voice notes
+        transcription = TranscriptionService(
+            GroqTranscriptionProvider(api_key=self.config.providers.groq.api_key),
+            cache_dir=get_data_path() / "cache" / "transcripts",
+        )
+        
         # Telegram channel
         if self.config.channels.telegram.enabled:
             try:
@@ -39,7 +47,7 @@ class ChannelManager:
                 self.channels["telegram"] = TelegramChannel(
                     self.config.channels.telegram,
                     self.bus,
-                    groq_api_key=self.config.providers.groq.api_key,
+                    transcription=transcription,
                 )
                 logger.info("Telegram channel enabled")
             except ImportError as e:
@@ -50,7 +58,7 @@ class ChannelManager:
             try:
                 from nanobot.channels.whatsapp import WhatsAppChannel
                 self.channels["whatsapp"] = WhatsAppChannel(
-                    self.config.channels.whatsapp, self.bus
+                    self.config.channels.whatsapp, self.bus, transcription=transcription
                 )
                 logger.info("WhatsApp channel enabled")
             except ImportError as e:
@@ -83,7 +91,7 @@ class ChannelManager:
             try:
                 from nanobot.channels.qq import QQChannel
                 self.channels["qq"] = QQChannel(
-                    self.config.channels.qq, self.bus
+                    self.config.channels.qq, self.bus, transcription=transcription
                 )
                 logger.info("QQ channel enabled")
             except ImportError as e:
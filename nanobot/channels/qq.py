@@ -1,6 +1,7 @@
 """QQ channel implementation using OneBot 11 protocol."""
 
 import asyncio
+import html
 import json
 import re
 from typing import Any
@@ -11,6 +12,8 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import QQConfig
+from nanobot.providers.transcription import SUPPORTED_FORMATS, TranscriptionService
+from nanobot.utils.http import get_client
 
 
 class QQChannel(BaseChannel):
@@ -23,9 +26,10 @@ class QQChannel(BaseChannel):
 
     name = "qq"
 
-    def __init__(self, config: QQConfig, bus: MessageBus):
+    def __init__(self, config: QQConfig, bus: MessageBus, transcription: TranscriptionService | None = None):
         super().__init__(config, bus)
         self.config: QQConfig = config
+        self.transcription = transcription
         self._ws = None
         self._connected = False
 
@@ -128,6 +132,16 @@ class QQChannel(BaseChannel):
             # Parse CQ codes to plain text
             content = self._parse_cq_code(raw_message)
 
+            # Voice messages carry a download URL; transcribe without holding up the message
+            pending = {}
+            record = re.search(r'\[CQ:record,([^\]]+)\]', raw_message)
+            if record and "[语音]" in content and self.can_transcribe:
+                params = dict(p.split("=", 1) for p in record.group(1).split(",") if "=" in p)
+                filename = params.get("file") or "voice.amr"
+                # QQ usually sends SILK/AMR, which Whisper rejects; don't download what can't be read
+                if (url := params.get("url")) and filename.rsplit(".", 1)[-1].lower() in SUPPORTED_FORMATS:
+                    pending["[语音]"] = self._transcribe(self._download(html.unescape(url)), filename)
+
             # Build chat_id based on message type
             if message_type == "private":
                 chat_id = f"private:{user_id}"
@@ -147,7 +161,8 @@ class QQChannel(BaseChannel):
                     "time": data.get("time"),
                     "message_type": message_type,
                     "raw_message": raw_message
-                }
+                },
+                pending=pending,
             )
 
         elif post_type == "meta_event":
@@ -169,6 +184,12 @@ class QQChannel(BaseChannel):
             request_type = data.get("request_type")
             logger.info(f"Received request: {request_type}")
 
+    async def _download(self, url: str) -> bytes:
+        """Download a voice message from the OneBot server."""
+        resp = await get_client("qq").get(url, timeout=30.0)
+        resp.raise_for_status()
+        return resp.content
+
     def _parse_cq_code(self, text: str) -> str:
         """
         Parse CQ codes in message to plain text.
@@ -2,6 +2,7 @@
 
 import asyncio
 import re
+from pathlib import Path
 
 from loguru import logger
 from telegram import Update
@@ -11,6 +12,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import TelegramConfig
+from nanobot.providers.transcription import TranscriptionService
 
 
 def _markdown_to_telegram_html(text: str) -> str:
@@ -85,10 +87,10 @@ class TelegramChannel(BaseChannel):
     
     name = "telegram"
     
-    def __init__(self, config: TelegramConfig, bus: MessageBus, groq_api_key: str = ""):
+    def __init__(self, config: TelegramConfig, bus: MessageBus, transcription: TranscriptionService | None = None):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
-        self.groq_api_key = groq_api_key
+        self.transcription = transcription
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
     
@@ -211,6 +213,7 @@ class TelegramChannel(BaseChannel):
         # Build content from text and/or media
         content_parts = []
         media_paths = []
+        pending = {}
         
         # Text content
         if message.text:
@@ -237,37 +240,30 @@ class TelegramChannel(BaseChannel):
         
         # Download media if present
         if media_file and self._app:
-            try:
-                file = await self._app.bot.get_file(media_file.file_id)
-                ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
-                
-                # Save to workspace/media/
-                from pathlib import Path
-                media_dir = Path.home() / ".nanobot" / "media"
-                media_dir.mkdir(parents=True, exist_ok=True)
-                
-                file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
-                await file.download_to_drive(str(file_path))
-                
-                media_paths.append(str(file_path))
-                
-                # Handle voice transcription
-                if media_type == "voice" or media_type == "audio":
-                    from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
-                    if transcription:
-                        logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
-                        content_parts.append(f"[transcription: {transcription}]")
-                    else:
-                        content_parts.append(f"[{media_type}: {file_path}]")
-                else:
+            ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
+            
+            # Save to workspace/media/
+            media_dir = Path.home() / ".nanobot" / "media"
+            media_dir.mkdir(parents=True, exist_ok=True)
+            file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
+            
+            if media_type in ("voice", "audio") and self.can_transcribe:
+                # Publish now; download and transcription finish while the message is queued
+                placeholder = f"[{media_type}: {file_path}]"
+                content_parts.append(placeholder)
+                pending[placeholder] = asyncio.create_task(
+                    self._download_and_transcribe(media_file.file_id, file_path, media_type, media_paths)
+                )
+            else:
+                try:
+                    file = await self._app.bot.get_file(media_file.file_id)
+                    await file.download_to_drive(str(file_path))
+                    media_paths.append(str(file_path))
                     content_parts.append(f"[{media_type}: {file_path}]")
-                    
-                logger.debug(f"Downloaded {media_type} to {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to download media: {e}")
-                content_parts.append(f"[{media_type}: download failed]")
+                    logger.debug(f"Downloaded {media_type} to {file_path}")
+                except Exception as e:
+                    logger.error(f"Failed to download media: {e}")
+                    content_parts.append(f"[{media_type}: download failed]")
         
         content = "\n".join(content_parts) if content_parts else "[empty message]"
         
@@ -285,9 +281,30 @@ class TelegramChannel(BaseChannel):
                 "username": user.username,
                 "first_name": user.first_name,
                 "is_group": message.chat.type != "private"
-            }
+            },
+            pending=pending,
         )
     
+    async def _download_and_transcribe(
+        self, file_id: str, file_path: Path, media_type: str, media_paths: list[str]
+    ) -> str:
+        """Download a voice note and transcribe it; the file joins media_paths only once saved."""
+        try:
+            data = await self._download(file_id, file_path)
+        except Exception as e:
+            logger.error(f"Failed to download media: {e}")
+            return f"[{media_type}: download failed]"
+        media_paths.append(str(file_path))
+        return await self._transcribe(data, file_path.name)
+    
+    async def _download(self, file_id: str, file_path: Path) -> bytes:
+        """Download a file into memory, saving a copy to file_path."""
+        file = await self._app.bot.get_file(file_id)
+        data = bytes(await file.download_as_bytearray())
+        await asyncio.to_thread(file_path.write_bytes, data)
+        logger.debug(f"Downloaded {file_path.name} to {file_path}")
+        return data
+    
     def _get_extension(self, media_type: str, mime_type: str | None) -> str:
         """Get file extension based on media type."""
         if mime_type:
@@ -1,6 +1,7 @@
 """WhatsApp channel implementation using Node.js bridge."""
 
 import asyncio
+import base64
 import json
 from typing import Any
 
@@ -10,6 +11,9 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import WhatsAppConfig
+from nanobot.providers.transcription import TranscriptionService
+
+AUDIO_TIMEOUT = 60.0  # Seconds to wait for the bridge to send a voice note's audio
 
 
 class WhatsAppChannel(BaseChannel):
@@ -22,11 +26,13 @@ class WhatsAppChannel(BaseChannel):
     
     name = "whatsapp"
     
-    def __init__(self, config: WhatsAppConfig, bus: MessageBus):
+    def __init__(self, config: WhatsAppConfig, bus: MessageBus, transcription: TranscriptionService | None = None):
         super().__init__(config, bus)
         self.config: WhatsAppConfig = config
+        self.transcription = transcription
         self._ws = None
         self._connected = False
+        self._audio: dict[str, asyncio.Future[bytes]] = {}  # Message id -> audio still being downloaded
     
     async def start(self) -> None:
         """Start the WhatsApp channel by connecting to the bridge."""
@@ -88,6 +94,10 @@ class WhatsAppChannel(BaseChannel):
         except Exception as e:
             logger.error(f"Error sending WhatsApp message: {e}")
     
+    async def _wait_for_audio(self, message_id: str) -> bytes:
+        """Wait for the bridge to send the audio of a voice note."""
+        return await asyncio.wait_for(self._audio[message_id], AUDIO_TIMEOUT)
+    
     async def _handle_bridge_message(self, raw: str) -> None:
         """Handle a message from the bridge."""
         try:
@@ -107,10 +117,20 @@ class WhatsAppChannel(BaseChannel):
             # Extract just the phone number as chat_id
             chat_id = sender.split("@")[0] if "@" in sender else sender
             
-            # Handle voice transcription if it's a voice message
+            # A voice note's audio follows in a separate "audio" event; transcribe without holding up the message
+            pending = {}
             if content == "[Voice Message]":
-                logger.info(f"Voice message received from {chat_id}, but direct download from bridge is not yet supported.")
-                content = "[Voice Message: Transcription not available for WhatsApp yet]"
+                message_id = data.get("id")
+                if "audioMimetype" in data and message_id and self.can_transcribe:
+                    ext = "mp3" if data["audioMimetype"].startswith("audio/mpeg") else "ogg"
+                    # Registered now, so audio that arrives before the transcription task starts isn't dropped
+                    self._audio[message_id] = asyncio.get_running_loop().create_future()
+                    task = self._transcribe(self._wait_for_audio(message_id), f"{message_id}.{ext}")
+                    task.add_done_callback(lambda _: self._audio.pop(message_id, None))
+                    pending[content] = task
+                else:
+                    logger.info(f"Voice message received from {chat_id}, but it cannot be transcribed")
+                    content = "[Voice Message: Transcription not available]"
             
             await self._handle_message(
                 sender_id=chat_id,
@@ -120,9 +140,18 @@ class WhatsAppChannel(BaseChannel):
                     "message_id": data.get("id"),
                     "timestamp": data.get("timestamp"),
                     "is_group": data.get("isGroup", False)
-                }
+                },
+                pending=pending,
             )
         
+        elif msg_type == "audio":
+            future = self._audio.get(data.get("id", ""))
+            if future and not future.done():
+                if data.get("audio"):
+                    future.set_result(base64.b64decode(data["audio"]))
+                else:
+                    future.set_exception(OSError("the bridge could not download the voice note"))
+        
         elif msg_type == "status":
             # Connection status update
             status = data.get("status")
@@ -148,20 +148,20 @@ This file stores important information that should persist across sessions.
 
 
 def _make_provider(config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
-    from nanobot.providers.litellm_provider import LiteLLMProvider
+    """Create the provider registry from config, wrapped for failover if configured. Exits if no API key found."""
+    from nanobot.providers.failover import FailoverProvider
+    from nanobot.providers.registry import ProviderRegistry
     p = config.get_provider()
     model = config.agents.defaults.model
     if not (p and p.api_key) and not model.startswith("bedrock/"):
         console.print("[red]Error: No API key configured.[/red]")
         console.print("Set one in ~/.nanobot/config.json under providers section")
         raise typer.Exit(1)
-    return LiteLLMProvider(
-        api_key=p.api_key if p else None,
-        api_base=config.get_api_base(),
-        default_model=model,
-        extra_headers=p.extra_headers if p else None,
-    )
+    provider = ProviderRegistry(config)
+    defaults = config.agents.defaults
+    if defaults.fallback_models:
+        provider = FailoverProvider(provider, defaults.fallback_models, hedge=defaults.hedge)
+    return provider
 
 
 # ============================================================================
@@ -182,6 +182,9 @@ def gateway(
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.agent.tools.web import shutdown_extract_pool
+    from nanobot.providers.warmup import keep_warm, warm_providers
+    from nanobot.utils import http
     
     if verbose:
         import logging
@@ -190,6 +193,7 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
+    http.configure(config.http)
     bus = MessageBus()
     provider = _make_provider(config)
     
@@ -206,9 +210,21 @@ def gateway(
         max_iterations=config.agents.defaults.max_tool_iterations,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         claude_code_config=config.tools.claude_code,
+        spill_threshold=config.tools.spill_threshold,
+        spill_excerpt_chars=config.tools.spill_excerpt_chars,
+        prune_tokens=config.agents.defaults.context_prune_tokens,
+        dynamic_tools=config.tools.dynamic_selection,
+        model_routing=config.agents.defaults.routing,
+        response_cache=config.agents.defaults.response_cache,
+        track_usage=config.agents.defaults.track_usage,
+        session_token_budget=config.agents.defaults.session_token_budget,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        image_quality=config.agents.defaults.image_quality,
     )
     
     # Set cron callback (needs agent)
@@ -219,6 +235,7 @@ def gateway(
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            workload="cron",
         )
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
@@ -233,7 +250,7 @@ def gateway(
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.process_direct(prompt, session_key="heartbeat", workload="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -256,13 +273,33 @@ def gateway(
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
     
+    # Every model the agent may call, so none pays connection setup on its first request
+    defaults = config.agents.defaults
+    models = list(dict.fromkeys(
+        [defaults.model, *(m for m in defaults.routing.model_dump().values() if m), *defaults.fallback_models]
+    ))
+    
+    async def warm_up():
+        for model, result in (await warm_providers(provider, models)).items():
+            if isinstance(result, Exception):
+                console.print(f"[yellow]Warning: {model}: {result}[/yellow]")
+            elif result is None:
+                console.print(f"[green]✓[/green] Provider ready: {model}")
+            else:
+                console.print(f"[green]✓[/green] Provider ready: {model} (RTT {result * 1000:.0f} ms)")
+    
     async def run():
+        keepalive = None
         try:
+            if config.gateway.provider_ping_interval > 0:
+                keepalive = asyncio.create_task(keep_warm(provider, models, config.gateway.provider_ping_interval))
             await cron.start()
             await heartbeat.start()
+            # Warm-up runs alongside channel start-up so an unreachable provider doesn't delay it
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
+                *([warm_up()] if config.gateway.warm_providers else []),
             )
         except KeyboardInterrupt:
             console.print("\nShutting down...")
@@ -270,6 +307,11 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+        finally:
+            if keepalive:
+                keepalive.cancel()
+            shutdown_extract_pool()
+            await http.close_clients()
     
     asyncio.run(run())
 
@@ -290,8 +332,11 @@ def agent(
     from nanobot.config.loader import load_config
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
+    from nanobot.providers.base import LLMError
+    from nanobot.utils import http
     
     config = load_config()
+    http.configure(config.http)
     
     bus = MessageBus()
     provider = _make_provider(config)
@@ -302,15 +347,33 @@ def agent(
         workspace=config.workspace_path,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         claude_code_config=config.tools.claude_code,
+        spill_threshold=config.tools.spill_threshold,
+        spill_excerpt_chars=config.tools.spill_excerpt_chars,
+        prune_tokens=config.agents.defaults.context_prune_tokens,
+        dynamic_tools=config.tools.dynamic_selection,
+        model_routing=config.agents.defaults.routing,
+        response_cache=config.agents.defaults.response_cache,
+        track_usage=config.agents.defaults.track_usage,
+        session_token_budget=config.agents.defaults.session_token_budget,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        image_quality=config.agents.defaults.image_quality,
     )
     
     if message:
         # Single message mode
         async def run_once():
-            response = await agent_loop.process_direct(message, session_id)
-            console.print(f"\n{__logo__} {response}")
+            try:
+                response = await agent_loop.process_direct(message, session_id)
+                console.print(f"\n{__logo__} {response}")
+            except LLMError as e:
+                console.print(f"[red]{e}[/red]")
+                raise typer.Exit(1)
+            finally:
+                await http.close_clients()
         
         asyncio.run(run_once())
     else:
@@ -326,9 +389,12 @@ def agent(
                     
                     response = await agent_loop.process_direct(user_input, session_id)
                     console.print(f"\n{__logo__} {response}\n")
+                except LLMError as e:
+                    console.print(f"[red]{e}[/red]\n")
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
+            await http.close_clients()
         
         asyncio.run(run_interactive())
 
@@ -619,6 +685,44 @@ def cron_run(
 # ============================================================================
 
 
+@app.command()
+def usage(
+    days: int = typer.Option(7, "--days", "-d", help="Days to include"),
+    by: str = typer.Option("session", "--by", "-b", help="Group by: session, workload, model, channel or day"),
+):
+    """Show LLM token usage and latency."""
+    import time
+
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.store import ROLLUP_KEYS, UsageStore
+    
+    if by not in ROLLUP_KEYS:
+        console.print(f"[red]Unknown grouping '{by}'. Use one of: {', '.join(ROLLUP_KEYS)}[/red]")
+        raise typer.Exit(1)
+    
+    rows = UsageStore(get_data_dir() / "usage").rollup(since=time.time() - days * 86400, by=by)
+    if not rows:
+        console.print(f"No LLM usage recorded in the last {days} days.")
+        return
+    
+    table = Table(title=f"LLM Usage (last {days} days, by {by})")
+    table.add_column(by.capitalize(), style="cyan")
+    for column in ("Calls", "Prompt", "Completion", "Cached", "Avg Latency"):
+        table.add_column(column, justify="right")
+    
+    for row in rows:
+        table.add_row(
+            row["key"],
+            f"{row['calls']:,}",
+            f"{row['prompt_tokens']:,}",
+            f"{row['completion_tokens']:,}",
+            f"{row['cached_tokens']:,}",
+            f"{row['avg_latency_ms']:,} ms",
+        )
+    
+    console.print(table)
+
+
 @app.command()
 def status():
     """Show nanobot status."""
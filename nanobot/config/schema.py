@@ -55,6 +55,24 @@ class ChannelsConfig(BaseModel):
     qq: QQConfig = Field(default_factory=QQConfig)
 
 
+class ModelRoutingConfig(BaseModel):
+    """Model per kind of work; empty = agents.defaults.model."""
+    main: str = ""  # User turns
+    subagent: str = ""  # Background tasks started with spawn
+    announce: str = ""  # Summarizing finished background tasks for the user
+    heartbeat: str = ""
+    cron: str = ""
+    fast: str = ""  # Used for short user turns that need no tools beyond files (empty = classifier off)
+
+
+class ResponseCacheConfig(BaseModel):
+    """Exact-match cache of LLM responses under ~/.nanobot/cache/llm (opt-in)."""
+    enabled: bool = False
+    ttl: int = 3600  # Seconds a response is reused for an identical request
+    workloads: list[str] = Field(default_factory=lambda: ["heartbeat", "cron"])  # Kinds of work that may use it
+    max_mb: int = 50
+
+
 class AgentDefaults(BaseModel):
     """Default agent configuration."""
     workspace: str = "~/.nanobot/workspace"
@@ -62,6 +80,15 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    context_prune_tokens: int = 60000  # Stub out older tool results in a turn once the prompt exceeds this (0 = off)
+    fallback_models: list[str] = Field(default_factory=list)  # Tried in order when a model's provider fails
+    hedge: bool = False  # Also send to the next fallback if a model is slower than its recent p95 latency
+    routing: ModelRoutingConfig = Field(default_factory=ModelRoutingConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    track_usage: bool = True  # Record tokens and latency of every LLM call under ~/.nanobot/usage
+    session_token_budget: int = 0  # Max prompt + completion tokens per session per day (0 = unlimited)
+    image_max_edge: int = 1568  # Downscale images so the longer side is at most this many pixels (0 = keep size)
+    image_quality: int = 85  # JPEG quality used when re-encoding images
 
 
 class AgentsConfig(BaseModel):
@@ -74,6 +101,10 @@ class ProviderConfig(BaseModel):
     api_key: str = ""
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
+    max_concurrency: int = 16  # Ceiling for the adaptive in-flight request limit (halved on 429/overload)
+    rpm: int = 0  # Requests per minute (0 = unlimited)
+    tpm: int = 0  # Tokens per minute, estimated from prompt size + max_tokens (0 = unlimited)
+    max_retries: int = 3  # Retries for rate limits, overloads, 5xx, timeouts and connection errors
 
 
 class ProvidersConfig(BaseModel):
@@ -95,22 +126,53 @@ class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
     port: int = 18790
+    warm_providers: bool = True  # Connect to every configured model's provider at startup and report RTT
+    provider_ping_interval: int = 20  # Seconds between keep-alive pings to providers; keep below http.keepaliveExpiry (0 = off)
+
+
+class HttpConfig(BaseModel):
+    """Shared outbound HTTP connection pools (one per purpose: web, transcription, discord, ...)."""
+    http2: bool = False  # Requires the h2 package (pip install "httpx[http2]")
+    max_connections: int = 20  # Per pool (web_fetch uses tools.web.fetch.maxConcurrency instead)
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    timeout: float = 30.0  # Default read/write/pool timeout in seconds
+    connect_timeout: float = 10.0
 
 
 class WebSearchConfig(BaseModel):
     """Web search tool configuration."""
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    cache_ttl: int = 600  # Seconds to reuse results for a repeated query (0 = no cache)
+    cache_on_disk: bool = False  # Also keep results under ~/.nanobot/cache/search across restarts
+
+
+class WebFetchConfig(BaseModel):
+    """Web fetch tool configuration."""
+    max_chars: int = 50000
+    cache_enabled: bool = True  # Cache pages under ~/.nanobot/cache/web, revalidated via ETag/Last-Modified
+    cache_max_mb: int = 100
+    extract_workers: int = 2  # Processes for HTML extraction (0 = extract on the event loop)
+    extract_timeout: float = 10.0  # Seconds before falling back to plain tag stripping
+    max_concurrency: int = 4  # Parallel requests (and pooled connections) when web_fetch is given several urls
 
 
 class WebToolsConfig(BaseModel):
     """Web tools configuration."""
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
 
 
 class ExecToolConfig(BaseModel):
     """Shell exec tool configuration."""
     timeout: int = 60
+    max_output_bytes: int = 10000  # Per stream; keeps the head and tail of longer output
+    cpu_limit: int = 0  # CPU seconds per command (0 = unlimited, POSIX only)
+    memory_limit_mb: int = 0  # Address-space limit per command (0 = unlimited, POSIX only)
+    persistent_shell: bool = False  # Keep one bash per chat so cwd/env/venvs persist between commands
+    max_shell_sessions: int = 4
+    shell_idle_timeout: int = 900  # Seconds before an idle persistent shell is closed
 
 
 class ClaudeCodeConfig(BaseModel):
@@ -127,6 +189,9 @@ class ToolsConfig(BaseModel):
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     claude_code: ClaudeCodeConfig = Field(default_factory=ClaudeCodeConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    spill_threshold: int = 8000  # Tool results longer than this (chars) are replaced by an excerpt + read_result handle (0 = off)
+    spill_excerpt_chars: int = 1500  # Characters of a spilled result kept inline
+    dynamic_selection: bool = True  # Expose core tools plus groups matched to the message; the model can enable_tools for more
 
 
 class Config(BaseSettings):
@@ -135,6 +200,7 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     
     @property
@@ -166,6 +232,11 @@ class Config(BaseSettings):
                          p.gemini, p.zhipu, p.dashscope, p.moonshot, p.vllm, p.groq]
         return next((pr for pr in all_providers if pr.api_key), None)
 
+    def get_provider_name(self, model: str | None = None) -> str | None:
+        """Get the name of the matched provider (e.g. "openrouter"), as used under the providers section."""
+        p = self.get_provider(model)
+        return next((name for name in ProvidersConfig.model_fields if getattr(self.providers, name) is p), None)
+
     def get_api_key(self, model: str | None = None) -> str | None:
         """Get API key for the given model. Falls back to first available key."""
         p = self.get_provider(model)
@@ -1,6 +1,17 @@
 """LLM provider abstraction module."""
 
-from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+from nanobot.providers.failover import FailoverProvider
 from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.openai_compat import OpenAICompatProvider
+from nanobot.providers.registry import ProviderRegistry
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider"]
+__all__ = [
+    "LLMError",
+    "LLMProvider",
+    "LLMResponse",
+    "FailoverProvider",
+    "LiteLLMProvider",
+    "OpenAICompatProvider",
+    "ProviderRegistry",
+]
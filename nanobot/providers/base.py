@@ -27,6 +27,40 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+class LLMError(Exception):
+    """
+    A failed LLM request, classified so callers can decide whether to retry.
+
+    kind is one of: rate_limit, overloaded, server, timeout, connection, auth,
+    bad_request, unknown.
+    """
+
+    RETRYABLE = frozenset({"rate_limit", "overloaded", "server", "timeout", "connection"})
+
+    def __init__(
+        self,
+        message: str,
+        kind: str = "unknown",
+        status: int | None = None,
+        retry_after: float | None = None,
+        provider: str | None = None,
+    ):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+        self.retry_after = retry_after
+        self.provider = provider
+
+    @property
+    def retryable(self) -> bool:
+        return self.kind in self.RETRYABLE
+
+    def __str__(self) -> str:
+        where = f"{self.provider} " if self.provider else ""
+        status = f" (HTTP {self.status})" if self.status else ""
+        return f"LLM {where}{self.kind} error{status}: {super().__str__()}"
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -60,9 +94,24 @@ class LLMProvider(ABC):
         
         Returns:
             LLMResponse with content and/or tool calls.
+        
+        Raises:
+            LLMError: If the request fails.
         """
         pass
     
+    async def warm(self, model: str | None = None) -> float | None:
+        """
+        Open connections for a model ahead of its first request.
+        
+        Returns:
+            Round-trip time in seconds if one was measured, else None.
+        
+        Raises:
+            LLMError: If the endpoint cannot be reached.
+        """
+        return None
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -0,0 +1,200 @@
+"""Exact-match LLM response cache for repeated deterministic requests."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.helpers import get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ResponseCacheConfig
+
+# The system prompt carries the current time to the minute; within the TTL it is
+# left out of the key, otherwise no two requests would ever match
+_CURRENT_TIME = re.compile(r"(## Current Time\n)[^\n]*")
+
+
+def request_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """Stable hash of everything that determines a response."""
+    normalized = [
+        {**m, "content": _CURRENT_TIME.sub(r"\1-", m["content"])}
+        if m.get("role") == "system" and isinstance(m.get("content"), str) else m
+        for m in messages
+    ]
+    payload = json.dumps(
+        {"model": model, "messages": normalized, "tools": tools or [],
+         "max_tokens": max_tokens, "temperature": temperature},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk TTL cache of LLM responses keyed by request_key.
+
+    Each response is one JSON file; file mtime doubles as the LRU clock and the
+    directory is trimmed to max_bytes. Concurrent misses for the same key share
+    a single upstream request.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 3600.0, max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Lookups that waited on an identical in-flight request
+        self._size: int | None = None  # Lazily computed on first write
+        self._inflight: dict[str, asyncio.Task[LLMResponse]] = {}
+        self._lock = threading.Lock()  # Writes and eviction run in worker threads
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        """Return the cached response for key, calling fetch at most once per key on a miss."""
+        if task := self._inflight.get(key):
+            self.coalesced += 1
+        else:
+            # Its own task, so waiters don't fail if the first caller is cancelled
+            task = asyncio.create_task(self._lookup_or_fetch(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _lookup_or_fetch(self, key: str, fetch: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        # Disk I/O runs in worker threads to keep the event loop free
+        if (response := await asyncio.to_thread(self._lookup, key)) is not None:
+            self.hits += 1
+            logger.debug(f"LLM response cache hit ({self.stats})")
+            return response
+        self.misses += 1
+        response = await fetch()
+        await asyncio.to_thread(self._store, key, response)
+        return response
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key[:32]}.json"
+
+    def _lookup(self, key: str) -> LLMResponse | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key or data.get("expires_at", 0) <= time.time():
+            return None
+        os.utime(path)  # Mark as recently used
+        response = data["response"]
+        return LLMResponse(**{
+            **response,
+            "tool_calls": [ToolCallRequest(**tc) for tc in response["tool_calls"]],
+            "usage": {},  # Nothing was spent on a cache hit
+        })
+
+    def _store(self, key: str, response: LLMResponse) -> None:
+        data = {"key": key, "expires_at": time.time() + self.ttl, "response": asdict(response)}
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            self._write(path, payload)
+    
+    def _write(self, path: Path, payload: bytes) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if self._size is None:
+                self._size = sum(size for _, size in self._entries_by_age())
+            try:
+                self._size -= path.stat().st_size
+            except OSError:
+                pass
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to write LLM response cache entry: {e}")
+
+    def _entries_by_age(self) -> list[tuple[Path, int]]:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.path, st.st_size))
+        entries.sort()
+        return [(Path(p), size) for _, p, size in entries]
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under 90% of the size cap."""
+        entries = self._entries_by_age()
+        total = sum(size for _, size in entries)
+        for path, size in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+
+class CachedProvider(LLMProvider):
+    """Wraps a provider so identical requests are answered from a ResponseCache."""
+
+    def __init__(self, inner: LLMProvider, cache: ResponseCache):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.cache = cache
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.get_default_model()
+        key = request_key(model, messages, tools, max_tokens, temperature)
+        return await self.cache.get_or_fetch(key, lambda: self.inner.chat(
+            messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ))
+
+    async def warm(self, model: str | None = None) -> float | None:
+        return await self.inner.warm(model)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+def make_response_cache(config: "ResponseCacheConfig") -> ResponseCache | None:
+    """Build the on-disk response cache from config, or None if disabled."""
+    if not config.enabled or config.ttl <= 0:
+        return None
+    return ResponseCache(
+        get_data_path() / "cache" / "llm", ttl=config.ttl, max_bytes=config.max_mb * 1024 * 1024,
+    )
@@ -0,0 +1,123 @@
+"""Failover across a chain of models, with optional request hedging."""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+
+HEDGE_MIN_SAMPLES = 20  # Successful calls needed before a model's p95 is trusted
+HEDGE_DEFAULT_DELAY = 10.0  # Seconds to wait before hedging while p95 is unknown
+_LATENCY_WINDOW = 100
+
+
+class _BothFailedError(Exception):
+    """Both requests of a hedged pair failed; their errors are already recorded."""
+
+
+class FailoverProvider(LLMProvider):
+    """
+    Wraps a provider so that a failing model falls over to the next one in a chain.
+
+    The chain for a request is the requested model followed by fallback_models.
+    With hedge enabled, the first fallback is also sent the same request when the
+    requested model has not answered within its recent p95 latency. Latency is
+    measured to the complete response, not the first byte, which suits these
+    non-streaming calls. Whichever answers first wins and the other request is
+    cancelled.
+    """
+
+    def __init__(self, inner: LLMProvider, fallback_models: list[str], hedge: bool = False):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.fallback_models = fallback_models
+        self.hedge = hedge
+        self._latencies: dict[str, deque[float]] = {}
+
+    def hedge_delay(self, model: str) -> float:
+        """The model's p95 full-response latency over recent successful calls."""
+        samples = self._latencies.get(model)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        ordered = sorted(samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.get_default_model()
+        chain = [model] + [m for m in self.fallback_models if m != model]
+
+        async def call(m: str) -> LLMResponse:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            response = await self.inner.chat(
+                messages, tools=tools, model=m, max_tokens=max_tokens, temperature=temperature,
+            )
+            self._latencies.setdefault(m, deque(maxlen=_LATENCY_WINDOW)).append(loop.time() - start)
+            return response
+
+        errors: list[LLMError] = []
+        i = 0
+        while i < len(chain):
+            try:
+                if self.hedge and i + 1 < len(chain):
+                    return await self._hedged(call, chain[i], chain[i + 1], errors)
+                return await call(chain[i])
+            except _BothFailedError:
+                pass  # Both errors were already recorded
+            except LLMError as e:
+                errors.append(e)
+            i += 2 if self.hedge and i + 1 < len(chain) else 1
+            if i < len(chain):
+                logger.warning(f"{errors[-1]}; failing over to {chain[i]}")
+        raise errors[0]
+
+    async def _hedged(self, call, primary: str, secondary: str, errors: list[LLMError]) -> LLMResponse:
+        """
+        Run primary, adding secondary if primary is slow or fails.
+
+        Each LLMError is appended to errors. If both fail, the last one is raised
+        (it is already in errors); any other exception is raised immediately.
+        """
+        delay = self.hedge_delay(primary)
+        tasks = {asyncio.create_task(call(primary))}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=delay)
+            for task in done:
+                if not task.exception():
+                    return task.result()
+                if not isinstance(task.exception(), LLMError):
+                    raise task.exception()
+                errors.append(task.exception())
+                logger.warning(f"{task.exception()}; failing over to {secondary}")
+            if pending:
+                logger.info(f"{primary} slower than its p95 of {delay:.1f}s, hedging with {secondary}")
+
+            pending.add(asyncio.create_task(call(secondary)))
+            tasks |= pending
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception():
+                        return task.result()
+                    if not isinstance(task.exception(), LLMError):
+                        raise task.exception()
+                    errors.append(task.exception())
+            raise _BothFailedError()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def warm(self, model: str | None = None) -> float | None:
+        return await self.inner.warm(model)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
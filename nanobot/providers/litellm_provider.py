@@ -1,12 +1,9 @@
 """LiteLLM provider implementation for multi-provider support."""
 
-import os
 from typing import Any
 
-import litellm
-from litellm import acompletion
-
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.ratelimit import classify_error
 
 
 class LiteLLMProvider(LLMProvider):
@@ -14,7 +11,9 @@ class LiteLLMProvider(LLMProvider):
     LLM provider using LiteLLM for multi-provider support.
     
     Supports OpenRouter, Anthropic, OpenAI, Gemini, and many other providers through
-    a unified interface.
+    a unified interface. litellm itself is imported on first construction, since
+    importing it takes seconds; providers that speak the OpenAI API directly use
+    OpenAICompatProvider instead.
     """
     
     def __init__(
@@ -23,10 +22,15 @@ class LiteLLMProvider(LLMProvider):
         api_base: str | None = None,
         default_model: str = "anthropic/claude-opus-4-5",
         extra_headers: dict[str, str] | None = None,
+        provider: str = "",
     ):
+        import litellm
+
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        # Name under the providers config section, for errors and logs
+        self.provider = provider or default_model.split("/", 1)[0]
         
         # Detect provider type from model name and api_base
         model_lower = default_model.lower()
@@ -46,40 +50,6 @@ class LiteLLMProvider(LLMProvider):
         # Only treat as vLLM if api_base is set AND model is not a known provider AND not aihubmix
         self.is_vllm = bool(api_base) and not self.is_openrouter and not self.is_aihubmix and not self._is_known_provider
 
-
-        # Configure LiteLLM based on provider
-        if api_key:
-            if self.is_openrouter:
-                # OpenRouter mode - set key
-                os.environ["OPENROUTER_API_KEY"] = api_key
-            elif self.is_aihubmix:
-                # AiHubMix gateway - OpenAI-compatible
-                os.environ["OPENAI_API_KEY"] = api_key
-            elif self.is_vllm:
-                # vLLM/custom endpoint - uses OpenAI-compatible API
-                os.environ["HOSTED_VLLM_API_KEY"] = api_key
-            elif "deepseek" in default_model:
-                os.environ.setdefault("DEEPSEEK_API_KEY", api_key)
-            elif "anthropic" in default_model:
-                os.environ.setdefault("ANTHROPIC_API_KEY", api_key)
-            elif "openai" in default_model or "gpt" in default_model:
-                os.environ.setdefault("OPENAI_API_KEY", api_key)
-            elif "gemini" in default_model.lower():
-                os.environ.setdefault("GEMINI_API_KEY", api_key)
-            elif "zhipu" in default_model or "glm" in default_model or "zai" in default_model:
-                os.environ.setdefault("ZAI_API_KEY", api_key)
-                os.environ.setdefault("ZHIPUAI_API_KEY", api_key)
-            elif "dashscope" in default_model or "qwen" in default_model.lower():
-                os.environ.setdefault("DASHSCOPE_API_KEY", api_key)
-            elif "groq" in default_model:
-                os.environ.setdefault("GROQ_API_KEY", api_key)
-            elif "moonshot" in default_model or "kimi" in default_model:
-                os.environ.setdefault("MOONSHOT_API_KEY", api_key)
-                os.environ.setdefault("MOONSHOT_API_BASE", api_base or "https://api.moonshot.cn/v1")
-        
-        if api_base:
-            litellm.api_base = api_base
-        
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
     
@@ -103,6 +73,9 @@ class LiteLLMProvider(LLMProvider):
         
         Returns:
             LLMResponse with content and/or tool calls.
+        
+        Raises:
+            LLMError: If litellm raises; the error is classified by status and type.
         """
         model = model or self.default_model
         
@@ -139,9 +112,14 @@ class LiteLLMProvider(LLMProvider):
             "temperature": temperature,
         }
         
-        # Pass api_base directly for custom endpoints (vLLM, etc.)
+        # Credentials and endpoint go with each request, never into os.environ or
+        # litellm globals, so differently configured providers can coexist
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
         if self.api_base:
             kwargs["api_base"] = self.api_base
+        elif model.startswith("moonshot/"):
+            kwargs["api_base"] = "https://api.moonshot.cn/v1"
         
         # Pass extra headers (e.g. APP-Code for AiHubMix)
         if self.extra_headers:
@@ -151,15 +129,13 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        from litellm import acompletion
+
         try:
             response = await acompletion(**kwargs)
-            return self._parse_response(response)
         except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            raise classify_error(e, self.provider) from e
+        return self._parse_response(response)
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -191,6 +167,9 @@ class LiteLLMProvider(LLMProvider):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
             }
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            if details and getattr(details, "cached_tokens", None):
+                usage["cached_tokens"] = details.cached_tokens
         
         return LLMResponse(
             content=message.content,
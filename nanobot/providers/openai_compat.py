@@ -0,0 +1,185 @@
+"""Native provider for OpenAI-compatible chat completion endpoints."""
+
+import json
+import time
+from typing import Any
+
+import httpx
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.ratelimit import classify_error, kind_for_status, parse_retry_after
+from nanobot.utils.http import get_client
+
+# Providers served by this class -> default API base (None = api_base must be configured)
+OPENAI_COMPAT_PROVIDERS: dict[str, str | None] = {
+    "openrouter": "https://openrouter.ai/api/v1",
+    "aihubmix": "https://aihubmix.com/v1",
+    "deepseek": "https://api.deepseek.com",
+    "moonshot": "https://api.moonshot.cn/v1",
+    "dashscope": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+    "vllm": None,
+}
+
+# Routing prefixes in model names that the upstream API does not expect
+_MODEL_PREFIXES = {
+    "openrouter": "openrouter/",
+    "deepseek": "deepseek/",
+    "moonshot": "moonshot/",
+    "dashscope": "dashscope/",
+    "vllm": "hosted_vllm/",
+}
+
+
+class OpenAICompatProvider(LLMProvider):
+    """
+    LLM provider that talks to OpenAI-compatible /chat/completions endpoints directly.
+
+    Requests go through the pooled "llm" HTTP client, so connections to the
+    provider stay open between calls and litellm is never imported.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: str | None = None,
+        api_base: str | None = None,
+        default_model: str = "anthropic/claude-opus-4-5",
+        extra_headers: dict[str, str] | None = None,
+        timeout: float = 600.0,
+    ):
+        api_base = api_base or OPENAI_COMPAT_PROVIDERS.get(provider)
+        if not api_base:
+            raise ValueError(f"No API base configured for provider '{provider}'")
+        super().__init__(api_key, api_base.rstrip("/"))
+        self.provider = provider
+        self.default_model = default_model
+        self.extra_headers = extra_headers or {}
+        self.timeout = timeout
+
+    def _model_name(self, model: str) -> str:
+        if self.provider == "aihubmix":
+            return model.split("/")[-1]
+        prefix = _MODEL_PREFIXES.get(self.provider)
+        if prefix and model.startswith(prefix):
+            return model[len(prefix):]
+        return model
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request to the provider's API.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'deepseek/deepseek-chat').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+
+        Raises:
+            LLMError: On HTTP errors, transport failures and malformed responses.
+        """
+        model = self._model_name(model or self.default_model)
+
+        # kimi-k2.5 only supports temperature=1.0
+        if "kimi-k2.5" in model.lower():
+            temperature = 1.0
+
+        body: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if tools:
+            body["tools"] = tools
+            body["tool_choice"] = "auto"
+
+        headers = {**self.extra_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        try:
+            response = await get_client("llm").post(
+                f"{self.api_base}/chat/completions",
+                json=body,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+            )
+        except httpx.HTTPError as e:
+            raise classify_error(e, self.provider) from e
+        if response.is_error:
+            raise LLMError(
+                response.text[:500],
+                kind=kind_for_status(response.status_code),
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers),
+                provider=self.provider,
+            )
+        try:
+            return self._parse_response(response.json())
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Malformed response: {e}", kind="server", provider=self.provider) from e
+
+    async def warm(self, model: str | None = None) -> float | None:
+        """Open a pooled connection with a HEAD request and measure its round trip."""
+        headers = {**self.extra_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        start = time.perf_counter()
+        try:
+            # Any status counts: the point is DNS, TCP and TLS, not the response
+            await get_client("llm").head(f"{self.api_base}/models", headers=headers, timeout=10.0)
+        except httpx.HTTPError as e:
+            raise classify_error(e, self.provider) from e
+        return time.perf_counter() - start
+
+    def _parse_response(self, data: dict[str, Any]) -> LLMResponse:
+        """Parse a chat completion JSON body into our standard format."""
+        choice = data["choices"][0]
+        message = choice.get("message") or {}
+
+        tool_calls = []
+        for tc in message.get("tool_calls") or []:
+            args = tc["function"].get("arguments") or "{}"
+            if isinstance(args, str):
+                try:
+                    args = json.loads(args)
+                except json.JSONDecodeError:
+                    args = {"raw": args}
+            tool_calls.append(ToolCallRequest(
+                id=tc["id"],
+                name=tc["function"]["name"],
+                arguments=args,
+            ))
+
+        usage = {}
+        if data.get("usage"):
+            usage = {
+                "prompt_tokens": data["usage"].get("prompt_tokens", 0),
+                "completion_tokens": data["usage"].get("completion_tokens", 0),
+                "total_tokens": data["usage"].get("total_tokens", 0),
+            }
+            details = data["usage"].get("prompt_tokens_details") or {}
+            if details.get("cached_tokens"):
+                usage["cached_tokens"] = details["cached_tokens"]
+
+        return LLMResponse(
+            content=message.get("content"),
+            tool_calls=tool_calls,
+            finish_reason=choice.get("finish_reason") or "stop",
+            usage=usage,
+        )
+
+    def get_default_model(self) -> str:
+        """Get the default model."""
+        return self.default_model
@@ -0,0 +1,221 @@
+"""Per-provider request limiting: adaptive concurrency, token buckets and retries."""
+
+import asyncio
+import email.utils
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMError, LLMResponse
+
+CHARS_PER_TOKEN = 4  # Rough prompt size estimate for the tokens-per-minute bucket
+BACKOFF_BASE = 1.0  # Seconds; doubled per attempt, with full jitter
+BACKOFF_MAX = 30.0
+MAX_RETRY_AFTER = 120.0  # A provider asking us to wait longer than this fails the request instead
+
+
+def parse_retry_after(headers: Any) -> float | None:
+    """Read the wait time from retry-after-ms or Retry-After (seconds or HTTP date)."""
+    if not headers:
+        return None
+    try:
+        if value := headers.get("retry-after-ms"):
+            return float(value) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def kind_for_status(status: int) -> str:
+    """Classify an HTTP error status as an LLMError kind."""
+    if status == 429:
+        return "rate_limit"
+    if status in (503, 529):
+        return "overloaded"
+    if status in (401, 403):
+        return "auth"
+    if status == 408:
+        return "timeout"
+    if status >= 500:
+        return "server"
+    if status >= 400:
+        return "bad_request"
+    return "unknown"
+
+
+def classify_error(e: Exception, provider: str | None = None) -> LLMError:
+    """Turn an exception from an HTTP client or SDK (httpx, litellm, openai) into an LLMError."""
+    if isinstance(e, LLMError):
+        e.provider = e.provider or provider
+        return e
+    # Match on class names so this works without importing litellm or openai
+    names = {cls.__name__ for cls in type(e).__mro__}
+    response = getattr(e, "response", None)
+    headers = getattr(e, "headers", None) or getattr(response, "headers", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if names & {"TimeoutException", "TimeoutError", "Timeout", "APITimeoutError"}:
+        kind = "timeout"
+    elif names & {"TransportError", "ConnectionError", "APIConnectionError"}:
+        kind = "connection"
+    elif isinstance(status, int):
+        kind = kind_for_status(status)
+    else:
+        kind = "unknown"
+    return LLMError(
+        str(e) or type(e).__name__,
+        kind=kind,
+        status=status if isinstance(status, int) else None,
+        retry_after=parse_retry_after(headers),
+        provider=provider,
+    )
+
+
+def estimate_request_tokens(messages: list[dict[str, Any]], max_tokens: int) -> int:
+    """Tokens a request may consume: the prompt estimate plus the completion budget."""
+    prompt = len(json.dumps(messages, ensure_ascii=False, default=str)) // CHARS_PER_TOKEN
+    return prompt + max_tokens
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at per_minute / 60 tokens per second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._rate = per_minute / 60
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # Waiters are served in order
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)  # An oversized request waits for a full bucket, not forever
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self._rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight requests.
+
+    Each success raises the limit by 1/limit (about +1 per full window of
+    requests); each rate-limit or overload response halves it.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = min(min_limit, self.max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        self.limit = max(self.min_limit, self.limit / 2)
+
+
+class ProviderLimiter:
+    """Concurrency, rate limits and retries for all requests to one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 16,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_retries: int = 3,
+    ):
+        self.name = name
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_retries = max_retries
+
+    async def run(self, call: Callable[[], Awaitable[LLMResponse]], estimated_tokens: int = 0) -> LLMResponse:
+        """
+        Run a request under the limits, retrying transient failures.
+
+        Raises:
+            LLMError: If the error is not retryable or retries are exhausted.
+        """
+        # Tokens are charged once per request, not per attempt
+        if self.tokens:
+            await self.tokens.acquire(estimated_tokens)
+        attempt = 0
+        while True:
+            if self.requests:
+                await self.requests.acquire()
+            try:
+                async with self.concurrency.slot():
+                    response = await call()
+            except Exception as e:
+                error = classify_error(e, self.name)
+                if error.kind in ("rate_limit", "overloaded"):
+                    self.concurrency.on_overload()
+                delay = self._delay(error, attempt)
+                if delay is None:
+                    if self.tokens:
+                        self.tokens.adjust(-estimated_tokens)  # A failed request generated nothing
+                    if error is e:
+                        raise
+                    raise error from e
+                attempt += 1
+                logger.warning(
+                    f"{error}; retry {attempt}/{self.max_retries} in {delay:.1f}s "
+                    f"(concurrency limit {int(self.concurrency.limit)})"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.concurrency.on_success()
+            if self.tokens and response.usage.get("total_tokens"):
+                self.tokens.adjust(response.usage["total_tokens"] - estimated_tokens)
+            return response
+
+    def _delay(self, error: LLMError, attempt: int) -> float | None:
+        """Seconds to wait before retrying, or None to give up."""
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        if error.retry_after is not None:
+            if error.retry_after > MAX_RETRY_AFTER:
+                return None
+            return error.retry_after + random.uniform(0, BACKOFF_BASE)
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
@@ -0,0 +1,110 @@
+"""Provider registry: one configured provider per model, chosen per request."""
+
+from typing import TYPE_CHECKING, Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.openai_compat import OPENAI_COMPAT_PROVIDERS, OpenAICompatProvider
+from nanobot.providers.ratelimit import ProviderLimiter, estimate_request_tokens
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import Config
+
+
+def create_provider(config: "Config", model: str) -> LLMProvider:
+    """
+    Build a provider for a model from config.
+
+    OpenAI-compatible providers get the native OpenAICompatProvider; everything
+    else goes through LiteLLMProvider, which imports litellm on construction.
+    """
+    p = config.get_provider(model)
+    name = config.get_provider_name(model)
+    api_base = config.get_api_base(model)
+    if p and name in OPENAI_COMPAT_PROVIDERS and (api_base or OPENAI_COMPAT_PROVIDERS[name]):
+        return OpenAICompatProvider(
+            provider=name,
+            api_key=p.api_key,
+            api_base=api_base,
+            default_model=model,
+            extra_headers=p.extra_headers,
+        )
+    from nanobot.providers.litellm_provider import LiteLLMProvider
+    return LiteLLMProvider(
+        api_key=p.api_key if p else None,
+        api_base=api_base,
+        default_model=model,
+        extra_headers=p.extra_headers if p else None,
+        provider=name or "",
+    )
+
+
+class ProviderRegistry(LLMProvider):
+    """
+    Routes each chat call to the provider configured for the requested model.
+
+    Every provider instance carries its own API key, base URL and headers and
+    sends them with each request, so sessions, subagents and cron jobs can use
+    different models and endpoints concurrently from one process. Providers are
+    created on first use and cached until reload().
+
+    Requests are limited and retried per configured provider (all models served
+    by e.g. openrouter share one ProviderLimiter), since rate limits belong to
+    the account, not the model.
+    """
+
+    def __init__(self, config: "Config"):
+        super().__init__()
+        self._config = config
+        self._providers: dict[str, LLMProvider] = {}
+        self._limiters: dict[str, ProviderLimiter] = {}
+
+    def get(self, model: str | None = None) -> LLMProvider:
+        """Get the provider for a model (default: the configured default model)."""
+        model = model or self.get_default_model()
+        if model not in self._providers:
+            self._providers[model] = create_provider(self._config, model)
+        return self._providers[model]
+
+    def limiter(self, model: str | None = None) -> ProviderLimiter:
+        """Get the limiter shared by every model of the provider serving this model."""
+        name = self._config.get_provider_name(model or self.get_default_model()) or "default"
+        if name not in self._limiters:
+            p = getattr(self._config.providers, name, None)
+            self._limiters[name] = ProviderLimiter(
+                name,
+                max_concurrency=p.max_concurrency if p else 16,
+                rpm=p.rpm if p else 0,
+                tpm=p.tpm if p else 0,
+                max_retries=p.max_retries if p else 3,
+            )
+        return self._limiters[name]
+
+    def reload(self, config: "Config") -> None:
+        """Switch to new config; providers are rebuilt on their next request."""
+        self._config = config
+        self._providers.clear()
+        self._limiters.clear()
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.get_default_model()
+        provider = self.get(model)
+        limiter = self.limiter(model)
+        return await limiter.run(
+            lambda: provider.chat(messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature),
+            estimate_request_tokens(messages, max_tokens) if limiter.tokens else 0,
+        )
+
+    async def warm(self, model: str | None = None) -> float | None:
+        """Create the model's provider (importing litellm if it needs it) and warm its connections."""
+        return await self.get(model).warm(model)
+
+    def get_default_model(self) -> str:
+        """Get the configured default model."""
+        return self._config.agents.defaults.model
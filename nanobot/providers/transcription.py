@@ -1,12 +1,18 @@
-"""Voice transcription provider using Groq."""
+"""Voice transcription: a Groq provider and a shared, cached service for channels."""
 
+import asyncio
+import hashlib
 import os
 from pathlib import Path
-from typing import Any
+from typing import Awaitable
 
-import httpx
 from loguru import logger
 
+from nanobot.utils.http import get_client
+
+MAX_CONCURRENCY = 4  # Transcriptions in flight at once; the rest wait their turn
+SUPPORTED_FORMATS = ("flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "opus", "wav", "webm")  # Accepted by Whisper
+
 
 class GroqTranscriptionProvider:
     """
@@ -29,37 +35,136 @@ class GroqTranscriptionProvider:
         Returns:
             Transcribed text.
         """
-        if not self.api_key:
-            logger.warning("Groq API key not configured for transcription")
-            return ""
-        
         path = Path(file_path)
         if not path.exists():
             logger.error(f"Audio file not found: {file_path}")
             return ""
+        return await self.transcribe_bytes(path.read_bytes(), path.name)
+    
+    async def transcribe_bytes(self, data: bytes, filename: str) -> str:
+        """
+        Transcribe audio held in memory.
+        
+        Args:
+            data: Audio file contents.
+            filename: Name sent with the upload; its extension tells Groq the format.
+            
+        Returns:
+            Transcribed text, or an empty string on failure.
+        """
+        if not self.api_key:
+            logger.warning("Groq API key not configured for transcription")
+            return ""
         
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-                    
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
-                    
+            files = {
+                "file": (filename, data),
+                "model": (None, "whisper-large-v3"),
+            }
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+            }
+            
+            response = await get_client("transcription").post(
+                self.api_url,
+                headers=headers,
+                files=files,
+                timeout=60.0
+            )
+            
+            response.raise_for_status()
+            return response.json().get("text", "")
+                
         except Exception as e:
             logger.error(f"Groq transcription error: {e}")
             return ""
+
+
+class TranscriptionService:
+    """
+    Transcription shared by all channels.
+    
+    Requests go through one provider (and so one pooled HTTP client), at most
+    max_concurrency at a time. Transcripts are cached on disk by a hash of the
+    audio, so a forwarded voice note is only transcribed once, and concurrent
+    requests for the same audio share a single upload.
+    """
+    
+    def __init__(
+        self,
+        provider: GroqTranscriptionProvider,
+        cache_dir: Path | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+    ):
+        self.provider = provider
+        self.cache_dir = cache_dir
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.provider.api_key)
+    
+    def submit(self, audio: bytes | Awaitable[bytes], filename: str) -> asyncio.Task[str]:
+        """
+        Start transcribing in the background.
+        
+        Args:
+            audio: The audio, or an awaitable that downloads it.
+            filename: File name of the audio, used for its format.
+        
+        Returns:
+            A task resolving to the transcript ("" if transcription failed).
+        """
+        return asyncio.create_task(self._transcribe(audio, filename))
+    
+    async def transcribe(self, data: bytes, filename: str) -> str:
+        """Transcribe audio, answering from the cache when the same audio was seen before."""
+        key = hashlib.sha256(data).hexdigest()
+        if (text := self._lookup(key)) is not None:
+            logger.debug(f"Transcript cache hit for {filename}")
+            return text
+        if pending := self._inflight.get(key):
+            return await asyncio.shield(pending)
+        
+        task = asyncio.create_task(self._upload(key, data, filename))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _transcribe(self, audio: bytes | Awaitable[bytes], filename: str) -> str:
+        try:
+            data = audio if isinstance(audio, bytes) else await audio
+        except Exception as e:
+            logger.error(f"Failed to fetch audio for transcription: {e}")
+            return ""
+        return await self.transcribe(data, filename)
+    
+    async def _upload(self, key: str, data: bytes, filename: str) -> str:
+        async with self._semaphore:
+            text = await self.provider.transcribe_bytes(data, filename)
+        if text:
+            self._store(key, text)
+        return text
+    
+    def _path(self, key: str) -> Path | None:
+        return self.cache_dir / f"{key[:32]}.txt" if self.cache_dir else None
+    
+    def _lookup(self, key: str) -> str | None:
+        path = self._path(key)
+        if not path:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+    
+    def _store(self, key: str, text: str) -> None:
+        path = self._path(key)
+        if not path:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to cache transcript: {e}")
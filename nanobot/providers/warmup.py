@@ -0,0 +1,27 @@
+"""Pre-warming provider connections at gateway start and keeping them alive."""
+
+import asyncio
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+
+
+async def warm_providers(provider: LLMProvider, models: list[str]) -> dict[str, float | None | Exception]:
+    """
+    Warm every model's provider concurrently.
+
+    Returns:
+        model -> round-trip seconds, None if not measured, or the exception raised.
+    """
+    results = await asyncio.gather(*(provider.warm(m) for m in models), return_exceptions=True)
+    return dict(zip(models, results))
+
+
+async def keep_warm(provider: LLMProvider, models: list[str], interval: float) -> None:
+    """Ping the providers every interval seconds so pooled connections are not dropped while idle."""
+    while True:
+        await asyncio.sleep(interval)
+        for model, result in (await warm_providers(provider, models)).items():
+            if isinstance(result, Exception):
+                logger.debug(f"Keep-alive ping for {model} failed: {result}")
@@ -0,0 +1,5 @@
+"""LLM usage accounting."""
+
+from nanobot.usage.store import UsageStore
+
+__all__ = ["UsageStore"]
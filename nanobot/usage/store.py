@@ -0,0 +1,158 @@
+"""Append-only store of LLM call usage with rollups and per-session daily totals."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+# Record field -> short key written to disk
+_FIELDS = {
+    "ts": "t", "session": "s", "workload": "w", "model": "m", "prompt_tokens": "p",
+    "completion_tokens": "c", "cached_tokens": "k", "latency_ms": "l", "iteration": "i",
+}
+_SHORT = {v: k for k, v in _FIELDS.items()}
+
+ROLLUP_KEYS = ("session", "workload", "model", "channel", "day")
+
+
+class UsageStore:
+    """
+    Records every provider call as one compact JSON line.
+
+    Records go to one file per month (usage-YYYY-MM.jsonl) under usage_dir and
+    are never rewritten. Token totals per session for the current day are kept
+    in memory so budgets can be checked before each call. The agent uses the
+    async methods, which do their file I/O in a worker thread.
+    """
+
+    def __init__(self, usage_dir: Path):
+        self.usage_dir = usage_dir
+        self._day: str | None = None
+        self._today: dict[str, int] = {}  # session -> tokens used today
+        self._lock = threading.Lock()  # record() and the daily totals are used from worker threads
+
+    def _path(self, month: str) -> Path:
+        return self.usage_dir / f"usage-{month}.jsonl"
+
+    def record(
+        self,
+        session: str,
+        workload: str,
+        model: str,
+        usage: dict[str, int],
+        latency_ms: float,
+        iteration: int,
+    ) -> None:
+        """Append one provider call."""
+        now = time.time()
+        entry = {
+            "ts": int(now),
+            "session": session,
+            "workload": workload,
+            "model": model,
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "cached_tokens": usage.get("cached_tokens", 0),
+            "latency_ms": int(latency_ms),
+            "iteration": iteration,
+        }
+        with self._lock:
+            self._load_today()  # Before writing, or the first load of the day would count this record twice
+            try:
+                self.usage_dir.mkdir(parents=True, exist_ok=True)
+                line = json.dumps({_FIELDS[k]: v for k, v in entry.items() if v or k == "ts"}, ensure_ascii=False)
+                with open(self._path(time.strftime("%Y-%m", time.localtime(now))), "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logger.warning(f"Failed to record LLM usage: {e}")
+
+            self._today[session] = self._today.get(session, 0) + entry["prompt_tokens"] + entry["completion_tokens"]
+
+    async def record_async(
+        self,
+        session: str,
+        workload: str,
+        model: str,
+        usage: dict[str, int],
+        latency_ms: float,
+        iteration: int,
+    ) -> None:
+        """record() without blocking the event loop."""
+        await asyncio.to_thread(self.record, session, workload, model, usage, latency_ms, iteration)
+
+    def session_tokens_today(self, session: str) -> int:
+        """Prompt + completion tokens the session has used since local midnight."""
+        with self._lock:
+            self._load_today()
+            return self._today.get(session, 0)
+
+    async def over_budget(self, session: str, budget: int) -> bool:
+        """Whether the session has used up a daily token budget (0 = unlimited)."""
+        if budget <= 0:
+            return False
+        # The first check of a day reads the month's records, so keep it off the event loop
+        used = await asyncio.to_thread(self.session_tokens_today, session)
+        if used < budget:
+            return False
+        logger.warning(f"Session {session} is over its daily token budget ({used}/{budget})")
+        return True
+
+    def _load_today(self) -> None:
+        day = time.strftime("%Y-%m-%d")
+        if day == self._day:
+            return
+        self._day = day
+        self._today = {}
+        midnight = datetime.strptime(day, "%Y-%m-%d").timestamp()
+        for r in self.read(since=midnight):
+            self._today[r["session"]] = self._today.get(r["session"], 0) + r["prompt_tokens"] + r["completion_tokens"]
+
+    def read(self, since: float = 0) -> Iterator[dict[str, Any]]:
+        """Yield records at or after the given Unix time, oldest first."""
+        first_month = time.strftime("%Y-%m", time.localtime(since))
+        for path in sorted(self.usage_dir.glob("usage-*.jsonl")):
+            if path.stem.removeprefix("usage-") < first_month:
+                continue
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    continue  # A torn last line from a crash
+                record = {name: raw.get(short, 0) for short, name in _SHORT.items()}
+                if record["ts"] >= since:
+                    yield record
+
+    def rollup(self, since: float = 0, by: str = "session") -> list[dict[str, Any]]:
+        """
+        Aggregate records by one of ROLLUP_KEYS, largest token users first.
+
+        Each row has key, calls, prompt_tokens, completion_tokens,
+        cached_tokens and avg_latency_ms.
+        """
+        rows: dict[str, dict[str, Any]] = {}
+        for r in self.read(since):
+            if by == "day":
+                key = time.strftime("%Y-%m-%d", time.localtime(r["ts"]))
+            elif by == "channel":
+                key = str(r["session"]).split(":", 1)[0]
+            else:
+                key = str(r[by])
+            row = rows.setdefault(key, {
+                "key": key, "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cached_tokens": 0, "latency_ms": 0,
+            })
+            row["calls"] += 1
+            for field in ("prompt_tokens", "completion_tokens", "cached_tokens", "latency_ms"):
+                row[field] += r[field]
+        for row in rows.values():
+            row["avg_latency_ms"] = row.pop("latency_ms") // row["calls"]
+        return sorted(rows.values(), key=lambda row: -(row["prompt_tokens"] + row["completion_tokens"]))
@@ -0,0 +1,218 @@
+"""HTML to text/markdown extraction for web_fetch.
+
+Kept free of heavy imports so it can be loaded cheaply in worker processes.
+"""
+
+import html
+import re
+
+
+def strip_tags(text: str) -> str:
+    """Remove HTML tags and decode entities."""
+    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
+    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).strip()
+
+
+def normalize_whitespace(text: str) -> str:
+    """Normalize whitespace."""
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+# Elements that never carry article content
+_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "nav", "aside", "footer", "form",
+    "iframe", "svg", "canvas", "button", "input", "select", "textarea", "img", "head",
+})
+_BOILERPLATE = re.compile(
+    r"(?:^|[\s_-])(?:ads?|advert\w*|banner|breadcrumbs?|cookie\w*|headerlink|newsletter|"
+    r"promo|share|social|sponsor\w*)(?:[\s_-]|$)",
+    re.I,
+)
+_BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "body", "caption", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "html", "li", "main", "ol", "p", "pre", "section", "summary", "table", "ul",
+})
+_HEADINGS = {f"h{i}": i for i in range(1, 7)}
+_EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+_LANGUAGE = re.compile(r"(?:language|lang|highlight)-([\w+#-]+)")
+_SPACES = re.compile(r"\s+")
+_BREAK = "\x00"  # Stands in for <br> so whitespace collapsing keeps it
+
+
+def _is_boilerplate(el) -> bool:
+    if el.tag in _SKIP_TAGS:
+        return True
+    attrib = el.attrib
+    if not attrib:
+        return False
+    if attrib.get("role") in ("navigation", "banner", "complementary"):
+        return True
+    return bool(_BOILERPLATE.search(f"{attrib.get('class', '')} {attrib.get('id', '')}"))
+
+
+def _code_span(text: str) -> str:
+    fence = "``" if "`" in text else "`"
+    return f"{fence}{text}{fence}" if text.strip() else ""
+
+
+class _MarkdownWriter:
+    """One recursive pass over an lxml tree, emitting a list of markdown blocks."""
+
+    def blocks(self, el) -> list[str]:
+        """Render the children of a block container."""
+        out: list[str] = []
+        run: list[str] = []  # Pending inline content for the current paragraph
+        if el.text:
+            run.append(el.text)
+        for child in el:
+            if isinstance(child.tag, str) and not _is_boilerplate(child):
+                if child.tag in _BLOCK_TAGS:
+                    if run and (text := self._paragraph(run)):
+                        out.append(text)
+                    run = []
+                    out.extend(self.block(child))
+                else:
+                    run.append(self.inline(child))
+            if child.tail:
+                run.append(child.tail)
+        if run and (text := self._paragraph(run)):
+            out.append(text)
+        return out
+
+    def block(self, el) -> list[str]:
+        tag = el.tag
+        if tag in _HEADINGS:
+            text = self.inline(el).replace(_BREAK, " ").strip()
+            return [f"{'#' * _HEADINGS[tag]} {text}"] if text else []
+        if tag in ("ul", "ol"):
+            return self._list(el, ordered=tag == "ol")
+        if tag == "pre":
+            return [self._pre(el)]
+        if tag == "table":
+            return self._table(el)
+        if tag == "blockquote":
+            return ["\n".join(f"> {line}".rstrip() for line in "\n\n".join(self.blocks(el)).split("\n"))]
+        if tag == "hr":
+            return ["---"]
+        return self.blocks(el)
+
+    def inline(self, el) -> str:
+        """Render an element and its descendants as inline markdown."""
+        tag = el.tag
+        if tag == "br":
+            return _BREAK
+        if tag == "code" or tag == "kbd" or tag == "samp":
+            return _code_span(_SPACES.sub(" ", "".join(el.itertext())))
+
+        parts = [el.text] if el.text else []
+        for child in el:
+            if isinstance(child.tag, str) and not _is_boilerplate(child):
+                parts.append(self.inline(child))
+            if child.tail:
+                parts.append(child.tail)
+        text = _SPACES.sub(" ", "".join(parts))
+
+        if tag == "a":
+            href = (el.get("href") or "").strip()
+            label = text.strip()
+            if not label or not href or href.startswith(("#", "javascript:")):
+                return text
+            return f"[{label}]({href})"
+        if tag in _EMPHASIS and text.strip():
+            mark = _EMPHASIS[tag]
+            return f"{mark}{text.strip()}{mark}"
+        if tag in _BLOCK_TAGS:
+            return f" {text} "
+        return text
+
+    def _paragraph(self, run: list[str]) -> str:
+        text = _SPACES.sub(" ", "".join(run))
+        if _BREAK not in text:
+            return text.strip()
+        return "\n".join(line.strip() for line in text.split(_BREAK) if line.strip())
+
+    def _list(self, el, ordered: bool) -> list[str]:
+        items = []
+        n = 0
+        for li in el:
+            if not isinstance(li.tag, str) or _is_boilerplate(li):
+                continue
+            if li.tag in ("ul", "ol"):  # Stray nested list directly under a list
+                items.extend("  " + line for line in "\n".join(self._list(li, li.tag == "ol")).split("\n"))
+                continue
+            n += 1
+            marker = f"{n}. " if ordered else "- "
+            body = "\n".join(self.blocks(li)) if li.tag == "li" else self._paragraph([self.inline(li)])
+            if not body:
+                continue
+            lines = body.split("\n")
+            indent = " " * len(marker)
+            items.append(marker + lines[0])
+            items.extend(indent + line if line else line for line in lines[1:])
+        return ["\n".join(items)] if items else []
+
+    def _pre(self, el) -> str:
+        # Highlighters put the language on the <code> child or on a wrapper a level or two up
+        candidates = [el.find(".//code"), el, el.getparent()]
+        if candidates[-1] is not None:
+            candidates.append(candidates[-1].getparent())
+        m = _LANGUAGE.search(" ".join(c.get("class", "") for c in candidates if c is not None))
+        text = "".join(el.itertext()).strip("\n")
+        fence = "````" if "```" in text else "```"
+        return f"{fence}{m[1] if m else ''}\n{text}\n{fence}"
+
+    def _table(self, el) -> list[str]:
+        out = []
+        caption = el.find("caption")
+        if caption is not None and (text := self.inline(caption).replace(_BREAK, " ").strip()):
+            out.append(f"**{text}**")
+        rows = []
+        for tr in el.iter("tr"):
+            cells = [
+                self.inline(cell).replace(_BREAK, " ").strip().replace("|", "\\|")
+                for cell in tr if cell.tag in ("td", "th")
+            ]
+            if any(cells):
+                rows.append(cells)
+        if not rows:
+            return out
+        width = max(len(r) for r in rows)
+        rows = [r + [""] * (width - len(r)) for r in rows]
+        out.append("\n".join(
+            ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+            + ["| " + " | ".join(r) + " |" for r in rows[1:]]
+        ))
+        return out
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert HTML to markdown in a single walk over the parsed tree."""
+    from lxml import etree
+
+    # Plain etree elements: lxml.html's per-element class lookup costs more than the walk
+    root = etree.fromstring(html, etree.HTMLParser()) if html.strip() else None
+    if root is None:
+        return ""
+    return "\n\n".join(_MarkdownWriter().block(root))
+
+
+def extract_html(body: str, extract_mode: str = "markdown") -> str:
+    """Extract the main content of an HTML page with readability."""
+    from readability import Document
+
+    doc = Document(body)
+    title = doc.title()  # Before summary(), which mutates the parsed document
+    summary = doc.summary(html_partial=True)
+    content = html_to_markdown(summary) if extract_mode == "markdown" else strip_tags(summary)
+    if not title or content.startswith(f"# {title}\n"):
+        return content
+    return f"# {title}\n\n{content}"
+
+
+def fallback_extract(body: str) -> str:
+    """Cheap extraction used when readability fails or times out."""
+    return normalize_whitespace(strip_tags(body))
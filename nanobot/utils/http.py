@@ -0,0 +1,90 @@
+"""Process-wide pooled HTTP clients.
+
+Tools, channels and providers ask for a client by purpose ("web",
+"transcription", "discord", ...) instead of opening a new httpx.AsyncClient
+per call, so TCP and TLS connections are kept alive and reused. Clients are
+owned by this module: callers must not close them; the gateway closes all of
+them on shutdown with close_clients().
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from loguru import logger
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import HttpConfig
+
+_config: "HttpConfig | None" = None
+# (purpose, options) -> (event loop the client was created on, client)
+_clients: dict[tuple[str, str], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def configure(config: "HttpConfig") -> None:
+    """Set pool limits and timeouts for clients created from now on."""
+    global _config
+    _config = config
+
+
+def get_config() -> "HttpConfig":
+    """The configured pool settings (defaults until configure() is called)."""
+    from nanobot.config.schema import HttpConfig
+
+    return _config or HttpConfig()
+
+
+def get_client(purpose: str, **options: Any) -> httpx.AsyncClient:
+    """
+    Get the shared client for a purpose, creating it on first use.
+
+    Args:
+        purpose: Pool name; each purpose gets its own connection pool.
+        **options: Extra httpx.AsyncClient arguments (e.g. timeout,
+            max_redirects). Callers passing different options get
+            separate clients, so one caller's settings never leak into another's.
+    """
+    loop = asyncio.get_running_loop()
+    # Clients of loops that have since closed can't be used or closed any more
+    for key, (owner, _) in list(_clients.items()):
+        if owner.is_closed():
+            del _clients[key]
+
+    key = (purpose, repr(sorted(options.items())))
+    entry = _clients.get(key)
+    # Connections are bound to the loop that opened them, so a new loop gets a new client
+    if entry and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+
+    client = httpx.AsyncClient(**{**_client_options(), **options})
+    _clients[key] = (loop, client)
+    return client
+
+
+async def close_clients() -> None:
+    """Close every pooled client owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key, (owner, client) in list(_clients.items()):
+        if owner is loop:
+            del _clients[key]
+            await client.aclose()
+
+
+def _client_options() -> dict[str, Any]:
+    config = get_config()
+    http2 = config.http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(config.timeout, connect=config.connect_timeout),
+    }
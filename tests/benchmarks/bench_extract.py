@@ -0,0 +1,70 @@
+"""Benchmark web_fetch HTML extraction over the saved page corpus.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_extract.py [--repeat N] [--mode markdown|text]
+
+Reports per-page readability extraction time, plus the cost of the same work
+when dispatched to the web_fetch extraction process pool.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.html_extract import extract_html, fallback_extract
+
+CORPUS = Path(__file__).parent / "html"
+
+
+def load_corpus() -> dict[str, str]:
+    return {p.stem: p.read_text(encoding="utf-8") for p in sorted(CORPUS.glob("*.html"))}
+
+
+def time_call(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def time_pooled(tool: WebFetchTool, body: str, mode: str, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await tool._extract_html(body, mode)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, size: int, label: str, samples: list[float]) -> None:
+    print(f"{name:<16} {size:>8} {label:<10} "
+          f"median {statistics.median(samples):8.2f} ms   min {min(samples):8.2f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page (default 20)")
+    parser.add_argument("--mode", choices=["markdown", "text"], default="markdown")
+    args = parser.parse_args()
+
+    # Force every page through the pool regardless of size
+    web.INLINE_EXTRACT_CHARS = 0
+    tool = WebFetchTool(cache=None, extract_workers=2)
+
+    print(f"{'page':<16} {'bytes':>8} {'extractor':<10}")
+    for name, body in load_corpus().items():
+        report(name, len(body), "inline", time_call(lambda: extract_html(body, args.mode), args.repeat))
+        report(name, len(body), "fallback", time_call(lambda: fallback_extract(body), args.repeat))
+        await tool._extract_html(body, args.mode)  # Warm up the worker
+        report(name, len(body), "pooled", await time_pooled(tool, body, args.mode, args.repeat))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
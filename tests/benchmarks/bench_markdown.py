@@ -0,0 +1,73 @@
+"""Compare the tree-walk HTML-to-markdown converter with the previous regex converter.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_markdown.py [--repeat N]
+
+For every page in the corpus the readability summary is converted by both
+implementations. The script reports conversion time and output size, and exits
+non-zero if the new output drops a link target or heading the old one kept.
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from readability import Document
+
+from nanobot.utils.html_extract import html_to_markdown, normalize_whitespace, strip_tags
+
+CORPUS = Path(__file__).parent / "html"
+
+
+def legacy_html_to_markdown(html: str) -> str:
+    """The regex converter web_fetch used before the tree walk."""
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{strip_tags(m[2])}]({m[1]})', html, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    return normalize_whitespace(strip_tags(text))
+
+
+def landmarks(md: str) -> set[str]:
+    """Link targets and heading texts that a converter must not lose."""
+    links = {m[1] for m in re.finditer(r"\]\(([^)\s]+)\)", md) if not m[1].startswith("#")}
+    headings = {m[1].strip() for m in re.finditer(r"^#{1,6} (.+)$", md, re.M)}
+    return links | {h.rstrip("¶").strip() for h in headings}
+
+
+def median_ms(fn, arg: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per page (default 50)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'page':<16} {'legacy ms':>10} {'tree ms':>10} {'legacy chars':>13} {'tree chars':>11}")
+    for path in sorted(CORPUS.glob("*.html")):
+        summary = Document(path.read_text(encoding="utf-8")).summary(html_partial=True)
+        old, new = legacy_html_to_markdown(summary), html_to_markdown(summary)
+        print(f"{path.stem:<16} {median_ms(legacy_html_to_markdown, summary, args.repeat):>10.3f} "
+              f"{median_ms(html_to_markdown, summary, args.repeat):>10.3f} {len(old):>13} {len(new):>11}")
+        if missing := landmarks(old) - landmarks(new):
+            failed = True
+            print(f"  REGRESSION: missing {sorted(missing)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Compare the native OpenAI-compatible provider with the litellm provider.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_providers.py [--requests N]
+
+Starts a local mock /chat/completions server, then reports for each provider
+the cold import + construction time (in a fresh interpreter) and the
+per-request latency of sequential chat() calls against the mock server.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.openai_compat import OpenAICompatProvider
+from nanobot.utils.http import close_clients
+
+RESPONSE = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench-model",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "pong"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+}).encode()
+
+STARTUP = {
+    "native": "from nanobot.providers.openai_compat import OpenAICompatProvider; "
+              "OpenAICompatProvider('vllm', api_key='k', api_base='{base}', default_model='bench-model')",
+    "litellm": "from nanobot.providers.litellm_provider import LiteLLMProvider; "
+               "LiteLLMProvider(api_key='k', api_base='{base}', default_model='bench-model')",
+}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse shows up
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def startup_ms(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+async def latencies(provider, n: int) -> list[float]:
+    messages = [{"role": "user", "content": "ping"}]
+    await provider.chat(messages)  # Warm up: connection, lazy imports
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await provider.chat(messages)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.content == "pong", response.content
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Sequential requests per provider (default 200)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/v1"
+
+    providers = {
+        "native": OpenAICompatProvider("vllm", api_key="k", api_base=base, default_model="bench-model"),
+        "litellm": LiteLLMProvider(api_key="k", api_base=base, default_model="bench-model"),
+    }
+    print(f"{'provider':<10} {'startup ms':>11} {'median ms':>10} {'p95 ms':>8}")
+    for name, provider in providers.items():
+        startup = startup_ms(STARTUP[name].format(base=base))
+        samples = sorted(await latencies(provider, args.requests))
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:<10} {startup:>11.0f} {statistics.median(samples):>10.2f} {p95:>8.2f}")
+
+    await close_clients()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
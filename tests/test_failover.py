@@ -0,0 +1,101 @@
+import asyncio
+from collections import deque
+
+import pytest
+
+from nanobot.providers import failover
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+from nanobot.providers.failover import FailoverProvider
+
+
+class FakeProvider(LLMProvider):
+    """Answers per model after a delay, or raises if the model is marked broken."""
+
+    def __init__(self, delays: dict[str, float], broken: set[str] = frozenset()):
+        super().__init__()
+        self.delays = delays
+        self.broken = broken
+        self.calls: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls.append(model)
+        try:
+            await asyncio.sleep(self.delays.get(model, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        if model in self.broken:
+            raise LLMError("down", kind="server", status=500, provider=model)
+        return LLMResponse(content=model)
+
+    def get_default_model(self):
+        return "primary"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_fails_over_in_order_and_raises_primary_error() -> None:
+    inner = FakeProvider({}, broken={"primary", "second"})
+    provider = FailoverProvider(inner, ["second", "third"])
+    assert (await provider.chat(MESSAGES)).content == "third"
+    assert inner.calls == ["primary", "second", "third"]
+
+    inner.broken = {"primary", "second", "third"}
+    with pytest.raises(LLMError) as exc:
+        await provider.chat(MESSAGES)
+    assert exc.value.provider == "primary"
+
+
+async def test_hedges_slow_primary_and_cancels_loser(monkeypatch) -> None:
+    monkeypatch.setattr(failover, "HEDGE_DEFAULT_DELAY", 0.02)
+    inner = FakeProvider({"primary": 1.0, "second": 0.01})
+    provider = FailoverProvider(inner, ["second"], hedge=True)
+
+    assert (await provider.chat(MESSAGES)).content == "second"
+    await asyncio.sleep(0)
+    assert inner.cancelled == ["primary"]
+
+
+async def test_hedged_pair_failures_are_recorded_once(monkeypatch) -> None:
+    monkeypatch.setattr(failover, "HEDGE_DEFAULT_DELAY", 0.02)
+    inner = FakeProvider({}, broken={"primary", "second", "third"})
+    provider = FailoverProvider(inner, ["second", "third"], hedge=True)
+    warnings: list[str] = []
+    monkeypatch.setattr(failover.logger, "warning", warnings.append)
+
+    with pytest.raises(LLMError) as exc:
+        await provider.chat(MESSAGES)
+    assert exc.value.provider == "primary"
+    assert inner.calls == ["primary", "second", "third"]
+    assert [w.split(": down; ")[1] for w in warnings] == ["failing over to second", "failing over to third"]
+
+
+async def test_non_llm_errors_are_not_failed_over(monkeypatch) -> None:
+    class Buggy(FakeProvider):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            self.calls.append(model)
+            raise ValueError("bug")
+
+    inner = Buggy({})
+    provider = FailoverProvider(inner, ["second"], hedge=True)
+    with pytest.raises(ValueError):
+        await provider.chat(MESSAGES)
+    assert inner.calls == ["primary"]
+
+
+async def test_fast_primary_is_not_hedged(monkeypatch) -> None:
+    monkeypatch.setattr(failover, "HEDGE_DEFAULT_DELAY", 0.5)
+    inner = FakeProvider({"primary": 0.0, "second": 0.0})
+    provider = FailoverProvider(inner, ["second"], hedge=True)
+    assert (await provider.chat(MESSAGES)).content == "primary"
+    assert inner.calls == ["primary"]
+
+
+async def test_hedge_delay_tracks_p95() -> None:
+    provider = FailoverProvider(FakeProvider({}), [], hedge=True)
+    assert provider.hedge_delay("primary") == failover.HEDGE_DEFAULT_DELAY
+    for i in range(1, 101):
+        provider._latencies.setdefault("primary", deque(maxlen=100)).append(i / 100)
+    assert provider.hedge_delay("primary") == pytest.approx(0.95)
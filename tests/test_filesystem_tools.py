@@ -0,0 +1,113 @@
+from pathlib import Path
+
+from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool
+
+
+async def test_edit_file_applies_multiple_edits(tmp_path: Path) -> None:
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\ny = 2\nz = 3\n")
+    result = await EditFileTool().execute(
+        path=str(f),
+        edits=[{"old_text": "x = 1", "new_text": "x = 10"}, {"old_text": "z = 3", "new_text": "z = 30"}],
+    )
+    assert "2 edits applied" in result
+    assert f.read_text() == "x = 10\ny = 2\nz = 30\n"
+
+
+async def test_edit_file_edits_are_atomic(tmp_path: Path) -> None:
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\ny = 2\n")
+    result = await EditFileTool().execute(
+        path=str(f),
+        edits=[{"old_text": "x = 1", "new_text": "x = 10"}, {"old_text": "missing", "new_text": ""}],
+    )
+    assert "edits[1].old_text not found" in result
+    assert f.read_text() == "x = 1\ny = 2\n"
+    assert list(tmp_path.iterdir()) == [f]
+
+
+async def test_edit_file_requires_single_mode(tmp_path: Path) -> None:
+    f = tmp_path / "a.txt"
+    f.write_text("hello")
+    result = await EditFileTool().execute(
+        path=str(f), old_text="hello", new_text="bye", patch="@@ -1 +1 @@\n-hello\n+bye"
+    )
+    assert result.startswith("Error")
+    assert f.read_text() == "hello"
+
+
+async def test_edit_file_applies_patch_with_shifted_lines(tmp_path: Path) -> None:
+    f = tmp_path / "a.py"
+    f.write_text("# header\n# more\ndef f():\n    return 1\n\ndef g():\n    return 2\n")
+    patch = (
+        "--- a/a.py\n"
+        "+++ b/a.py\n"
+        "@@ -1,2 +1,2 @@\n"
+        " def f():\n"
+        "-    return 1\n"
+        "+    return 11\n"
+        "@@ -4,2 +4,3 @@\n"
+        " def g():  \n"
+        "-    return 2\n"
+        "+    x = 2\n"
+        "+    return x\n"
+    )
+    result = await EditFileTool().execute(path=str(f), patch=patch)
+    assert result == f"Successfully edited {f}"
+    assert f.read_text() == (
+        "# header\n# more\ndef f():\n    return 11\n\ndef g():\n    x = 2\n    return x\n"
+    )
+
+
+async def test_edit_file_applies_insertion_only_hunk(tmp_path: Path) -> None:
+    f = tmp_path / "a.txt"
+    f.write_text("a\nb\nc\n")
+    await EditFileTool().execute(path=str(f), patch="@@ -2,0 +3,1 @@\n+X\n")
+    assert f.read_text() == "a\nb\nX\nc\n"
+
+    await EditFileTool().execute(path=str(f), patch="@@ -0,0 +1,1 @@\n+top\n")
+    assert f.read_text() == "top\na\nb\nX\nc\n"
+
+
+async def test_edit_file_rejects_unmatched_hunk(tmp_path: Path) -> None:
+    f = tmp_path / "a.txt"
+    f.write_text("one\ntwo\n")
+    result = await EditFileTool().execute(path=str(f), patch="@@ -1,1 +1,1 @@\n-three\n+four\n")
+    assert "hunk 1" in result
+    assert f.read_text() == "one\ntwo\n"
+
+
+def _make_tree(root: Path) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "build").mkdir()
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    (root / "README.md").write_text("hi")
+    (root / "debug.log").write_text("noise")
+    (root / "build" / "out.bin").write_text("x")
+    (root / "src" / "main.py").write_text("print(1)\n")
+    (root / "src" / "pkg" / "mod.py").write_text("x" * 2048)
+
+
+async def test_list_dir_recurses_and_honors_gitignore(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    result = await ListDirTool().execute(path=str(tmp_path), depth=3)
+    assert result.splitlines() == [
+        "📄 .gitignore (13 B)",
+        "📄 README.md (2 B)",
+        "📁 src/",
+        "  📄 main.py (9 B)",
+        "  📁 pkg/",
+        "    📄 mod.py (2.0 KB)",
+    ]
+
+
+async def test_list_dir_pattern_and_cursor(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    tool = ListDirTool()
+    first = await tool.execute(path=str(tmp_path), depth=5, pattern="*.py", limit=1)
+    assert first.splitlines() == [
+        "📄 src/main.py (9 B)",
+        "... more entries not shown; call again with cursor=1",
+    ]
+    second = await tool.execute(path=str(tmp_path), depth=5, pattern="*.py", limit=1, cursor=1)
+    assert second == "📄 src/pkg/mod.py (2.0 KB)"
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from nanobot.utils.html_extract import extract_html, html_to_markdown
+
+CORPUS = Path(__file__).parent / "benchmarks" / "html"
+
+
+def test_markdown_structure() -> None:
+    md = html_to_markdown(
+        "<div><h2>Title <a class='headerlink' href='#t'>¶</a></h2>"
+        "<p>See <a href='https://x.test/a'>the <b>docs</b></a> and <code>f(x)</code>.</p>"
+        "<ul><li>one<ul><li>nested</li></ul></li><li>two</li></ul>"
+        "<ol><li>first</li><li>second</li></ol>"
+        "<pre><code class='language-py'>if x:\n    y()</code></pre>"
+        "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>a|b</td></tr></table>"
+        "<nav><a href='/home'>Home</a></nav><div class='share-buttons'>Share</div>"
+        "<script>track()</script></div>"
+    )
+    assert md == (
+        "## Title\n\n"
+        "See [the **docs**](https://x.test/a) and `f(x)`.\n\n"
+        "- one\n  - nested\n- two\n\n"
+        "1. first\n2. second\n\n"
+        "```py\nif x:\n    y()\n```\n\n"
+        "| A | B |\n| --- | --- |\n| 1 | a\\|b |"
+    )
+
+
+def test_markdown_handles_empty_and_fragment_input() -> None:
+    assert html_to_markdown("") == ""
+    assert html_to_markdown("just text") == "just text"
+
+
+@pytest.mark.parametrize("page", sorted(p.stem for p in CORPUS.glob("*.html")))
+def test_corpus_pages_drop_boilerplate(page: str) -> None:
+    md = extract_html((CORPUS / f"{page}.html").read_text(encoding="utf-8"))
+    assert md.startswith("# ")
+    for noise in ("<", "Subscribe", "Share on", "Hot Network Questions", "Privacy"):
+        assert noise not in md
+
+
+def test_corpus_keeps_tables_and_code() -> None:
+    table = extract_html((CORPUS / "data_table.html").read_text(encoding="utf-8"))
+    assert "| 7 | [Baikal](/wiki/Lake_Baikal) | Russia | 31,500 | 1,637 | 23,615 |" in table
+    docs = extract_html((CORPUS / "docs_page.html").read_text(encoding="utf-8"))
+    assert "```python3\nimport asyncio\n\nasync def tcp_echo_client(message):" in docs
@@ -0,0 +1,49 @@
+import httpx
+
+from nanobot.config.schema import HttpConfig
+from nanobot.utils import http
+
+
+async def test_clients_are_pooled_per_purpose_and_closed_together(monkeypatch) -> None:
+    monkeypatch.setattr(http, "_clients", {})
+    monkeypatch.setattr(http, "_config", None)
+    http.configure(HttpConfig(max_connections=3, connect_timeout=2.0))
+
+    web = http.get_client("web", follow_redirects=True)
+    assert http.get_client("web", follow_redirects=True) is web
+    assert http.get_client("discord") is not web
+    assert web.follow_redirects and web.timeout.connect == 2.0
+    # Options are part of the pool key, so call order can't change a client's behaviour
+    assert not http.get_client("web").follow_redirects
+
+    await http.close_clients()
+    assert web.is_closed
+    assert http.get_client("web", follow_redirects=True) is not web
+
+
+def test_clients_of_closed_loops_are_dropped(monkeypatch) -> None:
+    import asyncio
+
+    async def create() -> None:
+        http.get_client("web")
+
+    monkeypatch.setattr(http, "_clients", {})
+    asyncio.run(create())
+    asyncio.run(create())
+    assert len(http._clients) == 1
+
+
+def test_http2_falls_back_without_h2(monkeypatch) -> None:
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_h2(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(http, "_config", HttpConfig(http2=True))
+    monkeypatch.setattr(builtins, "__import__", no_h2)
+    assert http._client_options()["http2"] is False
+    assert isinstance(http._client_options()["limits"], httpx.Limits)
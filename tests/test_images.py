@@ -0,0 +1,89 @@
+import base64
+import io
+
+import pytest
+
+from nanobot.agent import images
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.images import ImagePipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _photo(path, size=(4000, 3000), exif=True) -> None:
+    img = Image.new("RGB", size, (200, 120, 40))
+    info = img.getexif()
+    if exif:
+        info[0x010F] = "PhoneMaker"  # Make
+        info[0x0112] = 6  # Orientation: rotate 90° clockwise for display
+    img.save(path, "JPEG", quality=95, exif=info)
+
+
+def _decode(url: str) -> "Image.Image":
+    header, b64 = url.split(",", 1)
+    assert header == "data:image/jpeg;base64"
+    return Image.open(io.BytesIO(base64.b64decode(b64)))
+
+
+async def test_images_are_downscaled_rotated_and_stripped(tmp_path) -> None:
+    photo = tmp_path / "photo.jpg"
+    _photo(photo)
+    pipeline = ImagePipeline(tmp_path / "cache", max_edge=1000)
+
+    [digest] = await pipeline.prepare([str(photo), str(tmp_path / "notes.txt")])
+
+    img = _decode(pipeline.data_url(digest))
+    assert img.size == (750, 1000)  # Orientation applied before the resize
+    assert not img.getexif()
+
+
+async def test_payloads_are_cached_by_content(tmp_path, monkeypatch) -> None:
+    photo, copy = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    _photo(photo, size=(800, 600))
+    copy.write_bytes(photo.read_bytes())
+    pipeline = ImagePipeline(tmp_path / "cache")
+    first = await pipeline.prepare([str(photo)])
+
+    calls = []
+    monkeypatch.setattr(ImagePipeline, "_shrink", lambda self, raw, mime: calls.append(1))
+    assert await pipeline.prepare([str(copy)]) == first
+    assert await ImagePipeline(tmp_path / "cache").prepare([str(photo)]) == first
+    assert calls == []
+
+
+async def test_user_content_uses_prepared_payload(tmp_path) -> None:
+    photo = tmp_path / "photo.jpg"
+    _photo(photo, size=(3000, 1500), exif=False)
+    context = ContextBuilder(tmp_path, ImagePipeline(max_edge=1500))
+
+    [digest] = await context.prepare_media([str(photo)])
+    content = context.build_messages([], "what is this?", media=[str(photo)])[-1]["content"]
+
+    assert content[0]["image_url"]["url"] == context.images.data_url(digest)
+    assert _decode(content[0]["image_url"]["url"]).size == (1500, 750)
+    assert content[1] == {"type": "text", "text": "what is this?"}
+
+
+def test_small_image_is_kept_when_reencoding_does_not_help(tmp_path) -> None:
+    icon = tmp_path / "icon.png"
+    Image.new("RGB", (16, 16), (0, 0, 0)).save(icon, "PNG")
+    pipeline = ImagePipeline(max_edge=1000, quality=100)
+
+    _, url = pipeline.encode(str(icon))
+
+    assert url == f"data:image/png;base64,{base64.b64encode(icon.read_bytes()).decode()}"
+    pipeline.close()
+
+
+def test_file_hashes_are_bounded(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(images, "_DIGEST_ENTRIES", 2)
+    pipeline = ImagePipeline()
+    for i in range(4):
+        photo = tmp_path / f"{i}.jpg"
+        _photo(photo, size=(32, 32), exif=False)
+        pipeline.encode(str(photo))
+
+    assert [key[0] for key in pipeline._digests] == [str(tmp_path / "2.jpg"), str(tmp_path / "3.jpg")]
+    pipeline.close()
+    with pytest.raises(RuntimeError):
+        pipeline._executor.submit(print)
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.routing import ModelRouter, is_simple_turn
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import ModelRoutingConfig
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class RecordingProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.models: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        return LLMResponse(content="ok")
+
+    def get_default_model(self):
+        return "big"
+
+
+def test_simple_turn_classifier() -> None:
+    assert is_simple_turn("thanks, that's great!")
+    assert not is_simple_turn("what's the latest news on the election?")
+    assert not is_simple_turn("hi", media=["/tmp/photo.jpg"])
+    assert not is_simple_turn("x" * 500)
+    assert not is_simple_turn("```py\nprint(1)\n```")
+
+
+def test_router_falls_back_to_default_model() -> None:
+    router = ModelRouter("big", ModelRoutingConfig(heartbeat="small", fast="tiny"))
+    assert router.model_for("heartbeat") == "small"
+    assert router.model_for("cron") == "big"
+    assert router.model_for("main") == "big"
+    assert router.model_for("main", simple=True) == "tiny"
+    assert router.model_for("heartbeat", simple=True) == "small"
+    assert ModelRouter("big").model_for("main", simple=True) == "big"
+
+
+async def test_agent_loop_routes_by_workload(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))  # Sessions are saved under ~/.nanobot
+    provider = RecordingProvider()
+    routing = ModelRoutingConfig(heartbeat="small", subagent="worker", fast="tiny")
+    agent = AgentLoop(MessageBus(), provider, tmp_path, model_routing=routing)
+
+    await agent.process_direct("HEARTBEAT check", session_key="heartbeat", workload="heartbeat")
+    await agent.process_direct("thanks!")
+    await agent.process_direct("search the web for the weather in Paris")
+
+    assert provider.models == ["small", "tiny", "big"]
+    assert agent.subagents.model == "worker"
+    agent.stop()
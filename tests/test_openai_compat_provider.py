@@ -0,0 +1,80 @@
+import json
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from nanobot.config.schema import Config
+from nanobot.providers import openai_compat
+from nanobot.providers.base import LLMError
+from nanobot.providers.openai_compat import OpenAICompatProvider
+
+
+def _mock_client(monkeypatch, handler) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    monkeypatch.setattr(openai_compat, "get_client", lambda purpose: client)
+    return requests
+
+
+async def test_chat_posts_openai_request_and_parses_tool_calls(monkeypatch) -> None:
+    requests = _mock_client(monkeypatch, lambda r: httpx.Response(200, json={
+        "choices": [{
+            "message": {"content": None, "tool_calls": [{
+                "id": "call_1", "type": "function",
+                "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'},
+            }]},
+            "finish_reason": "tool_calls",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }))
+    provider = OpenAICompatProvider("deepseek", api_key="sk-test", default_model="deepseek/deepseek-chat")
+    tools = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+
+    response = await provider.chat([{"role": "user", "content": "hi"}], tools=tools)
+
+    request = requests[0]
+    assert str(request.url) == "https://api.deepseek.com/chat/completions"
+    assert request.headers["authorization"] == "Bearer sk-test"
+    body = json.loads(request.content)
+    assert body["model"] == "deepseek-chat" and body["tool_choice"] == "auto"
+    assert response.tool_calls[0].arguments == {"path": "a.txt"}
+    assert response.finish_reason == "tool_calls"
+    assert response.usage["total_tokens"] == 15
+
+
+async def test_model_names_and_errors(monkeypatch) -> None:
+    requests = _mock_client(monkeypatch, lambda r: httpx.Response(429, text="rate limited",
+                                                                   headers={"Retry-After": "7"}))
+    aihubmix = OpenAICompatProvider("aihubmix", api_key="k", default_model="anthropic/claude-opus-4-5",
+                                    extra_headers={"APP-Code": "x"})
+
+    with pytest.raises(LLMError) as exc:
+        await aihubmix.chat([{"role": "user", "content": "hi"}])
+
+    assert json.loads(requests[0].content)["model"] == "claude-opus-4-5"
+    assert requests[0].headers["app-code"] == "x"
+    assert (exc.value.kind, exc.value.status, exc.value.retry_after) == ("rate_limit", 429, 7.0)
+    assert exc.value.retryable
+    assert OpenAICompatProvider("openrouter")._model_name("openrouter/openai/gpt-4o") == "openai/gpt-4o"
+
+
+def test_provider_name_resolution() -> None:
+    config = Config()
+    config.providers.deepseek.api_key = "k"
+    config.agents.defaults.model = "deepseek/deepseek-chat"
+    assert config.get_provider_name() == "deepseek"
+    config.providers.deepseek.api_key = ""
+    assert config.get_provider_name() is None
+
+
+def test_importing_providers_does_not_import_litellm() -> None:
+    code = "import sys, nanobot.providers, nanobot.agent.loop; print('litellm' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,62 @@
+import os
+
+import litellm
+import pytest
+
+from nanobot.config.schema import Config
+from nanobot.providers.base import LLMError
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.openai_compat import OpenAICompatProvider
+from nanobot.providers.registry import ProviderRegistry
+
+
+def _config() -> Config:
+    config = Config()
+    config.agents.defaults.model = "anthropic/claude-opus-4-5"
+    config.providers.anthropic.api_key = "sk-ant"
+    config.providers.deepseek.api_key = "sk-ds"
+    config.providers.deepseek.api_base = "https://ds.example/v1"
+    return config
+
+
+def test_registry_builds_one_provider_per_model_with_its_own_credentials() -> None:
+    registry = ProviderRegistry(_config())
+
+    claude = registry.get()
+    deepseek = registry.get("deepseek/deepseek-chat")
+
+    assert isinstance(claude, LiteLLMProvider) and claude.api_key == "sk-ant"
+    assert claude.provider == "anthropic"
+    assert isinstance(deepseek, OpenAICompatProvider)
+    assert (deepseek.api_key, deepseek.api_base) == ("sk-ds", "https://ds.example/v1")
+    assert registry.get("deepseek/deepseek-chat") is deepseek
+
+    config = _config()
+    config.providers.deepseek.api_key = "sk-new"
+    registry.reload(config)
+    assert registry.get("deepseek/deepseek-chat").api_key == "sk-new"
+
+
+async def test_litellm_providers_pass_credentials_per_request(monkeypatch) -> None:
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    env_before = dict(os.environ)
+    a = LiteLLMProvider(api_key="key-a", default_model="anthropic/claude-opus-4-5")
+    b = LiteLLMProvider(api_key="key-b", api_base="http://localhost:8000/v1", default_model="my-model")
+
+    for provider in (a, b):
+        with pytest.raises(LLMError) as exc:
+            await provider.chat([{"role": "user", "content": "hi"}])
+        assert exc.value.provider == provider.provider
+
+    assert dict(os.environ) == env_before
+    assert litellm.api_base is None
+    assert (calls[0]["api_key"], calls[0].get("api_base")) == ("key-a", None)
+    assert (calls[1]["api_key"], calls[1]["api_base"], calls[1]["model"]) == (
+        "key-b", "http://localhost:8000/v1", "hosted_vllm/my-model")
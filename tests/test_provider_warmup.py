@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from nanobot.config.schema import Config
+from nanobot.providers import openai_compat
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+from nanobot.providers.registry import ProviderRegistry
+from nanobot.providers.warmup import keep_warm, warm_providers
+
+
+async def test_openai_compat_warm_measures_rtt_and_reports_failures(monkeypatch) -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if "down" in str(request.url):
+            raise httpx.ConnectError("refused")
+        return httpx.Response(405)  # Any status means the connection is up
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(openai_compat, "get_client", lambda purpose: client)
+    config = Config()
+    config.providers.deepseek.api_key = "k"
+    config.providers.vllm.api_key = "k"
+    config.providers.vllm.api_base = "http://down.local/v1"
+    registry = ProviderRegistry(config)
+
+    results = await warm_providers(registry, ["deepseek/deepseek-chat", "vllm/llama"])
+
+    assert isinstance(results["deepseek/deepseek-chat"], float)
+    assert isinstance(results["vllm/llama"], LLMError) and results["vllm/llama"].kind == "connection"
+    assert seen[0].method == "HEAD" and str(seen[0].url) == "https://api.deepseek.com/models"
+    assert seen[0].headers["authorization"] == "Bearer k"
+
+
+async def test_keep_warm_pings_until_cancelled() -> None:
+    class Pinged(LLMProvider):
+        pings = 0
+
+        async def chat(self, *args, **kwargs):
+            return LLMResponse(content="")
+
+        async def warm(self, model=None):
+            Pinged.pings += 1
+            return 0.001
+
+        def get_default_model(self):
+            return "m"
+
+    task = asyncio.create_task(keep_warm(Pinged(), ["m"], interval=0.01))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    assert Pinged.pings >= 2
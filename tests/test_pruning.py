@@ -0,0 +1,37 @@
+import json
+
+from nanobot.agent.pruning import STUB_PREFIX, estimate_tokens, prune_tool_results
+
+
+def _round(call_id: str, name: str, output: str) -> list[dict]:
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps({})}}
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "name": name, "content": output},
+    ]
+
+
+def test_prunes_oldest_results_but_keeps_latest_round() -> None:
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+    messages += _round("c1", "read_file", "first line\n" + "a" * 8000)
+    messages += _round("c2", "exec", "stored as res_0123abcd\n" + "b" * 8000)
+    messages += _round("c3", "web_fetch", "c" * 8000)
+
+    assert prune_tool_results(messages, max_tokens=100_000) == []
+    pruned = prune_tool_results(messages, max_tokens=2500)
+    assert pruned == ["c1", "c2"]
+    assert messages[3]["content"].startswith(STUB_PREFIX) and "It began: first line" in messages[3]["content"]
+    assert 'read_result(handle="res_0123abcd")' in messages[5]["content"]
+    assert messages[7]["content"] == "c" * 8000  # Not yet seen by the model
+    assert [m["tool_call_id"] for m in messages if m["role"] == "tool"] == ["c1", "c2", "c3"]
+    assert prune_tool_results(messages, max_tokens=2500) == []  # Already stubs
+
+
+def test_stops_once_under_threshold() -> None:
+    messages = [{"role": "user", "content": "go"}]
+    for i in range(4):
+        messages += _round(f"c{i}", "read_file", "x" * 4000)
+    budget = estimate_tokens(messages) - 500
+    assert prune_tool_results(messages, budget) == ["c0"]
+    assert estimate_tokens(messages) <= budget
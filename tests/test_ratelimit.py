@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from nanobot.providers import ratelimit
+from nanobot.providers.base import LLMError, LLMResponse
+from nanobot.providers.ratelimit import (
+    AdaptiveConcurrency,
+    ProviderLimiter,
+    TokenBucket,
+    classify_error,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after_and_classify() -> None:
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert 0 <= parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) < 1
+    assert parse_retry_after({}) is None
+
+    assert classify_error(httpx.ReadTimeout("slow")).kind == "timeout"
+    assert classify_error(httpx.ConnectError("refused")).kind == "connection"
+    assert classify_error(ValueError("boom")).kind == "unknown"
+
+
+async def test_limiter_retries_transient_errors_and_backs_off(monkeypatch) -> None:
+    monkeypatch.setattr(ratelimit, "BACKOFF_BASE", 0.001)
+    limiter = ProviderLimiter("test", max_concurrency=8, max_retries=3)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise LLMError("slow down", kind="rate_limit", status=429, retry_after=0)
+        return LLMResponse(content="ok")
+
+    assert (await limiter.run(call)).content == "ok"
+    assert calls == 3
+    assert 2 <= limiter.concurrency.limit < 3  # Halved twice, then one additive step
+
+
+async def test_limiter_charges_tokens_once_and_refunds_failures(monkeypatch) -> None:
+    monkeypatch.setattr(ratelimit, "BACKOFF_BASE", 0.001)
+    limiter = ProviderLimiter("test", tpm=6000, max_retries=3)
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise LLMError("busy", kind="overloaded", status=529, retry_after=0)
+        return LLMResponse(content="ok")
+
+    await limiter.run(flaky, estimated_tokens=1000)
+    assert 5000 <= limiter.tokens.tokens < 5010  # One charge despite three attempts
+
+    async def broken():
+        raise LLMError("bad request", kind="bad_request", status=400)
+
+    with pytest.raises(LLMError):
+        await limiter.run(broken, estimated_tokens=1000)
+    assert 5000 <= limiter.tokens.tokens < 5020  # Refunded
+
+
+async def test_limiter_raises_non_retryable_errors_immediately() -> None:
+    limiter = ProviderLimiter("test", max_retries=3)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise httpx.HTTPStatusError("no", request=httpx.Request("POST", "http://x"),
+                                    response=httpx.Response(401))
+
+    with pytest.raises(LLMError) as exc:
+        await limiter.run(call)
+    assert (exc.value.kind, exc.value.provider, calls) == ("auth", "test", 1)
+
+
+async def test_limiter_gives_up_on_long_retry_after() -> None:
+    limiter = ProviderLimiter("test", max_retries=3)
+
+    async def call():
+        raise LLMError("quota", kind="rate_limit", status=429, retry_after=3600)
+
+    with pytest.raises(LLMError):
+        await limiter.run(call)
+
+
+async def test_adaptive_concurrency_caps_in_flight() -> None:
+    concurrency = AdaptiveConcurrency(max_limit=4)
+    concurrency.on_overload()
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with concurrency.slot():
+            peak = max(peak, concurrency.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(10)))
+    assert peak == 2
+
+
+async def test_token_bucket_waits_for_refill() -> None:
+    bucket = TokenBucket(per_minute=6000)  # 100 tokens per second
+    await bucket.acquire(6000)
+    start = time.monotonic()
+    await bucket.acquire(10)
+    assert time.monotonic() - start >= 0.08
+    bucket.adjust(-10_000)  # Refunds never overfill the bucket
+    assert bucket.tokens <= bucket.capacity
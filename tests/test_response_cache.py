@@ -0,0 +1,98 @@
+import asyncio
+import os
+from pathlib import Path
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import ResponseCacheConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.cache import CachedProvider, ResponseCache, request_key
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return LLMResponse(
+            content="done",
+            tool_calls=[ToolCallRequest(id="c1", name="exec", arguments={"command": "ls"})],
+            usage={"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        )
+
+    def get_default_model(self):
+        return "m"
+
+
+def _messages(time: str, question: str = "check tasks") -> list[dict]:
+    return [
+        {"role": "system", "content": f"# nanobot\n\n## Current Time\n{time}\n\n## Runtime\nLinux"},
+        {"role": "user", "content": question},
+    ]
+
+
+def test_request_key_ignores_current_time_only() -> None:
+    base = request_key("m", _messages("2026-01-01 10:00"), None, 100, 0.7)
+    assert request_key("m", _messages("2026-01-01 10:07"), None, 100, 0.7) == base
+    assert request_key("m", _messages("2026-01-01 10:00", "other"), None, 100, 0.7) != base
+    assert request_key("m2", _messages("2026-01-01 10:00"), None, 100, 0.7) != base
+    assert request_key("m", _messages("2026-01-01 10:00"), None, 100, 0.2) != base
+
+
+async def test_cached_provider_coalesces_and_persists(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachedProvider(inner, ResponseCache(tmp_path, ttl=60))
+
+    first, second = await asyncio.gather(
+        provider.chat(_messages("10:00")), provider.chat(_messages("10:01")),
+    )
+    assert inner.calls == 1 and first is second
+
+    reloaded = CachedProvider(inner, ResponseCache(tmp_path, ttl=60))
+    hit = await reloaded.chat(_messages("10:02"))
+    assert inner.calls == 1
+    assert hit.tool_calls[0].arguments == {"command": "ls"}
+    assert hit.usage == {}
+    assert reloaded.cache.stats == {"hits": 1, "misses": 0, "coalesced": 0, "hitRate": 1.0}
+
+
+async def test_waiters_survive_first_caller_cancellation(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachedProvider(inner, ResponseCache(tmp_path, ttl=60))
+
+    first = asyncio.create_task(provider.chat(_messages("10:00")))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(provider.chat(_messages("10:00")))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert (await second).content == "done"
+    assert inner.calls == 1
+
+
+async def test_expired_entries_and_size_cap(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    expired = CachedProvider(inner, ResponseCache(tmp_path / "a", ttl=-1))
+    await expired.chat(_messages("10:00"))
+    await expired.chat(_messages("10:00"))
+    assert inner.calls == 2
+
+    capped = ResponseCache(tmp_path / "b", ttl=60, max_bytes=1000)
+    provider = CachedProvider(inner, capped)
+    for i in range(10):
+        await provider.chat(_messages("10:00", f"question {i}"))
+    assert sum(f.stat().st_size for f in (tmp_path / "b").iterdir()) <= 1000
+
+
+def test_agent_loop_uses_cache_only_for_configured_workloads(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    provider = CountingProvider()
+    agent = AgentLoop(MessageBus(), provider, tmp_path, response_cache=ResponseCacheConfig(enabled=True))
+    assert agent._provider_for("heartbeat") is agent.cached_provider
+    assert agent._provider_for("cron") is agent.cached_provider
+    assert agent._provider_for("main") is provider
+    assert os.path.dirname(agent.cached_provider.cache.cache_dir) == str(tmp_path / ".nanobot" / "cache")
+    agent.stop()
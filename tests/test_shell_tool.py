@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from nanobot.agent.tools.shell import ExecTool, ShellSessionPool
+
+
+def _alive(pid: int) -> bool:
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except FileNotFoundError:
+        return False
+    return "\nState:\tZ" not in status
+
+
+async def test_exec_output_is_bounded_head_and_tail() -> None:
+    tool = ExecTool(max_output_bytes=1000)
+    cmd = f"{sys.executable} -c \"print('START' + 'x' * 2000000 + 'END')\""
+    result = await tool.execute(cmd)
+    assert result.startswith("START")
+    assert result.rstrip().endswith("END")
+    assert "bytes omitted" in result
+    assert len(result) < 1200
+
+
+async def test_exec_timeout_kills_process_group(tmp_path: Path) -> None:
+    pid_file = tmp_path / "pid"
+    tool = ExecTool(timeout=1)
+    start = time.monotonic()
+    result = await tool.execute(f"sleep 30 & echo $! > {pid_file}; wait", working_dir=str(tmp_path))
+    assert "timed out" in result
+    assert time.monotonic() - start < 5
+    pid = int(pid_file.read_text())
+    for _ in range(50):
+        if not _alive(pid):
+            break
+        time.sleep(0.05)
+    assert not _alive(pid)
+
+
+async def test_exec_reports_stderr_and_exit_code() -> None:
+    result = await ExecTool().execute("echo out; echo err >&2; exit 3")
+    assert result == "out\n\nSTDERR:\nerr\n\n\nExit code: 3"
+
+
+async def test_persistent_shell_keeps_cwd_and_env(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True)
+    try:
+        assert await tool.execute("cd sub && export GREETING=hi") == "(no output)"
+        assert await tool.execute("pwd; echo $GREETING") == f"{tmp_path / 'sub'}\nhi\n"
+        result = await tool.execute("echo 'unbalanced; false")
+        assert "Exit code: 2" in result
+        assert await tool.execute("echo still alive") == "still alive\n"
+    finally:
+        tool.close()
+
+
+async def test_persistent_shell_guard_uses_session_directory(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "notes.txt").write_text("x")
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, restrict_to_workspace=True)
+    try:
+        await tool.execute("cd sub")
+        # Same rule as a one-off command run from sub
+        assert "path outside working dir" in await tool.execute(f"cat {tmp_path / 'other' / 'notes.txt'}")
+        assert await tool.execute(f"ls {tmp_path / 'sub'}") == "(no output)"
+    finally:
+        tool.close()
+
+
+async def test_persistent_shell_sessions_are_per_chat_and_resettable(tmp_path: Path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True)
+    try:
+        tool.set_context("telegram", "1")
+        await tool.execute("export X=one")
+        tool.set_context("telegram", "2")
+        assert await tool.execute("echo ${X:-unset}") == "unset\n"
+        tool.set_context("telegram", "1")
+        assert await tool.execute("echo $X") == "one\n"
+        assert await tool.execute("echo ${X:-unset}", reset=True) == "unset\n"
+    finally:
+        tool.close()
+
+
+async def test_persistent_shell_guard_and_timeout(tmp_path: Path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, timeout=1)
+    try:
+        assert "blocked" in await tool.execute("rm -rf /")
+        await tool.execute("export KEEP=1")
+        result = await tool.execute("echo partial; sleep 30")
+        assert "timed out" in result and "partial" in result
+        assert await tool.execute("echo ${KEEP:-gone}") == "gone\n"
+    finally:
+        tool.close()
+
+
+async def test_concurrent_acquires_share_one_shell(tmp_path: Path) -> None:
+    pool = ShellSessionPool()
+    try:
+        first, second = await asyncio.gather(
+            pool.acquire("telegram:1", str(tmp_path)),
+            pool.acquire("telegram:1", str(tmp_path)),
+        )
+        assert first is second and len(pool._sessions) == 1
+    finally:
+        pool.close_all()
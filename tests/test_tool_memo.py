@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from nanobot.agent.tools.filesystem import ListDirTool, ReadFileTool, WriteFileTool
+from nanobot.agent.tools.memo import TurnMemo
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.shell import ExecTool
+
+
+def _registry() -> ToolRegistry:
+    tools = ToolRegistry()
+    for tool in (ReadFileTool(), WriteFileTool(), ListDirTool(), ExecTool()):
+        tools.register(tool)
+    return tools
+
+
+async def test_repeated_reads_return_pointer_until_written(tmp_path: Path) -> None:
+    tools, memo = _registry(), TurnMemo()
+    f = tmp_path / "a.txt"
+    f.write_text("one")
+
+    assert await tools.execute("read_file", {"path": str(f)}, memo, "call_1") == "one"
+    repeat = await tools.execute("read_file", {"path": str(f)}, memo, "call_2")
+    assert "call_1" in repeat and "one" not in repeat
+    listing = await tools.execute("list_dir", {"path": str(tmp_path)}, memo, "call_3")
+    assert "call_3" in await tools.execute("list_dir", {"path": str(tmp_path)}, memo, "call_4")
+
+    await tools.execute("write_file", {"path": str(f), "content": "two"}, memo, "call_5")
+    assert await tools.execute("read_file", {"path": str(f)}, memo, "call_6") == "two"
+    assert await tools.execute("list_dir", {"path": str(tmp_path)}, memo, "call_7") == listing
+
+
+async def test_exec_and_errors_are_not_reused(tmp_path: Path) -> None:
+    tools, memo = _registry(), TurnMemo()
+    f = tmp_path / "b.txt"
+    missing = {"path": str(tmp_path / "missing.txt")}
+
+    assert (await tools.execute("read_file", missing, memo, "call_1")).startswith("Error")
+    assert (await tools.execute("read_file", missing, memo, "call_2")).startswith("Error")
+
+    f.write_text("old")
+    await tools.execute("read_file", {"path": str(f)}, memo, "call_3")
+    await tools.execute("exec", {"command": f"echo new > {f}"}, memo, "call_4")
+    assert await tools.execute("read_file", {"path": str(f)}, memo, "call_5") == "new\n"
@@ -0,0 +1,70 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.results import ReadResultTool, ResultStore
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class FailingProvider(LLMProvider):
+    """Asks for one tool call, then fails."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        if self.calls > 1:
+            raise RuntimeError("provider down")
+        return LLMResponse(content=None, tool_calls=[
+            ToolCallRequest(id="c1", name="read_file", arguments={"path": self.path}),
+        ])
+
+    def get_default_model(self):
+        return "m"
+
+
+async def test_large_results_are_spilled_and_paged() -> None:
+    store = ResultStore(threshold=1000, excerpt_chars=200)
+    tool = ReadResultTool(store)
+    full = "".join(f"line {i}\n" for i in range(500))
+    owned: list[str] = []
+
+    assert store.spill("small", "exec", owned) == "small"
+    inline = store.spill(full, "exec", owned)
+    assert inline.startswith(full[:200]) and len(inline) < 400
+    handle = re.search(r"res_[0-9a-f]{8}", inline)[0]
+    assert owned == [handle]
+
+    page = await tool.execute(handle=handle, offset=200, limit=500)
+    assert page.startswith(full[200:700]) and "next offset=700" in page
+    last = await tool.execute(handle=handle, offset=len(full) - 10)
+    assert "end of result" in last
+    assert store.spill(page * 3, "read_result", owned) == page * 3  # Pages are never re-spilled
+
+    store.release(owned)
+    assert (await tool.execute(handle=handle)).startswith("Error")
+    store.close()
+
+
+def test_spilling_disabled_with_zero_threshold() -> None:
+    store = ResultStore(threshold=0)
+    assert store.spill("x" * 100_000, "web_fetch", []) == "x" * 100_000
+
+
+async def test_spilled_results_are_released_when_a_turn_fails(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    big = tmp_path / "big.txt"
+    big.write_text("x" * 5000)
+    agent = AgentLoop(MessageBus(), FailingProvider(str(big)), tmp_path, spill_threshold=1000)
+
+    with pytest.raises(RuntimeError):
+        await agent.process_direct("read it")
+
+    assert agent.result_store._results == {}
+    agent.stop()
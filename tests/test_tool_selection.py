@@ -0,0 +1,36 @@
+from nanobot.agent.tools.filesystem import ListDirTool, ReadFileTool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.selection import EnableToolsTool, select_tools
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
+
+
+def _registry() -> ToolRegistry:
+    tools = ToolRegistry()
+    for tool in (ReadFileTool(), ListDirTool(), ExecTool(), WebSearchTool(), WebFetchTool(), EnableToolsTool()):
+        tools.register(tool)
+    return tools
+
+
+def test_small_talk_gets_core_tools_and_enable_tools() -> None:
+    selection = select_tools(_registry(), "hi there!")
+    assert selection.tool_names == ["read_file", "list_dir", "enable_tools"]
+    assert [d["function"]["name"] for d in selection.definitions()] == selection.tool_names
+
+
+def test_message_hints_and_skills_add_groups() -> None:
+    tools = _registry()
+    assert "web_fetch" in select_tools(tools, "summarize https://example.com").tool_names
+    assert "exec" in select_tools(tools, "please run the tests").tool_names
+    assert "exec" in select_tools(tools, "what's up with tmux?", skill_names=["tmux"]).tool_names
+    assert "exec" not in select_tools(tools, "what's up?", skill_names=["tmux"]).tool_names
+
+
+async def test_enable_tools_expands_selection_for_the_turn() -> None:
+    tools = _registry()
+    selection = select_tools(tools, "hello")
+    params = {"groups": ["web", "shell"]}
+    assert (await tools.execute("enable_tools", params)).startswith("Enabled: web")
+    selection.observe("enable_tools", params)
+    assert selection.tool_names == ["read_file", "list_dir", "exec", "web_search", "web_fetch"]
+    assert (await tools.execute("enable_tools", {"groups": ["nope"]})).startswith("Error")
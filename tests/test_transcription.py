@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.qq import QQChannel
+from nanobot.channels.telegram import TelegramChannel
+from nanobot.channels.whatsapp import WhatsAppChannel
+from nanobot.config.schema import QQConfig, TelegramConfig, WhatsAppConfig
+from nanobot.providers.transcription import TranscriptionService
+
+
+class FakeProvider:
+    api_key = "k"
+
+    def __init__(self, text: str = "hello", delay: float = 0.02):
+        self.text = text
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def transcribe_bytes(self, data: bytes, filename: str) -> str:
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return self.text
+
+
+async def test_identical_audio_is_transcribed_once(tmp_path) -> None:
+    provider = FakeProvider()
+    service = TranscriptionService(provider, cache_dir=tmp_path)
+
+    concurrent = await asyncio.gather(*(service.submit(b"same", "a.ogg") for _ in range(3)))
+    later = await TranscriptionService(provider, cache_dir=tmp_path).transcribe(b"same", "b.ogg")
+
+    assert concurrent == ["hello"] * 3 and later == "hello"
+    assert provider.calls == 1
+
+
+async def test_concurrency_is_bounded_and_failures_are_not_cached(tmp_path) -> None:
+    provider = FakeProvider()
+    service = TranscriptionService(provider, cache_dir=tmp_path, max_concurrency=2)
+    await asyncio.gather(*(service.submit(bytes([i]), "a.ogg") for i in range(6)))
+    assert provider.peak == 2
+
+    failing = FakeProvider(text="")
+    service = TranscriptionService(failing, cache_dir=tmp_path)
+    assert await service.transcribe(b"bad", "a.ogg") == ""
+    assert await service.transcribe(b"bad", "a.ogg") == ""
+    assert failing.calls == 2
+
+
+async def test_failed_download_yields_empty_transcript(tmp_path) -> None:
+    async def download() -> bytes:
+        raise OSError("gone")
+
+    service = TranscriptionService(FakeProvider(), cache_dir=tmp_path)
+    assert await service.submit(download(), "a.ogg") == ""
+
+
+async def test_voice_message_is_published_before_transcription_finishes(tmp_path) -> None:
+    provider = FakeProvider(text="see you at noon", delay=0.05)
+    bus = MessageBus()
+    channel = QQChannel(QQConfig(enabled=True), bus, transcription=TranscriptionService(provider, cache_dir=tmp_path))
+    downloaded: list[str] = []
+
+    async def download(url: str) -> bytes:
+        downloaded.append(url)
+        return b"voice"
+
+    channel._download = download
+    raw = "[CQ:record,file=a.mp3,url=http://host/get?a=1&amp;b=2]"
+    await channel._handle_onebot_message(json.dumps({
+        "post_type": "message", "message_type": "private", "user_id": 1, "raw_message": raw,
+    }))
+
+    msg = bus.inbound.get_nowait()
+    assert msg.content == "[语音]" and not msg.pending["[语音]"].done()
+    await msg.resolve_pending()
+    assert msg.content == "[transcription: see you at noon]"
+    assert downloaded == ["http://host/get?a=1&b=2"]
+
+
+async def test_unsupported_voice_format_is_not_downloaded(tmp_path) -> None:
+    bus = MessageBus()
+    channel = QQChannel(QQConfig(enabled=True), bus, transcription=TranscriptionService(FakeProvider(), cache_dir=tmp_path))
+    downloaded: list[str] = []
+
+    async def download(url: str) -> bytes:
+        downloaded.append(url)
+        return b"voice"
+
+    channel._download = download
+    await channel._handle_onebot_message(json.dumps({
+        "post_type": "message", "message_type": "private", "user_id": 1,
+        "raw_message": "[CQ:record,file=a.silk,url=http://host/a.silk]",
+    }))
+
+    msg = bus.inbound.get_nowait()
+    assert msg.content == "[语音]" and not msg.pending
+    assert downloaded == []
+
+
+async def test_whatsapp_voice_note_is_forwarded_before_its_audio(tmp_path) -> None:
+    bus = MessageBus()
+    channel = WhatsAppChannel(
+        WhatsAppConfig(enabled=True), bus, transcription=TranscriptionService(FakeProvider(text="on my way"), cache_dir=tmp_path),
+    )
+    await channel._handle_bridge_message(json.dumps({
+        "type": "message", "id": "m1", "sender": "1@s.whatsapp.net", "content": "[Voice Message]",
+        "audioMimetype": "audio/ogg; codecs=opus",
+    }))
+
+    msg = bus.inbound.get_nowait()
+    assert msg.content == "[Voice Message]" and not msg.pending["[Voice Message]"].done()
+    await channel._handle_bridge_message(json.dumps({
+        "type": "audio", "id": "m1", "audio": base64.b64encode(b"voice").decode(),
+    }))
+    await msg.resolve_pending()
+    assert msg.content == "[transcription: on my way]"
+    assert channel._audio == {}
+
+
+async def test_telegram_voice_joins_media_only_once_downloaded(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    channel = TelegramChannel(
+        TelegramConfig(enabled=True), bus, transcription=TranscriptionService(FakeProvider(), cache_dir=tmp_path),
+    )
+    channel._app = object()
+
+    async def download(file_id, file_path):
+        if file_id.startswith("bad"):
+            raise OSError("gone")
+        return b"voice"
+
+    channel._download = download
+    for file_id in ("bad-file-id-0000", "good-file-id-000"):
+        message = SimpleNamespace(
+            text=None, caption=None, photo=None, audio=None, document=None, chat_id=1, message_id=2,
+            chat=SimpleNamespace(type="private"), voice=SimpleNamespace(file_id=file_id, mime_type="audio/ogg"),
+        )
+        user = SimpleNamespace(id=3, username=None, first_name="A")
+        await channel._on_message(SimpleNamespace(message=message, effective_user=user), None)
+
+    failed, ok = bus.inbound.get_nowait(), bus.inbound.get_nowait()
+    await failed.resolve_pending()
+    await ok.resolve_pending()
+    assert (failed.content, failed.media) == ("[voice: download failed]", [])
+    assert ok.content == "[transcription: hello]"
+    assert ok.media == [str(tmp_path / ".nanobot" / "media" / "good-file-id-000.ogg")]
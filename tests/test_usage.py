@@ -0,0 +1,76 @@
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.cli.commands import app
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.usage.store import UsageStore
+
+
+class UsageProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        return LLMResponse(content="ok", usage={"prompt_tokens": 100, "completion_tokens": 20, "cached_tokens": 60})
+
+    def get_default_model(self):
+        return "m"
+
+
+def test_store_records_compactly_and_rolls_up(tmp_path: Path) -> None:
+    store = UsageStore(tmp_path)
+    store.record("telegram:1", "main", "big", {"prompt_tokens": 100, "completion_tokens": 10}, 250.4, 1)
+    store.record("telegram:1", "main", "big", {"prompt_tokens": 300, "completion_tokens": 30, "cached_tokens": 200}, 150, 2)
+    store.record("cron:abc", "cron", "small", {"prompt_tokens": 50, "completion_tokens": 5}, 100, 1)
+
+    line = next(tmp_path.glob("usage-*.jsonl")).read_text().splitlines()[0]
+    assert '"session"' not in line and '"s": "telegram:1"' in line
+
+    by_session = store.rollup(by="session")
+    assert [r["key"] for r in by_session] == ["telegram:1", "cron:abc"]
+    assert by_session[0] == {
+        "key": "telegram:1", "calls": 2, "prompt_tokens": 400, "completion_tokens": 40,
+        "cached_tokens": 200, "avg_latency_ms": 200,
+    }
+    assert {r["key"] for r in store.rollup(by="channel")} == {"telegram", "cron"}
+    assert store.rollup(since=time.time() + 60) == []
+
+    assert UsageStore(tmp_path).session_tokens_today("telegram:1") == 440
+
+
+async def test_agent_loop_records_calls_and_enforces_budget(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    agent = AgentLoop(MessageBus(), UsageProvider(), tmp_path, session_token_budget=200)
+
+    assert await agent.process_direct("hi", session_key="cli:test") == "ok"
+    assert await agent.process_direct("hi again", session_key="cli:test") == "ok"
+    assert "daily budget" in await agent.process_direct("and again", session_key="cli:test")
+
+    rows = agent.usage.rollup(by="session")
+    assert rows[0]["key"] == "cli:test" and rows[0]["calls"] == 2 and rows[0]["cached_tokens"] == 120
+    agent.stop()
+
+
+async def test_subagent_stops_when_session_is_over_budget(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    agent = AgentLoop(bus, UsageProvider(), tmp_path, session_token_budget=200)
+    await agent.usage.record_async("telegram:42", "main", "m", {"prompt_tokens": 500}, 10, 1)
+
+    await agent.subagents._run_subagent("t1", "summarize", "summarize", {"channel": "telegram", "chat_id": "42"})
+
+    announce = bus.inbound.get_nowait()
+    assert "daily token budget" in announce.content
+    assert agent.usage.session_tokens_today("telegram:42") == 500  # No subagent call was made
+    agent.stop()
+
+
+def test_usage_command_prints_report(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    UsageStore(tmp_path / ".nanobot" / "usage").record("cli:x", "main", "big", {"prompt_tokens": 1234}, 10, 1)
+
+    result = CliRunner().invoke(app, ["usage", "--by", "model"])
+    assert result.exit_code == 0
+    assert "big" in result.output and "1,234" in result.output
+    assert CliRunner().invoke(app, ["usage", "--by", "nope"]).exit_code == 1
@@ -0,0 +1,248 @@
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import CachedPage, FetchCache, cache_policy
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class StubProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        return LLMResponse(content="ok")
+
+    def get_default_model(self):
+        return "m"
+
+
+HTML = "<html><head><title>Doc</title></head><body><article><h1>Hello</h1><p>Some text here.</p></article></body></html>"
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route WebFetchTool's httpx client to a handler; returns the list of seen requests."""
+    seen: list[httpx.Request] = []
+
+    def install(handler):
+        def wrapped(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            web.httpx, "AsyncClient",
+            lambda **kw: real_client(transport=httpx.MockTransport(wrapped), **kw),
+        )
+        return seen
+
+    return install
+
+
+def test_cache_policy() -> None:
+    assert cache_policy({"cache-control": "no-store"}) == (False, 0.0)
+    assert cache_policy({"cache-control": "no-cache, max-age=60"}) == (True, 0.0)
+    storable, expires = cache_policy({"cache-control": "public, max-age=60"})
+    assert storable and 55 < expires - time.time() <= 60
+    assert cache_policy({"expires": "Thu, 01 Jan 1970 00:00:00 GMT"}) == (True, 0.0)
+
+
+async def test_fetch_cache_alias_and_lru_eviction(tmp_path: Path) -> None:
+    cache = FetchCache(tmp_path, max_bytes=1500)
+    await cache.put(CachedPage(url="https://a/final", status=200, content_type="text/plain", body="a" * 400),
+                    request_url="https://a/")
+    assert (await cache.get("https://a/")).body == "a" * 400
+    for i in range(5):
+        await cache.put(CachedPage(url=f"https://b/{i}", status=200, content_type="text/plain", body="b" * 400))
+    assert await cache.get("https://b/4") is not None
+    assert await cache.get("https://a/final") is None
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 1500
+
+
+def test_fetch_cache_is_shared_with_subagents(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    agent = AgentLoop(MessageBus(), StubProvider(), tmp_path)
+
+    assert isinstance(agent.fetch_cache, FetchCache)
+    assert agent.tools.get("web_fetch").cache is agent.fetch_cache
+    assert agent.subagents.fetch_cache is agent.fetch_cache
+
+
+async def test_web_fetch_revalidates_with_etag(tmp_path: Path, serve) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"content-type": "text/html", "etag": '"v1"'}, text=HTML)
+
+    seen = serve(handler)
+    tool = WebFetchTool(cache=FetchCache(tmp_path))
+    first = json.loads(await tool.execute("https://example.com/doc"))
+    second = json.loads(await tool.execute("https://example.com/doc"))
+    assert first["cached"] is False and second["cached"] is True
+    assert second["text"] == first["text"] and "Hello" in first["text"]
+    assert [r.headers.get("if-none-match") for r in seen] == [None, '"v1"']
+
+
+async def test_web_fetch_serves_fresh_pages_without_network(tmp_path: Path, serve) -> None:
+    seen = serve(lambda r: httpx.Response(
+        200, headers={"content-type": "text/plain", "cache-control": "max-age=300"}, text="plain body"))
+    tool = WebFetchTool(cache=FetchCache(tmp_path))
+    await tool.execute("https://example.com/a.txt")
+    result = json.loads(await tool.execute("https://example.com/a.txt"))
+    assert result["text"] == "plain body" and result["cached"] is True
+    assert len(seen) == 1
+
+
+async def test_web_fetch_stops_reading_at_byte_cap(serve) -> None:
+    chunks_sent = 0
+
+    async def endless():
+        nonlocal chunks_sent
+        while True:
+            chunks_sent += 1
+            yield b"y" * 65536
+
+    serve(lambda r: httpx.Response(200, headers={"content-type": "text/plain"}, content=endless()))
+    result = json.loads(await WebFetchTool().execute("https://example.com/stream", maxChars=1000))
+    assert result["truncated"] is True
+    assert result["length"] == 1000
+    assert chunks_sent < 5
+
+
+async def test_body_of_exactly_the_cap_is_complete() -> None:
+    headers = {"content-type": "text/plain"}
+    assert await web._read_text(httpx.Response(200, headers=headers, content=b"x" * 10), 10) == ("x" * 10, True)
+    assert await web._read_text(httpx.Response(200, headers=headers, content=b"x" * 11), 10) == ("x" * 10, False)
+
+
+async def test_web_fetch_returns_metadata_for_binary(serve) -> None:
+    async def body():
+        raise AssertionError("binary body must not be read")
+        yield b""
+
+    serve(lambda r: httpx.Response(
+        200, headers={"content-type": "application/octet-stream", "content-length": "2000000000"}, content=body()))
+    result = json.loads(await WebFetchTool().execute("https://example.com/big.iso"))
+    assert result["extractor"] == "binary"
+    assert result["contentLength"] == 2000000000
+
+
+async def test_web_fetch_decodes_declared_charset(serve) -> None:
+    serve(lambda r: httpx.Response(
+        200, headers={"content-type": "text/plain; charset=iso-8859-1"}, content="café".encode("latin-1")))
+    result = json.loads(await WebFetchTool().execute("https://example.com/latin"))
+    assert result["text"] == "café"
+
+
+async def test_web_fetch_falls_back_when_extraction_times_out(tmp_path: Path, serve, monkeypatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    serve(lambda request: httpx.Response(
+        200, headers={"content-type": "text/html", "cache-control": "max-age=300"}, text=HTML))
+    pool = ThreadPoolExecutor(max_workers=2)  # The timed-out extraction keeps one worker busy
+    monkeypatch.setattr(web, "INLINE_EXTRACT_CHARS", 0)
+    monkeypatch.setattr(web, "_get_extract_pool", lambda workers: (pool, 1))
+    monkeypatch.setattr(web, "extract_html", lambda body, mode: time.sleep(0.5) or "never")
+
+    tool = WebFetchTool(cache=FetchCache(tmp_path), extract_timeout=0.05)
+    data = json.loads(await tool.execute(url="https://example.com/slow"))
+    assert data["extractor"] == "fallback"
+    assert "Some text here." in data["text"]
+
+    # The fallback text is not cached; the next fetch extracts again
+    monkeypatch.setattr(web, "extract_html", lambda body, mode: "extracted")
+    data = json.loads(await tool.execute(url="https://example.com/slow"))
+    assert (data["extractor"], data["cached"], data["text"]) == ("readability", True, "extracted")
+    pool.shutdown(wait=True)
+
+
+def test_extraction_stops_itself_at_the_deadline(monkeypatch) -> None:
+    monkeypatch.setattr(web, "extract_html", lambda body, mode: time.sleep(5) or "never")
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        web._extract_with_deadline("<html></html>", "markdown", 0.05)
+    assert time.monotonic() - started < 1
+
+
+async def test_broken_pool_is_replaced_once_and_retried(monkeypatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenPool(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+    pools = iter([BrokenPool(), ThreadPoolExecutor(max_workers=1)])
+    current: list = []
+    generation = 0
+
+    def get_pool(workers):
+        nonlocal generation
+        if not current:
+            current.append(next(pools))
+            generation += 1
+        return current[0], generation
+
+    def reset(gen=None):
+        if gen == generation:
+            current.pop().shutdown(wait=False)
+
+    monkeypatch.setattr(web, "_get_extract_pool", get_pool)
+    monkeypatch.setattr(web, "_reset_extract_pool", reset)
+    monkeypatch.setattr(web, "INLINE_EXTRACT_CHARS", 0)
+    monkeypatch.setattr(web, "extract_html", lambda body, mode: "extracted")
+
+    assert await WebFetchTool()._extract_html(HTML, "markdown") == ("extracted", "readability")
+    assert generation == 2
+    current[0].shutdown(wait=True)
+
+
+def test_stale_reset_keeps_the_current_pool(monkeypatch) -> None:
+    class Pool:
+        closed = False
+
+        def shutdown(self, wait: bool, cancel_futures: bool = False) -> None:
+            self.closed = True
+
+    pool = Pool()
+    monkeypatch.setattr(web, "_extract_pool", pool)
+    monkeypatch.setattr(web, "_extract_pool_generation", 3)
+    web._reset_extract_pool(2)
+    assert web._extract_pool is pool and not pool.closed
+    web._reset_extract_pool(3)
+    assert web._extract_pool is None and pool.closed
+
+
+def test_share_budget_gives_leftover_to_long_pages() -> None:
+    assert web._share_budget([100, 5000, 5000], 3000) == [100, 1450, 1450]
+    assert web._share_budget([10, 20], 1000) == [10, 20]
+    assert sum(web._share_budget([900, 900, 900], 1000)) <= 1000
+
+
+async def test_web_fetch_batch_shares_budget_and_reports_per_url_status(serve) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        size = 300 if request.url.path == "/short" else 5000
+        return httpx.Response(200, headers={"content-type": "text/plain"}, text="x" * size)
+
+    serve(handler)
+    tool = WebFetchTool()
+    data = json.loads(await tool.execute(
+        urls=["https://a.test/short", "https://a.test/long", "https://a.test/missing", "https://a.test/short"],
+        maxChars=2000,
+    ))
+    assert (data["fetched"], data["failed"]) == (2, 1)
+    short, long, missing = data["results"]
+    assert (short["length"], short["truncated"]) == (300, False)
+    assert (long["length"], long["truncated"]) == (1700, True)
+    assert missing["url"] == "https://a.test/missing" and "404" in missing["error"]
+
+
+async def test_web_fetch_requires_url_or_urls() -> None:
+    assert "error" in json.loads(await WebFetchTool().execute())
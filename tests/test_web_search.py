@@ -0,0 +1,77 @@
+import asyncio
+from pathlib import Path
+
+from nanobot.agent.tools.web import WebSearchTool
+from nanobot.agent.tools.web_cache import SearchCache
+
+
+async def test_search_cache_normalizes_and_coalesces() -> None:
+    cache = SearchCache(ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [{"title": "t", "url": "https://x.test", "description": ""}]
+
+    first, second = await asyncio.gather(
+        cache.get_or_fetch("Python  asyncio", 5, fetch),
+        cache.get_or_fetch("python asyncio", 5, fetch),
+    )
+    assert first == second and calls == 1
+    await cache.get_or_fetch(" PYTHON asyncio ", 5, fetch)
+    await cache.get_or_fetch("python asyncio", 3, fetch)  # Different count is a different key
+    assert calls == 2
+    assert cache.stats == {"hits": 1, "misses": 2, "coalesced": 1, "hitRate": 0.5}
+
+
+async def test_search_waiters_survive_cancelled_first_caller() -> None:
+    cache = SearchCache(ttl=60)
+    results = [{"title": "t", "url": "https://x.test", "description": ""}]
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return results
+
+    first = asyncio.create_task(cache.get_or_fetch("q", 5, fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.get_or_fetch("q", 5, fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == results
+    assert first.cancelled() and cache.stats["coalesced"] == 1
+    assert await cache.get_or_fetch("q", 5, fetch) == results  # Stored despite the cancellation
+
+
+async def test_search_cache_expires_and_persists(tmp_path: Path) -> None:
+    async def fetch():
+        return [{"title": "t", "url": "u", "description": "d"}]
+
+    await SearchCache(ttl=60, cache_dir=tmp_path).get_or_fetch("q", 5, fetch)
+    reloaded = SearchCache(ttl=60, cache_dir=tmp_path)
+    assert await reloaded.get_or_fetch("q", 5, None) == await fetch()
+
+    expired = SearchCache(ttl=-1)
+    await expired.get_or_fetch("q", 5, fetch)
+    await expired.get_or_fetch("q", 5, fetch)
+    assert expired.misses == 2
+
+
+async def test_search_errors_are_not_cached(monkeypatch) -> None:
+    tool = WebSearchTool(api_key="k", cache=SearchCache(ttl=60))
+    attempts = 0
+
+    async def flaky(query, count):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("boom")
+        return [{"title": "Result", "url": "https://r.test", "description": ""}]
+
+    monkeypatch.setattr(tool, "_search", flaky)
+    assert await tool.execute(query="q") == "Error: boom"
+    assert "https://r.test" in await tool.execute(query="q")
+    assert "https://r.test" in await tool.execute(query="q")
+    assert attempts == 2